@@ -0,0 +1 @@
+# Benchmarks de desempenho dos services e do agendador
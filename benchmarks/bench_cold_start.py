@@ -0,0 +1,130 @@
+"""
+Benchmark da inicialização do banco de dados com muitos eventos
+
+Gera um banco como o de uma instalação anterior às migrações (tabela events
+no formato original, sem guild_id nem colunas derivadas, user_version = 0)
+e mede:
+  - a primeira inicialização, que aplica as migrações pendentes;
+  - o custo que toda inicialização tinha antes das migrações versionadas
+    (a migração 1 executada novamente sobre o banco já migrado);
+  - a inicialização com o esquema em dia, que apenas lê PRAGMA user_version.
+
+Uso:
+    python -m benchmarks.bench_cold_start [--eventos 500000] [--repeticoes 5]
+"""
+import argparse
+import logging
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from dados.database import DatabaseContext
+
+FREQUENCIES = [
+    None,
+    "Semanalmente a cada Segunda-feira",
+    "Quinzenalmente a cada Sexta-feira",
+    "Mensalmente (mesmo dia)",
+    "No(a) última Sexta-feira de cada mês",
+    "Anualmente (mesmo dia)",
+]
+
+# Tabela events no formato original, anterior a qualquer migração; a migração 1
+# precisa acrescentar e preencher todas as colunas criadas depois
+LEGACY_EVENTS_SCHEMA = '''
+    CREATE TABLE events (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        date TEXT NOT NULL,
+        time TEXT NOT NULL,
+        link TEXT,
+        created_by INTEGER NOT NULL,
+        type TEXT NOT NULL DEFAULT 'unico',
+        status TEXT NOT NULL DEFAULT 'ativo',
+        frequency TEXT,
+        recurrence_details TEXT,
+        auto_complete BOOLEAN DEFAULT 1,
+        complete_after_hours INTEGER DEFAULT 1,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+'''
+
+def populate(db_path: Path, total: int, seed: int = 42):
+    """Cria um banco no formato anterior às migrações com a quantidade de eventos informada"""
+    rng = random.Random(seed)
+    start = datetime(2020, 1, 1)
+    rows = []
+    for index in range(total):
+        when = start + timedelta(days=rng.randrange(365 * 8), minutes=30 * rng.randrange(48))
+        frequency = rng.choice(FREQUENCIES)
+        rows.append((
+            f"Evento {index}",
+            when.strftime("%d/%m/%Y"),
+            when.strftime("%H:%M"),
+            rng.randrange(1, 1000),
+            'recorrente' if frequency else 'unico',
+            rng.choices(['ativo', 'concluido', 'cancelado'], weights=[6, 3, 1])[0],
+            frequency,
+        ))
+
+    # Sem DatabaseContext: o esquema atual não pode existir antes da primeira inicialização
+    connection = sqlite3.connect(db_path)
+    connection.execute(LEGACY_EVENTS_SCHEMA)
+    connection.executemany('''
+        INSERT INTO events (name, date, time, created_by, type, status, frequency)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    ''', rows)
+    connection.commit()
+    connection.close()
+
+def cold_start(db_path: Path) -> float:
+    """Mede em milissegundos uma inicialização completa com uma conexão nova"""
+    context = DatabaseContext(db_path)
+    started = time.perf_counter()
+    context.setup_database()
+    elapsed = (time.perf_counter() - started) * 1000
+    context.close_connection()
+    return elapsed
+
+def legacy_start(db_path: Path) -> float:
+    """Mede em milissegundos a migração 1 executada de novo, como toda inicialização fazia antes"""
+    context = DatabaseContext(db_path)
+    connection = context.get_connection()
+    started = time.perf_counter()
+    cursor = connection.cursor()
+    context._migration_events_schema(cursor)
+    connection.commit()
+    elapsed = (time.perf_counter() - started) * 1000
+    context.close_connection()
+    return elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--eventos', type=int, default=500_000, help="Quantidade de eventos no banco")
+    parser.add_argument('--repeticoes', type=int, default=5, help="Repetições das inicializações sem migração")
+    args = parser.parse_args()
+
+    # As migrações registram um log por etapa; silenciar para medir apenas o banco
+    logging.disable(logging.CRITICAL)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = Path(temp_dir) / 'bench_cold_start.db'
+
+        started = time.perf_counter()
+        populate(db_path, args.eventos)
+        print(f"Banco com {args.eventos} evento(s) gerado em {time.perf_counter() - started:.1f} s")
+
+        first_ms = cold_start(db_path)
+        legacy_ms = [legacy_start(db_path) for _ in range(args.repeticoes)]
+        current_ms = [cold_start(db_path) for _ in range(args.repeticoes)]
+
+        print(f"{'Cenário':<52}{'mediana (ms)':>14}")
+        print(f"{'Primeira inicialização (aplica as migrações)':<52}{first_ms:>14.1f}")
+        print(f"{'Inicialização antiga (sempre reexecuta a migração 1)':<52}{statistics.median(legacy_ms):>14.1f}")
+        print(f"{'Inicialização com esquema em dia':<52}{statistics.median(current_ms):>14.1f}")
+
+if __name__ == '__main__':
+    main()
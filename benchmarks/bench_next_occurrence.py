@@ -0,0 +1,73 @@
+"""
+Benchmark do cálculo de próxima ocorrência com atrasos patológicos
+
+Compara o avanço de um período por chamada (calculate_next_occurrence repetido
+até alcançar "agora") com o salto direto de calculate_next_occurrence_after.
+
+Uso:
+    python -m benchmarks.bench_next_occurrence [--anos 10] [--repeticoes 20]
+"""
+import argparse
+import logging
+import time
+from datetime import datetime, timedelta
+from services.events_service import EventsService
+
+FREQUENCIES = [
+    "Semanalmente a cada Segunda-feira",
+    "Quinzenalmente a cada Sexta-feira",
+    "Mensalmente (mesmo dia)",
+    "No(a) segunda Terça-feira de cada mês",
+    "No(a) última Sexta-feira de cada mês",
+    "Anualmente (mesmo dia)",
+    "Todos os dias úteis (segunda a sexta-feira)",
+]
+
+def catch_up_one_period_at_a_time(date_str: str, time_str: str, frequency: str, now: datetime) -> tuple:
+    """Reproduz o comportamento antigo: uma varredura por período atrasado"""
+    sweeps = 0
+    while True:
+        date_str, time_str = EventsService.calculate_next_occurrence(date_str, time_str, frequency, None)
+        sweeps += 1
+        if datetime.strptime(f"{date_str} {time_str}", "%d/%m/%Y %H:%M") > now:
+            return (date_str, time_str), sweeps
+
+def timed(func, repetitions: int) -> float:
+    """Retorna o tempo médio de uma chamada em microssegundos"""
+    started = time.perf_counter()
+    for _ in range(repetitions):
+        func()
+    return (time.perf_counter() - started) / repetitions * 1_000_000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--anos', type=int, default=10, help="Tamanho do atraso em anos")
+    parser.add_argument('--repeticoes', type=int, default=20, help="Repetições por medição")
+    args = parser.parse_args()
+
+    # O caminho antigo registra um log por período; silenciar para medir apenas o cálculo
+    logging.disable(logging.CRITICAL)
+
+    now = datetime.now()
+    anchor = (now - timedelta(days=365 * args.anos)).replace(day=1)
+    date_str, time_str = anchor.strftime("%d/%m/%Y"), "10:00"
+
+    print(f"Atraso de {args.anos} ano(s) a partir de {date_str} {time_str}")
+    print(f"{'Frequência':<46}{'períodos':>10}{'iterativo (µs)':>17}{'direto (µs)':>14}")
+
+    for frequency in FREQUENCIES:
+        expected, sweeps = catch_up_one_period_at_a_time(date_str, time_str, frequency, now)
+        result = EventsService.calculate_next_occurrence_after(date_str, time_str, frequency, None, after=now)
+        assert result == expected, f"{frequency}: {result} != {expected}"
+
+        iterative_us = timed(lambda: catch_up_one_period_at_a_time(date_str, time_str, frequency, now), args.repeticoes)
+        direct_us = timed(lambda: EventsService.calculate_next_occurrence_after(date_str, time_str, frequency, None, after=now),
+                          args.repeticoes * 50)
+        print(f"{frequency:<46}{sweeps:>10}{iterative_us:>17.1f}{direct_us:>14.1f}")
+
+    projection_us = timed(lambda: EventsService.project_next_occurrences(date_str, time_str, FREQUENCIES[0], None, 52, after=now),
+                          args.repeticoes)
+    print(f"\nProjeção de 52 ocorrências semanais: {projection_us:.1f} µs")
+
+if __name__ == '__main__':
+    main()
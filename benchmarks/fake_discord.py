@@ -0,0 +1,165 @@
+"""
+Objetos que substituem os do Discord nos testes de carga
+
+Implementam apenas o que os cogs, handlers e views usam de
+discord.Interaction, InteractionResponse, Webhook (followup), Guild e Member.
+Nenhuma chamada sai da máquina: as respostas ficam registradas na própria
+interação e uma latência de API opcional simula o tempo de ida e volta.
+"""
+import asyncio
+import itertools
+import time
+from datetime import datetime, timezone
+
+# IDs sequenciais para usuários e interações falsas
+_ids = itertools.count(1_000_000)
+
+class FakePermissions:
+    """Permissões de um membro (apenas os atributos consultados pelo bot)"""
+
+    def __init__(self, administrator: bool = False):
+        self.administrator = administrator
+        self.send_messages = True
+        self.embed_links = True
+        self.view_channel = True
+
+class FakeMember:
+    """Membro de um servidor"""
+
+    def __init__(self, guild: 'FakeGuild', member_id: int = None, name: str = None, administrator: bool = False):
+        self.id = member_id or next(_ids)
+        self.name = name or f"usuario{self.id}"
+        self.display_name = self.name
+        self.global_name = self.name
+        self.mention = f"<@{self.id}>"
+        self.bot = False
+        self.guild = guild
+        self.guild_permissions = FakePermissions(administrator)
+        self.joined_at = datetime.now(timezone.utc)
+
+    def __str__(self):
+        return self.name
+
+class FakeChannel:
+    """Canal de texto que registra as mensagens enviadas"""
+
+    def __init__(self, guild: 'FakeGuild', channel_id: int = None, name: str = "geral", api_latency: float = 0.0):
+        self.id = channel_id or next(_ids)
+        self.name = name
+        self.guild = guild
+        self.mention = f"<#{self.id}>"
+        self.api_latency = api_latency
+        self.sent = []
+
+    def permissions_for(self, member) -> FakePermissions:
+        return FakePermissions()
+
+    async def send(self, content: str = None, **kwargs):
+        if self.api_latency:
+            await asyncio.sleep(self.api_latency)
+        self.sent.append({'content': content, **kwargs})
+
+class FakeGuild:
+    """Servidor com um canal de texto e o próprio bot como membro"""
+
+    def __init__(self, guild_id: int, name: str = None, member_count: int = 100, api_latency: float = 0.0):
+        self.id = guild_id
+        self.name = name or f"Servidor {guild_id}"
+        self.member_count = member_count
+        self.me = FakeMember(self, name="stem-bot")
+        self.system_channel = FakeChannel(self, api_latency=api_latency)
+        self.text_channels = [self.system_channel]
+
+    def get_channel(self, channel_id: int):
+        return next((channel for channel in self.text_channels if channel.id == channel_id), None)
+
+    def get_member(self, member_id: int):
+        return None
+
+class FakeInteractionResponse:
+    """Resposta inicial de uma interação (send_message, defer, edit_message)"""
+
+    def __init__(self, interaction: 'FakeInteraction'):
+        self._interaction = interaction
+        self._done = False
+
+    def is_done(self) -> bool:
+        return self._done
+
+    async def _respond(self, kind: str, kwargs: dict):
+        if self._done:
+            raise RuntimeError("Interação já respondida")
+        if self._interaction.api_latency:
+            await asyncio.sleep(self._interaction.api_latency)
+        self._done = True
+        self._interaction.responded_at = time.perf_counter()
+        self._interaction.sent.append({'type': kind, **kwargs})
+
+    async def send_message(self, content: str = None, **kwargs):
+        await self._respond('send_message', {'content': content, **kwargs})
+
+    async def defer(self, **kwargs):
+        await self._respond('defer', kwargs)
+
+    async def edit_message(self, **kwargs):
+        await self._respond('edit_message', kwargs)
+
+class FakeFollowup:
+    """Webhook de acompanhamento de uma interação"""
+
+    def __init__(self, interaction: 'FakeInteraction'):
+        self._interaction = interaction
+
+    async def send(self, content: str = None, **kwargs):
+        if self._interaction.api_latency:
+            await asyncio.sleep(self._interaction.api_latency)
+        self._interaction.sent.append({'type': 'followup', 'content': content, **kwargs})
+
+class FakeCommand:
+    """Comando associado à interação (usado nos logs e métricas)"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.qualified_name = name
+
+class FakeInteraction:
+    """
+    Interação de comando slash
+
+    Args:
+        guild: Servidor onde o comando foi executado
+        user: Membro que executou o comando
+        command_name: Nome do comando
+        api_latency: Segundos simulados para cada chamada à API do Discord
+    """
+
+    def __init__(self, guild: FakeGuild, user: FakeMember, command_name: str = None, api_latency: float = 0.0):
+        self.id = next(_ids)
+        self.guild = guild
+        self.guild_id = guild.id
+        self.user = user
+        self.channel = guild.system_channel
+        self.channel_id = guild.system_channel.id
+        self.command = FakeCommand(command_name) if command_name else None
+        self.created_at = datetime.now(timezone.utc)
+        self.api_latency = api_latency
+        self.response = FakeInteractionResponse(self)
+        self.followup = FakeFollowup(self)
+        self.extras = {}
+        self.sent = []
+        self.responded_at = None
+
+    async def original_response(self):
+        return self.sent[0] if self.sent else None
+
+    async def edit_original_response(self, **kwargs):
+        if self.api_latency:
+            await asyncio.sleep(self.api_latency)
+        self.sent.append({'type': 'edit_original_response', **kwargs})
+
+class FakeChoice:
+    """Opção escolhida em um parâmetro com choices (equivale a app_commands.Choice)"""
+
+    def __init__(self, name: str, value):
+        self.name = name
+        self.value = value
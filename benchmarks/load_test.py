@@ -0,0 +1,214 @@
+"""
+Teste de carga offline dos comandos de eventos
+
+Executa /eventos, /modeventos e /addevento com interações falsas
+(benchmarks.fake_discord) sobre um banco sintético temporário, com N
+comandos simultâneos, e relata por comando a vazão e as latências p50, p95 e
+p99, além do atraso do event loop durante a carga. Nenhuma conexão com o
+Discord é aberta; é necessário apenas o discord.py instalado.
+
+Com --via cog os comandos passam pelos callbacks do cog Events (como o
+discord.py os chamaria, sem as checagens de permissão); com --via handlers,
+apenas pelos EventHandlers.
+
+Uso:
+    python -m benchmarks.load_test [--eventos 100000] [--concorrencia 50] [--requisicoes 2000]
+                                   [--mix eventos=60,modeventos=25,addevento=15]
+                                   [--via cog|handlers] [--latencia-api 0] [--agendador] [--saida resultado.json]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from dados import async_database, database
+from services import event_timer
+from services.loop_monitor import EventLoopLagMonitor
+from dados.recurrence import FREQUENCY_LABELS, NO_REPEAT
+from components.handlers.event_handlers import EventHandlers
+from cogs.events import Events
+from benchmarks.fake_discord import FakeChoice, FakeGuild, FakeInteraction, FakeMember
+from benchmarks.run_suite import environment_info, use_database
+from benchmarks.synthetic_db import create_database, guild_ids
+
+MODERATION_FILTERS = ("todos", "ativos", "concluidos", "cancelados", "adiados", "ultimos", "semana")
+AUTO_COMPLETE_HOURS = ("0.5", "1", "2", "3", "6", "12", "24")
+
+def percentile(ordered: list, fraction: float) -> float:
+    """Percentil pelo método do posto mais próximo sobre uma lista ordenada"""
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+def latency_summary(samples: list, errors: int, elapsed: float) -> dict:
+    """Resume as latências (ms) de um conjunto de comandos"""
+    ordered = sorted(samples)
+    return {
+        'count': len(ordered),
+        'errors': errors,
+        'throughput_per_s': round(len(ordered) / elapsed, 1) if elapsed else 0.0,
+        'p50_ms': round(percentile(ordered, 0.50), 3),
+        'p95_ms': round(percentile(ordered, 0.95), 3),
+        'p99_ms': round(percentile(ordered, 0.99), 3),
+        'max_ms': round(ordered[-1], 3) if ordered else 0.0
+    }
+
+def parse_mix(value: str) -> dict:
+    """Converte 'eventos=60,modeventos=25' em {comando: peso}"""
+    mix = {}
+    for part in value.split(','):
+        command, _, weight = part.partition('=')
+        command = command.strip()
+        if command not in ('eventos', 'modeventos', 'addevento'):
+            raise argparse.ArgumentTypeError(f"Comando desconhecido no mix: {command}")
+        mix[command] = float(weight or 1)
+    return mix
+
+class LoadTest:
+    """
+    Gera e executa os comandos do teste de carga
+
+    Os servidores seguem a mesma distribuição de Zipf do banco sintético, então
+    a maior parte dos comandos cai nos servidores mais movimentados.
+    """
+
+    def __init__(self, args):
+        self.args = args
+        self.rng = random.Random(args.semente)
+        self.api_latency = args.latencia_api / 1000
+        self.guilds = [FakeGuild(guild_id, api_latency=self.api_latency) for guild_id in guild_ids(args.servidores)]
+        self.guild_weights = [1 / (index + 1) for index in range(len(self.guilds))]
+        self.admins = {guild.id: FakeMember(guild, administrator=True) for guild in self.guilds}
+        self.commands = list(args.mix)
+        self.command_weights = [args.mix[command] for command in self.commands]
+        self.cog = Events(bot=None)
+        self.latencies = {command: [] for command in self.commands}
+        self.errors = {command: 0 for command in self.commands}
+
+    def _interaction(self, command: str) -> FakeInteraction:
+        guild = self.rng.choices(self.guilds, weights=self.guild_weights)[0]
+        return FakeInteraction(guild, self.admins[guild.id], command, api_latency=self.api_latency)
+
+    def _add_event_args(self, index: int) -> tuple:
+        """Argumentos de /addevento: data futura, qualquer frequência e auto-conclusão para eventos únicos"""
+        when = datetime.now() + timedelta(days=self.rng.randrange(1, 120), minutes=30 * self.rng.randrange(48))
+        frequency = self.rng.choice(FREQUENCY_LABELS)
+        auto_complete = FakeChoice("Sim", "sim") if frequency == NO_REPEAT else None
+        complete_after = FakeChoice("tempo", self.rng.choice(AUTO_COMPLETE_HOURS)) if auto_complete else None
+        return (f"Carga {index}", when.strftime("%d/%m/%Y"), when.strftime("%H:%M"), FakeChoice(frequency, frequency),
+                None, None, auto_complete, complete_after)
+
+    def _build(self, command: str, index: int):
+        """Cria a corrotina de um comando pelo caminho escolhido (cog ou handlers)"""
+        interaction = self._interaction(command)
+        via_cog = self.args.via == 'cog'
+        if command == 'eventos':
+            if via_cog:
+                return self.cog.eventos.callback(self.cog, interaction)
+            return EventHandlers.handle_list_user_events(interaction)
+        if command == 'modeventos':
+            filter_type = self.rng.choice(MODERATION_FILTERS)
+            if via_cog:
+                return self.cog.modeventos.callback(self.cog, interaction, FakeChoice(filter_type, filter_type))
+            return EventHandlers.handle_list_mod_events(interaction, filter_type)
+        if via_cog:
+            return self.cog.addevento.callback(self.cog, interaction, *self._add_event_args(index))
+        return EventHandlers.handle_add_recurring_event(interaction, *self._add_event_args(index))
+
+    async def _worker(self, counter):
+        for index in counter:
+            command = self.rng.choices(self.commands, weights=self.command_weights)[0]
+            coroutine = self._build(command, index)
+            started = time.perf_counter()
+            try:
+                await coroutine
+            except Exception:
+                self.errors[command] += 1
+                continue
+            self.latencies[command].append((time.perf_counter() - started) * 1000)
+
+    async def run(self) -> dict:
+        """Executa a carga e retorna o relatório"""
+        monitor = EventLoopLagMonitor(interval=0.01, warn_threshold_ms=float('inf'))
+        monitor.start()
+        if self.args.agendador:
+            event_timer.event_timer.start()
+
+        # Aquecimento: abre as conexões de leitura e a thread de escrita
+        await asyncio.gather(*(self._build(command, -1) for command in self.commands), return_exceptions=True)
+        monitor.reset()
+
+        counter = iter(range(self.args.requisicoes))
+        started = time.perf_counter()
+        await asyncio.gather(*(self._worker(counter) for _ in range(self.args.concorrencia)))
+        elapsed = time.perf_counter() - started
+
+        monitor.stop()
+        event_timer.event_timer.stop()
+
+        all_samples = [sample for samples in self.latencies.values() for sample in samples]
+        return {
+            'elapsed_s': round(elapsed, 3),
+            'overall': latency_summary(all_samples, sum(self.errors.values()), elapsed),
+            'commands': {command: latency_summary(self.latencies[command], self.errors[command], elapsed)
+                         for command in self.commands},
+            'event_loop_lag': monitor.get_stats()
+        }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--eventos', type=int, default=100_000, help="Eventos no banco sintético")
+    parser.add_argument('--servidores', type=int, default=20, help="Servidores no banco e na carga")
+    parser.add_argument('--concorrencia', type=int, default=50, help="Comandos simultâneos")
+    parser.add_argument('--requisicoes', type=int, default=2000, help="Total de comandos executados")
+    parser.add_argument('--mix', type=parse_mix, default=parse_mix("eventos=60,modeventos=25,addevento=15"),
+                        help="Pesos dos comandos (ex: eventos=60,modeventos=25,addevento=15)")
+    parser.add_argument('--via', choices=('cog', 'handlers'), default='cog', help="Caminho de execução dos comandos")
+    parser.add_argument('--latencia-api', type=float, default=0.0, help="Latência simulada da API do Discord em ms")
+    parser.add_argument('--agendador', action='store_true', help="Mantém o agendador de eventos rodando durante a carga")
+    parser.add_argument('--semente', type=int, default=42, help="Semente do banco e da carga")
+    parser.add_argument('--saida', type=Path, default=None, help="Arquivo JSON de saída (opcional)")
+    args = parser.parse_args()
+
+    # Os handlers e services registram um log por comando; silenciar para medir apenas o código
+    logging.disable(logging.CRITICAL)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = Path(temp_dir) / 'load_test.db'
+        started = time.perf_counter()
+        create_database(db_path, args.eventos, args.semente, args.servidores)
+        print(f"Banco com {args.eventos} evento(s) gerado em {time.perf_counter() - started:.1f} s")
+        use_database(db_path)
+
+        try:
+            result = asyncio.run(LoadTest(args).run())
+        finally:
+            async_database.shutdown()
+            database.db_context.close_connection()
+
+    print(f"{args.requisicoes} comando(s), concorrência {args.concorrencia}, via {args.via}: "
+          f"{result['overall']['throughput_per_s']:.1f} comandos/s em {result['elapsed_s']:.2f} s")
+    print(f"{'Comando':<14}{'total':>8}{'erros':>7}{'p50 (ms)':>11}{'p95 (ms)':>11}{'p99 (ms)':>11}")
+    for command, summary in [*result['commands'].items(), ('geral', result['overall'])]:
+        print(f"{command:<14}{summary['count']:>8}{summary['errors']:>7}"
+              f"{summary['p50_ms']:>11.2f}{summary['p95_ms']:>11.2f}{summary['p99_ms']:>11.2f}")
+    lag = result['event_loop_lag']
+    print(f"Atraso do event loop: médio {lag['avg_lag_ms']:.2f} ms, máximo {lag['max_lag_ms']:.2f} ms "
+          f"({lag['samples']} amostras)")
+
+    if args.saida:
+        report = {'environment': {**environment_info(), 'seed': args.semente, 'events': args.eventos,
+                                  'concurrency': args.concorrencia, 'requests': args.requisicoes,
+                                  'via': args.via, 'api_latency_ms': args.latencia_api},
+                  **result}
+        args.saida.parent.mkdir(parents=True, exist_ok=True)
+        args.saida.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding='utf-8')
+        print(f"Resultados gravados em {args.saida}")
+
+if __name__ == '__main__':
+    main()
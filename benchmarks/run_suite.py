@@ -0,0 +1,254 @@
+"""
+Suíte reproduzível de benchmarks dos caminhos críticos
+
+Para cada tamanho informado gera um banco sintético (benchmarks.synthetic_db)
+e mede:
+  - todas as consultas do EventsService, no servidor mais movimentado;
+  - as duas varreduras do EventScheduler, cada repetição sobre uma cópia
+    nova do banco (as varreduras alteram os eventos);
+  - calculate_next_occurrence e calculate_next_occurrence_after para todas as
+    frequências (independem do tamanho do banco);
+  - EventFormatters.build_mod_events_embed, quando discord.py está instalado.
+
+O resultado é gravado em JSON (mediana, p95, mínimo e máximo em ms por
+medição) junto com o ambiente, para comparar execuções entre commits.
+
+Uso:
+    python -m benchmarks.run_suite [--tamanhos 1000 100000 1000000] [--repeticoes 20]
+                                   [--saida benchmarks/resultados.json] [--diretorio DIR]
+"""
+import argparse
+import json
+import logging
+import platform
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from dados import database
+from services.events_service import EventsService
+from services.event_scheduler import EventScheduler
+from benchmarks.synthetic_db import RECURRING_FREQUENCIES, create_database, guild_ids
+
+MODERATION_FILTERS = ("todos", "ativos", "concluidos", "cancelados", "adiados", "ultimos", "semana")
+
+# Páginas percorridas antes de medir uma página profunda de /modeventos
+DEEP_PAGE = 50
+
+def measure(func, repetitions: int, warmup: int = 1) -> dict:
+    """
+    Executa uma função várias vezes e resume as durações
+
+    Args:
+        func: Função sem argumentos
+        repetitions: Execuções medidas
+        warmup: Execuções descartadas antes da medição
+
+    Returns:
+        dict: runs, median_ms, p95_ms, min_ms e max_ms
+    """
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(repetitions):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return summarize(samples)
+
+def summarize(samples: list) -> dict:
+    """Resume uma lista de durações em milissegundos"""
+    ordered = sorted(samples)
+    p95_index = min(len(ordered) - 1, max(0, round(0.95 * len(ordered)) - 1))
+    return {
+        'runs': len(ordered),
+        'median_ms': round(statistics.median(ordered), 4),
+        'p95_ms': round(ordered[p95_index], 4),
+        'min_ms': round(ordered[0], 4),
+        'max_ms': round(ordered[-1], 4)
+    }
+
+def use_database(db_path: Path):
+    """Aponta o contexto global do banco para outro arquivo, fechando as conexões abertas"""
+    database.db_context.close_connection()
+    database.db_context.db_path = Path(db_path)
+
+def environment_info() -> dict:
+    """Descreve a máquina e a versão do código para tornar o resultado comparável"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'sqlite': sqlite3.sqlite_version,
+        'platform': platform.platform(),
+        'machine': platform.machine()
+    }
+
+def bench_recurrence(repetitions: int) -> dict:
+    """Mede o cálculo da próxima ocorrência para cada frequência"""
+    results = {}
+    now = datetime.now()
+    recent = now - timedelta(days=3)
+    overdue = now - timedelta(days=365)
+    for frequency in RECURRING_FREQUENCIES:
+        date_str, time_str = recent.strftime("%d/%m/%Y"), "10:00"
+        old_date_str = overdue.strftime("%d/%m/%Y")
+        results[frequency] = {
+            'next_occurrence': measure(
+                lambda: EventsService.calculate_next_occurrence(date_str, time_str, frequency, None), repetitions),
+            'next_occurrence_after_1y': measure(
+                lambda: EventsService.calculate_next_occurrence_after(old_date_str, time_str, frequency, None, after=now),
+                repetitions)
+        }
+    return results
+
+def moderation_cursor(guild_id: int, pages: int) -> tuple:
+    """Percorre as primeiras páginas de /modeventos e retorna o cursor da página seguinte"""
+    cursor = None
+    for _ in range(pages):
+        _, next_cursor = EventsService.get_moderation_page(guild_id, "todos", cursor)
+        if next_cursor is None:
+            break
+        cursor = next_cursor
+    return cursor
+
+def bench_queries(guild_id: int, repetitions: int) -> dict:
+    """Mede todas as consultas do EventsService no servidor informado"""
+    conn = database.get_read_connection()
+    row = conn.execute('SELECT id FROM events WHERE guild_id = ? ORDER BY id LIMIT 1 OFFSET ('
+                       'SELECT COUNT(*) / 2 FROM events WHERE guild_id = ?)', (guild_id, guild_id)).fetchone()
+    event_id = row[0] if row else 1
+    deep_cursor = moderation_cursor(guild_id, DEEP_PAGE)
+
+    benchmarks = {
+        'get_active_events_for_users': lambda: EventsService.get_active_events_for_users(guild_id),
+        'get_all_events_for_moderation': lambda: EventsService.get_all_events_for_moderation(guild_id),
+        'get_events_of_the_week': lambda: EventsService.get_events_of_the_week(guild_id),
+        'get_all_events': lambda: EventsService.get_all_events(guild_id),
+        'get_event_by_id': lambda: EventsService.get_event_by_id(guild_id, event_id),
+        'get_week_events_for_users': lambda: EventsService.get_week_events_for_users(guild_id),
+        f'get_moderation_page[todos,pagina_{DEEP_PAGE + 1}]': lambda: EventsService.get_moderation_page(guild_id, "todos", deep_cursor),
+        'get_all_active_recurring_events_past_due': EventsService.get_all_active_recurring_events_past_due,
+        'get_due_instants': lambda: EventsService.get_due_instants(),
+        'get_unique_events_past_due_for_auto_complete': EventsService.get_unique_events_past_due_for_auto_complete,
+    }
+    for filter_type in MODERATION_FILTERS:
+        benchmarks[f'get_filtered_events_for_moderation[{filter_type}]'] = (
+            lambda filter_type=filter_type: EventsService.get_filtered_events_for_moderation(guild_id, filter_type))
+        benchmarks[f'get_moderation_page[{filter_type}]'] = (
+            lambda filter_type=filter_type: EventsService.get_moderation_page(guild_id, filter_type))
+
+    results = {}
+    for name, func in benchmarks.items():
+        results[name] = measure(func, repetitions)
+    return results
+
+def bench_sweeps(source: Path, work_dir: Path, repetitions: int) -> dict:
+    """Mede as varreduras do agendador, cada execução sobre uma cópia nova do banco"""
+    sweeps = {
+        'update_recurring_events': (EventScheduler.update_recurring_events, 'updated_events'),
+        'auto_complete_unique_events': (EventScheduler.auto_complete_unique_events, 'completed_events'),
+    }
+    work_path = work_dir / 'sweep.db'
+    results = {}
+    for name, (sweep, done_key) in sweeps.items():
+        samples = []
+        rows = None
+        for _ in range(repetitions):
+            use_database(work_path)
+            shutil.copyfile(source, work_path)
+            started = time.perf_counter()
+            result = sweep()
+            samples.append((time.perf_counter() - started) * 1000)
+            rows = result.get(done_key)
+        results[name] = {**summarize(samples), 'rows': rows}
+    use_database(source)
+    for suffix in ('', '-wal', '-shm'):
+        Path(f"{work_path}{suffix}").unlink(missing_ok=True)
+    return results
+
+def bench_formatters(guild_id: int, repetitions: int) -> dict:
+    """Mede a montagem do embed de /modeventos com uma página completa de eventos"""
+    try:
+        from components.formatters.event_formatters import EventFormatters
+    except ImportError as e:
+        return {'build_mod_events_embed': {'skipped': f"discord.py indisponível: {e}"}}
+
+    page, next_cursor = EventsService.get_moderation_page(guild_id, "todos")
+    return {
+        'build_mod_events_embed': measure(
+            lambda: EventFormatters.build_mod_events_embed(page, "todos", 1, next_cursor is not None), repetitions)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tamanhos', type=int, nargs='+', default=[1_000, 100_000, 1_000_000],
+                        help="Quantidades de eventos dos bancos sintéticos")
+    parser.add_argument('--repeticoes', type=int, default=20, help="Repetições por consulta e cálculo")
+    parser.add_argument('--repeticoes-varredura', type=int, default=3, help="Repetições por varredura do agendador")
+    parser.add_argument('--semente', type=int, default=42, help="Semente do gerador dos bancos")
+    parser.add_argument('--servidores', type=int, default=20, help="Quantidade de servidores nos bancos")
+    parser.add_argument('--saida', type=Path, default=Path('benchmarks') / 'resultados.json', help="Arquivo JSON de saída")
+    parser.add_argument('--diretorio', type=Path, default=None,
+                        help="Pasta para manter os bancos gerados entre execuções (padrão: pasta temporária)")
+    args = parser.parse_args()
+
+    # Os services registram um log por consulta; silenciar para medir apenas o código
+    logging.disable(logging.CRITICAL)
+
+    report = {
+        'environment': {**environment_info(), 'seed': args.semente, 'guilds': args.servidores,
+                        'repetitions': args.repeticoes, 'sweep_repetitions': args.repeticoes_varredura},
+        'recurrence': bench_recurrence(args.repeticoes),
+        'databases': {}
+    }
+    print(f"Cálculo de ocorrências: {len(report['recurrence'])} frequência(s) medidas")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        data_dir = args.diretorio or Path(temp_dir)
+        data_dir.mkdir(parents=True, exist_ok=True)
+        busiest_guild = guild_ids(args.servidores)[0]
+
+        for size in args.tamanhos:
+            db_path = data_dir / f"synthetic_{size}_{args.semente}.db"
+            generation_s = None
+            if not db_path.exists():
+                started = time.perf_counter()
+                create_database(db_path, size, args.semente, args.servidores)
+                generation_s = round(time.perf_counter() - started, 2)
+            use_database(db_path)
+
+            guild_events = database.get_read_connection().execute(
+                'SELECT COUNT(*) FROM events WHERE guild_id = ?', (busiest_guild,)).fetchone()[0]
+            entry = {
+                'events': size,
+                'guild_events': guild_events,
+                'generation_s': generation_s,
+                'file_bytes': db_path.stat().st_size,
+                'queries': bench_queries(busiest_guild, args.repeticoes),
+                'formatters': bench_formatters(busiest_guild, args.repeticoes),
+                'sweeps': bench_sweeps(db_path, Path(temp_dir), args.repeticoes_varredura)
+            }
+            database.db_context.close_connection()
+            report['databases'][str(size)] = entry
+
+            slowest = max(entry['queries'].items(), key=lambda item: item[1]['median_ms'])
+            print(f"{size} evento(s): consulta mais lenta {slowest[0]} ({slowest[1]['median_ms']:.2f} ms), "
+                  f"varreduras {entry['sweeps']['update_recurring_events']['median_ms']:.1f} / "
+                  f"{entry['sweeps']['auto_complete_unique_events']['median_ms']:.1f} ms")
+
+    args.saida.parent.mkdir(parents=True, exist_ok=True)
+    args.saida.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding='utf-8')
+    print(f"Resultados gravados em {args.saida}")
+
+if __name__ == '__main__':
+    main()
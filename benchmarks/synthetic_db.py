@@ -0,0 +1,127 @@
+"""
+Geração de bancos sintéticos para os benchmarks
+
+A distribuição imita um bot em produção: poucos servidores concentram a maior
+parte dos eventos, eventos únicos passados estão em sua maioria concluídos e
+os recorrentes ativos ficam próximos de "agora" (uma parte já vencida,
+aguardando a varredura do agendador). Todas as frequências aparecem, inclusive
+as mensais por posição. A mesma semente gera sempre o mesmo banco.
+"""
+import random
+import sqlite3
+from datetime import datetime, timedelta
+from pathlib import Path
+from dados.database import DatabaseContext, STARTS_AT_FORMAT
+from dados.recurrence import FREQUENCY_LABELS, NO_REPEAT, POSITION_NAMES, monthly_nth_label, rule_code_for
+
+# Frequências recorrentes (sem "Não se repete"), incluindo as mensais por posição
+RECURRING_FREQUENCIES = (
+    *(label for label in FREQUENCY_LABELS if label != NO_REPEAT),
+    *(monthly_nth_label(position, weekday) for position in POSITION_NAMES for weekday in (0, 2, 4)),
+)
+
+COMPLETE_AFTER_HOURS = (0.5, 1, 2, 3, 6, 12, 24)
+
+# Colunas preenchidas pelo gerador, na ordem das tuplas de generate_rows
+COLUMNS = (
+    'name', 'date', 'time', 'link', 'created_by', 'guild_id', 'type', 'status', 'frequency',
+    'recurrence_details', 'auto_complete', 'complete_after_hours', 'starts_at', 'recurrence_rule', 'complete_at'
+)
+
+def guild_ids(count: int) -> list:
+    """IDs de servidor sintéticos, espalhados pelos shards como snowflakes reais"""
+    return [((index + 1) << 22) | index for index in range(count)]
+
+def generate_rows(total: int, seed: int = 42, guild_count: int = 20, now: datetime = None):
+    """
+    Gera as tuplas de eventos sintéticos
+
+    Args:
+        total: Quantidade de eventos
+        seed: Semente do gerador aleatório
+        guild_count: Quantidade de servidores (o primeiro é o mais movimentado)
+        now: Instante de referência (padrão: agora)
+
+    Yields:
+        tuple: Valores na ordem de COLUMNS
+    """
+    rng = random.Random(seed)
+    now = (now or datetime.now()).replace(second=0, microsecond=0)
+    guilds = guild_ids(guild_count)
+    # Distribuição de Zipf: o servidor i recebe peso 1 / (i + 1)
+    guild_weights = [1 / (index + 1) for index in range(guild_count)]
+
+    for index in range(total):
+        guild_id = rng.choices(guilds, weights=guild_weights)[0]
+        recurring = rng.random() < 0.35
+
+        if recurring:
+            frequency = rng.choice(RECURRING_FREQUENCIES)
+            status = rng.choices(['ativo', 'cancelado', 'adiado'], weights=[85, 10, 5])[0]
+            starts_at = now + timedelta(minutes=30 * rng.randrange(-2 * 24 * 7, 2 * 24 * 30))
+            auto_complete, complete_after_hours, complete_at = 1, 1, None
+        else:
+            frequency = None
+            starts_at = now + timedelta(minutes=30 * rng.randrange(-2 * 24 * 730, 2 * 24 * 180))
+            if starts_at < now:
+                status = rng.choices(['concluido', 'ativo', 'cancelado'], weights=[80, 12, 8])[0]
+            else:
+                status = rng.choices(['ativo', 'adiado', 'cancelado'], weights=[90, 5, 5])[0]
+            auto_complete = 1 if rng.random() < 0.7 else 0
+            complete_after_hours = rng.choice(COMPLETE_AFTER_HOURS)
+            complete_at = (starts_at + timedelta(hours=complete_after_hours)).strftime(STARTS_AT_FORMAT)
+
+        yield (
+            f"Evento sintético {index}",
+            starts_at.strftime("%d/%m/%Y"),
+            starts_at.strftime("%H:%M"),
+            "https://exemplo.com/evento" if rng.random() < 0.4 else None,
+            rng.randrange(1, 5000),
+            guild_id,
+            'recorrente' if recurring else 'unico',
+            status,
+            frequency,
+            None,
+            auto_complete,
+            complete_after_hours,
+            starts_at.strftime(STARTS_AT_FORMAT),
+            rule_code_for(frequency, starts_at.day) if recurring else 'none',
+            complete_at,
+        )
+
+def create_database(db_path: Path, total: int, seed: int = 42, guild_count: int = 20, batch_size: int = 50_000) -> Path:
+    """
+    Cria (ou recria) um banco sintético com o esquema atual
+
+    Args:
+        db_path: Caminho do arquivo
+        total: Quantidade de eventos
+        seed: Semente do gerador aleatório
+        guild_count: Quantidade de servidores
+        batch_size: Linhas por executemany
+
+    Returns:
+        Path: Caminho do banco criado
+    """
+    db_path = Path(db_path)
+    for suffix in ('', '-wal', '-shm'):
+        Path(f"{db_path}{suffix}").unlink(missing_ok=True)
+
+    context = DatabaseContext(db_path)
+    context.setup_database()
+    context.close_connection()
+
+    connection = sqlite3.connect(db_path)
+    insert = f"INSERT INTO events ({', '.join(COLUMNS)}) VALUES ({', '.join('?' for _ in COLUMNS)})"
+    batch = []
+    for row in generate_rows(total, seed, guild_count):
+        batch.append(row)
+        if len(batch) >= batch_size:
+            connection.executemany(insert, batch)
+            batch.clear()
+    if batch:
+        connection.executemany(insert, batch)
+    connection.commit()
+    connection.execute('ANALYZE')
+    connection.close()
+    return db_path
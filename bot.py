@@ -3,7 +3,14 @@ from discord.ext import commands
 import os
 from dotenv import load_dotenv
 from dados import database
-from logging_config import setup_logging, get_logger
+from dados.async_database import run_in_db, set_timing_hook
+from services.loop_monitor import loop_monitor
+from services.week_view_cache import week_view_cache
+from services.shard_config import shard_config
+from services.command_sync import CommandSync
+from services.metrics import metrics, metrics_server
+from services.message_dispatcher import message_dispatcher
+from logging_config import setup_logging, get_logger, get_logging_stats
 
 # Carregar variáveis de ambiente
 load_dotenv()
@@ -18,8 +25,44 @@ intents.message_content = True
 intents.members = True
 intents.guilds = True
 
+# Configurar shards (SHARDED, SHARD_COUNT e SHARD_IDS)
+shard_config.load_from_env()
+
 # Criar bot (apenas slash commands, mas ainda precisa do prefixo para compatibilidade)
-bot = commands.Bot(command_prefix='!', intents=intents, help_command=None)
+if shard_config.enabled:
+    bot = commands.AutoShardedBot(command_prefix='!', intents=intents, help_command=None, **shard_config.bot_kwargs())
+else:
+    bot = commands.Bot(command_prefix='!', intents=intents, help_command=None)
+
+# Métricas mantidas por outros módulos, lidas apenas na coleta
+metrics.register_callback(
+    'stem_week_view_cache_requests_total', 'counter', "Consultas ao cache de /eventos por resultado",
+    lambda: {(('result', 'hit'),): week_view_cache.get_stats()['hits'], (('result', 'miss'),): week_view_cache.get_stats()['misses']}
+)
+metrics.register_callback(
+    'stem_week_view_cache_entries', 'gauge', "Servidores com a visão semanal em cache",
+    lambda: week_view_cache.get_stats()['entries']
+)
+metrics.register_callback(
+    'stem_log_records_dropped_total', 'counter', "Registros de log descartados por fila cheia",
+    lambda: get_logging_stats()['dropped']
+)
+metrics.register_callback(
+    'stem_dispatch_pending_messages', 'gauge', "Mensagens da outbox aguardando envio nas filas por canal",
+    lambda: message_dispatcher.pending()
+)
+metrics.register_callback(
+    'stem_guilds', 'gauge', "Servidores conectados a este processo",
+    lambda: len(bot.guilds)
+)
+
+def observe_db_operation(operation: str, kind: str, seconds: float):
+    """Registra nas métricas a duração de uma operação do banco de dados"""
+    metrics.observe('stem_db_operation_seconds', seconds, operation=operation, kind=kind)
+    metrics.inc('stem_db_operations_total', operation=operation, kind=kind)
+
+# A camada de dados não conhece as métricas: a duração de cada operação chega por este hook
+set_timing_hook(observe_db_operation)
 
 # Configurar banco de dados
 def setup_database():
@@ -46,57 +89,110 @@ async def load_cogs():
         except Exception as e:
             logger.error(f"Erro ao carregar cog {cog_name}: {e}")
 
+# on_ready dispara a cada reconexão ao gateway; as tarefas que dependem dos servidores rodam só na primeira
+startup_complete = False
+
 @bot.event
-async def on_ready():
-    """Evento executado quando o bot está pronto"""
-    logger.info(f"{bot.user} está online!")
-    logger.info(f"ID do bot: {bot.user.id}")
-    logger.info(f"Conectado a {len(bot.guilds)} servidor(es)")
+async def setup_hook():
+    """Configuração única executada após o login, antes da conexão com o gateway"""
+    # Medir o atraso do event loop
+    loop_monitor.start()
+    
+    # Servidor local de métricas (apenas com METRICS_PORT definido)
+    await metrics_server.start()
     
     # Configurar banco de dados
     try:
-        setup_database()
+        await run_in_db(setup_database)
     except Exception as e:
         logger.error(f"Erro ao configurar banco de dados: {e}")
         return
     
+    # Despachante único das mensagens da outbox (boas-vindas, saídas e lembretes)
+    message_dispatcher.start(bot.get_channel, before_start=bot.wait_until_ready, fetch_channel=bot.fetch_channel)
+    
     # Carregar Cogs
     await load_cogs()
     
-    # Sincronizar comandos slash
+    # Sincronizar comandos globais apenas se a árvore mudou desde a última sincronização
     try:
-        # Sincronizar globalmente (pode demorar até 1 hora para aparecer)
-        synced = await bot.tree.sync()
-        logger.info(f"Sincronizados {len(synced)} comandos slash globalmente")
-        
-        # Para desenvolvimento, também sincronizar por servidor (mais rápido)
-        logger.info("📋 Sincronizando comandos nos servidores:")
-        for guild in bot.guilds:
-            logger.info(f"  - Servidor: {guild.name} (ID: {guild.id})")
-            try:
-                # Verificar se o bot tem permissões no servidor
-                if not guild.me.guild_permissions.manage_guild:
-                    logger.warning(f"    ⚠️  Bot sem permissão 'Manage Server' em {guild.name}")
-                    continue
-                
-                synced_guild = await bot.tree.sync(guild=guild)
-                logger.info(f"    ✅ Sincronizados {len(synced_guild)} comandos")
-                
-            except discord.Forbidden:
-                logger.error(f"    ❌ Sem permissão para sincronizar em {guild.name}")
-            except discord.HTTPException as e:
-                logger.error(f"    ❌ Erro HTTP ao sincronizar em {guild.name}: {e}")
-            except Exception as e:
-                logger.error(f"    ❌ Erro ao sincronizar em {guild.name}: {e}")
-                
+        synced = await CommandSync.sync_scope(bot)
+        if synced is None:
+            logger.info("Comandos slash globais inalterados, sincronização ignorada")
+        else:
+            # Pode demorar até 1 hora para aparecer
+            logger.info(f"Sincronizados {len(synced)} comandos slash globalmente")
     except Exception as e:
         logger.error(f"Erro ao sincronizar comandos slash: {e}")
 
+@bot.event
+async def on_ready():
+    """Evento executado quando o bot está pronto (inclusive após reconexões)"""
+    global startup_complete
+    
+    logger.info(f"{bot.user} está online!")
+    logger.info(f"ID do bot: {bot.user.id}")
+    logger.info(f"Conectado a {len(bot.guilds)} servidor(es)")
+    if shard_config.enabled:
+        logger.info(f"Shards deste processo: {sorted(bot.shards)} de {bot.shard_count}")
+    
+    if startup_complete:
+        return
+    startup_complete = True
+    
+    # Eventos antigos sem servidor pertencem ao único servidor conectado
+    # (com shards divididos entre processos, este processo não enxerga todos os servidores)
+    if len(bot.guilds) == 1 and not shard_config.partitioned:
+        assigned = await run_in_db(database.assign_legacy_events, bot.guilds[0].id)
+        if assigned:
+            week_view_cache.invalidate(bot.guilds[0].id)
+    
+    # Para desenvolvimento, também sincronizar por servidor (mais rápido)
+    try:
+        logger.info("📋 Sincronizando comandos nos servidores:")
+        stats = await CommandSync.sync_guilds(bot, bot.guilds)
+        logger.info(
+            f"Sincronização por servidor: {stats['synced']} sincronizado(s), {stats['unchanged']} inalterado(s), "
+            f"{stats['skipped']} sem permissão, {stats['failed']} com erro"
+        )
+    except Exception as e:
+        logger.error(f"Erro ao sincronizar comandos slash nos servidores: {e}")
+
+@bot.event
+async def on_app_command_completion(interaction: discord.Interaction, command):
+    """Registra cada comando slash concluído com servidor e duração (campos fixos do log JSON)"""
+    duration_ms = round((discord.utils.utcnow() - interaction.created_at).total_seconds() * 1000, 1)
+    metrics.inc('stem_commands_total', command=command.qualified_name, status='ok')
+    metrics.observe('stem_command_duration_seconds', duration_ms / 1000, command=command.qualified_name)
+    logger.info(
+        "Comando /%s concluído em %.1fms", command.qualified_name, duration_ms,
+        extra={'command': command.qualified_name, 'guild': interaction.guild_id, 'duration_ms': duration_ms}
+    )
+
+# Contar comandos com erro antes do tratamento padrão da árvore (que registra o erro no log)
+default_tree_on_error = bot.tree.on_error
+
+async def on_tree_error(interaction: discord.Interaction, error: discord.app_commands.AppCommandError):
+    """Registra nas métricas o comando que falhou e delega ao tratamento padrão"""
+    command_name = interaction.command.qualified_name if interaction.command else 'desconhecido'
+    metrics.inc('stem_commands_total', command=command_name, status='error')
+    await default_tree_on_error(interaction, error)
+
+bot.tree.on_error = on_tree_error
+
 @bot.tree.command(name="ping", description="Testa a latência do bot")
 async def ping_slash(interaction: discord.Interaction):
     """Comando slash para testar latência"""
     latency = round(bot.latency * 1000)
-    await interaction.response.send_message(f'🏓 Pong! Latência: {latency}ms')
+    loop_stats = loop_monitor.get_stats()
+    cache_stats = week_view_cache.get_stats()
+    logging_stats = get_logging_stats()
+    await interaction.response.send_message(
+        f"🏓 Pong! Latência: {latency}ms\n"
+        f"⏱️ Lag do event loop: {loop_stats['last_lag_ms']}ms (máx. {loop_stats['max_lag_ms']}ms)\n"
+        f"📦 Cache de /eventos: {cache_stats['hits']} acerto(s), {cache_stats['misses']} falta(s)\n"
+        f"📝 Logs: {logging_stats['queued']} na fila, {logging_stats['dropped']} descartado(s)"
+    )
 
 @bot.tree.command(name="help", description="Mostra todos os comandos disponíveis")
 async def help_slash(interaction: discord.Interaction):
@@ -115,7 +211,7 @@ async def help_slash(interaction: discord.Interaction):
     
     embed.add_field(
         name="📅 Eventos (Administradores)",
-        value="`/addevento` - Adicionar evento (único ou recorrente) com seleção de frequência\n`/alterarevento` - Alterar detalhes de evento (com seleção de frequência, detalhes e status)\n`/modeventos` - Listar eventos com filtros\n`/concluirevento` - Marcar evento como concluído",
+        value="`/addevento` - Adicionar evento (único ou recorrente) com seleção de frequência\n`/alterarevento` - Alterar detalhes de evento (com seleção de frequência, detalhes e status)\n`/modeventos` - Listar eventos com filtros\n`/concluirevento` - Marcar evento como concluído\n`/canallembretes` - Definir o canal dos lembretes de eventos",
         inline=False
     )
     
@@ -151,7 +247,7 @@ async def sync_slash(interaction: discord.Interaction):
             inline=False
         )
         
-        synced_guild = await bot.tree.sync(guild=interaction.guild)
+        synced_guild = await CommandSync.sync_scope(bot, interaction.guild, force=True)
         
         embed.add_field(
             name="✅ Servidor Atual",
@@ -166,7 +262,7 @@ async def sync_slash(interaction: discord.Interaction):
             inline=False
         )
         
-        synced_global = await bot.tree.sync()
+        synced_global = await CommandSync.sync_scope(bot, force=True)
         
         embed.add_field(
             name="✅ Global",
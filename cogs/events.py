@@ -1,8 +1,11 @@
 import discord
-from discord.ext import commands, tasks
+from discord.ext import commands
 import logging
 from components.handlers import event_handlers
-from services import event_scheduler
+from services import event_timer
+from services.reminder_timer import reminder_timer
+from services.outbox_service import OutboxMessage
+from components.formatters import event_formatters
 from components.choices import event_choices
 from services import events_service
 
@@ -12,51 +15,47 @@ logger = logging.getLogger(__name__)
 class Events(commands.Cog):
     """Cog para gerenciar eventos do servidor"""
     
-    # Variável de classe para controlar se a tarefa já está rodando
-    _task_running = False
-    
     def __init__(self, bot):
         self.bot = bot
-        # Verificar se a tarefa já está rodando antes de iniciar
-        if not Events._task_running and not self.recurring_event_updater.is_running():
-            logger.info("Iniciando background task para eventos recorrentes")
-            self.recurring_event_updater.start()
-            Events._task_running = True
-        else:
-            logger.info("Background task já está em execução, pulando inicialização")
     
-    def cog_unload(self):
-        """Para a tarefa quando o cog é descarregado"""
-        if self.recurring_event_updater.is_running():
-            logger.info("Parando background task de eventos recorrentes")
-            self.recurring_event_updater.cancel()
-            Events._task_running = False
+    async def cog_load(self):
+        """Inicia o agendador de eventos quando o cog é carregado"""
+        # O agendador ignora a chamada se já estiver rodando (ex.: recarga do cog)
+        logger.info("Iniciando agendador de eventos recorrentes e auto-conclusão")
+        event_timer.event_timer.start(before_start=self.bot.wait_until_ready)
+        reminder_timer.start(self.render_reminders, before_start=self.bot.wait_until_ready)
     
-    @tasks.loop(hours=1)  # Executar a cada hora
-    async def recurring_event_updater(self):
-        """Atualiza eventos recorrentes que já passaram e auto-conclui eventos únicos"""
-        logger.info("Executando verificação de eventos recorrentes vencidos...")
-        result = event_scheduler.EventScheduler.update_recurring_events()
-        if result['success']:
-            logger.info(f"Verificação concluída: {result['message']}")
-        else:
-            logger.error(f"Erro na verificação: {result['error']}")
+    def cog_unload(self):
+        """Para o agendador quando o cog é descarregado"""
+        if event_timer.event_timer.is_running():
+            logger.info("Parando agendador de eventos recorrentes")
+            event_timer.event_timer.stop()
+        reminder_timer.stop()
+    
+    def render_reminders(self, reminders: list) -> list:
+        """
+        Monta as mensagens dos lembretes vencidos, agrupados por canal
         
-        # Auto-concluir eventos únicos vencidos
-        logger.info("Executando verificação de eventos únicos para auto-conclusão...")
-        auto_complete_result = event_scheduler.EventScheduler.auto_complete_unique_events()
-        if auto_complete_result['success']:
-            logger.info(f"Auto-conclusão concluída: {auto_complete_result['message']}")
-        else:
-            logger.error(f"Erro na auto-conclusão: {auto_complete_result['error']}")
-    
-    @recurring_event_updater.before_loop
-    async def before_recurring_event_updater(self):
-        """Aguarda o bot estar pronto antes de iniciar a tarefa"""
-        await self.bot.wait_until_ready()
-        logger.info("Bot pronto, background task iniciada")
-    
-
+        O canal não é resolvido aqui: o despachante o busca no momento do envio
+        (inclusive fora do cache, após uma reconexão) e marca como falha as
+        mensagens de canais que não existem mais.
+        
+        Args:
+            reminders: Lista de tuplas (EventRow, antecedência_em_minutos) do agendador de lembretes
+            
+        Returns:
+            list: Lista de OutboxMessage gravadas na outbox junto com o registro dos lembretes
+        """
+        messages = []
+        by_channel = {}
+        for event, offset in reminders:
+            by_channel.setdefault(event.reminder_channel_id, []).append((event, offset))
+        
+        for channel_id, channel_reminders in by_channel.items():
+            guild_id = channel_reminders[0][0].guild_id
+            for embed in event_formatters.EventFormatters.build_reminder_embeds(channel_reminders):
+                messages.append(OutboxMessage(guild_id, channel_id, 'reminder', embeds=[embed]))
+        return messages
     
     @discord.app_commands.command(name="addevento", description="Adiciona um novo evento (único ou recorrente) (apenas administradores)")
     @discord.app_commands.describe(
@@ -106,7 +105,8 @@ class Events(commands.Cog):
         frequencia="Nova frequência (opcional)",
         detalhes="Novos detalhes (opcional)",
         link="Novo link (opcional)",
-        status="Novo status (opcional)"
+        status="Novo status (opcional)",
+        versao="Versão vista em /modeventos; recusa a alteração se o evento mudou desde então (opcional)"
     )
     @discord.app_commands.choices(frequencia=event_choices.FREQUENCY_CHOICES)
     @discord.app_commands.choices(detalhes=event_choices.DETAILS_CHOICES)
@@ -115,12 +115,13 @@ class Events(commands.Cog):
     async def alterarevento(self, interaction: discord.Interaction, id_evento: int, 
                           nome: str = None, data: str = None, hora: str = None, 
                           link: str = None, frequencia: discord.app_commands.Choice[str] = None, 
-                          detalhes: discord.app_commands.Choice[str] = None, status: discord.app_commands.Choice[str] = None):
+                          detalhes: discord.app_commands.Choice[str] = None, status: discord.app_commands.Choice[str] = None,
+                          versao: int = None):
         """Altera detalhes de um evento (apenas administradores)"""
         success, embed = await event_handlers.EventHandlers.handle_alter_event(
             interaction, id_evento, 
             name=nome, date=data, time=hora, link=link, 
-            frequency=frequencia, recurrence_details=detalhes, status=status
+            frequency=frequencia, recurrence_details=detalhes, status=status, version=versao
         )
         await interaction.response.send_message(embed=embed, ephemeral=not success)
     
@@ -146,8 +147,14 @@ class Events(commands.Cog):
         """Lista eventos para moderação com filtros (apenas administradores)"""
         # Usar "todos" como padrão se nenhum filtro for especificado
         filter_value = filtro.value if filtro else "todos"
-        success, embed = await event_handlers.EventHandlers.handle_list_mod_events(interaction, filter_value)
-        await interaction.response.send_message(embed=embed, ephemeral=True)
+        success, response = await event_handlers.EventHandlers.handle_list_mod_events(interaction, filter_value)
+        
+        # Listagem com mais de uma página vem acompanhada da view de navegação
+        if isinstance(response, tuple):
+            embed, view = response
+            await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
+        else:
+            await interaction.response.send_message(embed=response, ephemeral=True)
     
     @modeventos.error
     async def modeventos_error(self, interaction: discord.Interaction, error):
@@ -171,9 +178,21 @@ class Events(commands.Cog):
         embed = await event_handlers.EventHandlers.handle_permission_error(interaction, error)
         await interaction.response.send_message(embed=embed, ephemeral=True)
     
-
-
-
+    @discord.app_commands.command(name="canallembretes", description="Define o canal dos lembretes de eventos (apenas administradores)")
+    @discord.app_commands.describe(
+        canal="Canal que recebe os lembretes antes de cada evento (omita para desativar os lembretes)"
+    )
+    @discord.app_commands.checks.has_permissions(administrator=True)
+    async def canallembretes(self, interaction: discord.Interaction, canal: discord.TextChannel = None):
+        """Define o canal dos lembretes de eventos (apenas administradores)"""
+        success, embed = await event_handlers.EventHandlers.handle_set_reminder_channel(interaction, canal)
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+    
+    @canallembretes.error
+    async def canallembretes_error(self, interaction: discord.Interaction, error):
+        """Trata erros do comando canallembretes"""
+        embed = await event_handlers.EventHandlers.handle_permission_error(interaction, error)
+        await interaction.response.send_message(embed=embed, ephemeral=True)
 
 async def setup(bot):
     """Função necessária para carregar o Cog"""
@@ -1,128 +1,286 @@
 import discord
 from discord.ext import commands
 from datetime import datetime
+from collections import deque
+import asyncio
+import logging
+import os
+import time
+from services.message_dispatcher import message_dispatcher
+from services.outbox_service import OutboxMessage
+
+# Configurar logging
+logger = logging.getLogger(__name__)
 
 class Welcome(commands.Cog):
-    """Cog para gerenciar mensagens de boas-vindas e saída"""
-    
+    """
+    Cog para gerenciar mensagens de boas-vindas e saída
+
+    Em rajadas de entradas (raid, divulgação), quando um servidor recebe mais
+    de WELCOME_BURST_THRESHOLD entradas em WELCOME_BURST_WINDOW segundos, as
+    boas-vindas seguintes são acumuladas e enviadas ao fim da janela em uma
+    única mensagem que menciona até WELCOME_BURST_MAX_MENTIONS membros. O
+    custo por janela fica limitado ao limiar mais uma mensagem agrupada,
+    independente do ritmo de entradas.
+    """
+
+    # IDs específicos dos canais de boas-vindas e de saídas
+    WELCOME_CHANNEL_ID = 1396900097610088538
+    LEAVE_CHANNEL_ID = 1396901336619941909
+
+    # Limite de caracteres do texto de uma mensagem do Discord
+    MAX_CONTENT_LENGTH = 2000
+
     def __init__(self, bot):
         self.bot = bot
-    
+        self.burst_threshold = max(0, int(os.getenv('WELCOME_BURST_THRESHOLD', '5')))
+        self.burst_window = max(1.0, float(os.getenv('WELCOME_BURST_WINDOW', '10')))
+        self.burst_max_mentions = max(1, int(os.getenv('WELCOME_BURST_MAX_MENTIONS', '20')))
+        self._channels = {}  # (guild_id, channel_id) -> canal
+        self._recent_joins = {}  # guild_id -> instantes das últimas entradas (até o limiar + 1)
+        self._bursts = {}  # guild_id -> membros aguardando a mensagem agrupada
+        self._burst_tasks = {}  # guild_id -> tarefa que envia a mensagem agrupada
+
+    async def cog_unload(self):
+        """Envia as boas-vindas acumuladas antes de descarregar o cog"""
+        for task in self._burst_tasks.values():
+            task.cancel()
+        self._burst_tasks.clear()
+        for members in list(self._bursts.values()):
+            await self._flush_burst(members[0].guild)
+
+    def _get_channel(self, guild, channel_id: int):
+        """Resolve um canal do servidor uma única vez e o mantém em cache"""
+        key = (guild.id, channel_id)
+        channel = self._channels.get(key)
+        if channel is None:
+            channel = guild.get_channel(channel_id)
+            if channel is not None:
+                self._channels[key] = channel
+        return channel
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel):
+        """Descarta do cache um canal apagado"""
+        self._channels.pop((channel.guild.id, channel.id), None)
+
+    def _can_send(self, guild, channel, label: str) -> bool:
+        """Verifica se o bot pode enviar mensagens no canal"""
+        # Verificar se o bot tem permissão para enviar mensagens no canal
+        bot_member = guild.me
+        if bot_member is None:
+            logger.warning("Bot member não encontrado no guild", extra={'guild': guild.id})
+            return False
+
+        if not channel.permissions_for(bot_member).send_messages:
+            logger.warning(f"Bot não tem permissão para enviar mensagens no canal de {label}: {channel.name}",
+                           extra={'guild': guild.id})
+            return False
+        return True
+
+    def _register_join(self, guild_id: int) -> bool:
+        """
+        Registra uma entrada e indica se as boas-vindas devem ser agrupadas
+
+        Args:
+            guild_id: ID do servidor
+
+        Returns:
+            bool: True se o servidor já tem uma mensagem agrupada pendente ou
+                  passou do limiar de entradas dentro da janela
+        """
+        if self.burst_threshold == 0:
+            return False
+        if guild_id in self._bursts:
+            return True
+
+        # Basta guardar as últimas (limiar + 1) entradas: há rajada se a mais antiga delas está na janela
+        now = time.monotonic()
+        joins = self._recent_joins.get(guild_id)
+        if joins is None:
+            joins = self._recent_joins[guild_id] = deque(maxlen=self.burst_threshold + 1)
+        joins.append(now)
+        return len(joins) == joins.maxlen and now - joins[0] < self.burst_window
+
+    def _add_welcome_fields(self, embed: discord.Embed):
+        """Adiciona ao embed de boas-vindas os próximos passos, eventos e links"""
+        embed.add_field(
+            name="📋 Próximos passos",
+            value="• Apresente-se no canal #apresentações\n• Leia as regras em #regras\n• Participe das conversas!",
+            inline=False
+        )
+
+        embed.add_field(
+            name="🎯 Eventos",
+            value="\n\nUse `/eventos` para ver os próximos eventos da semana!",
+            inline=False
+        )
+
+        embed.add_field(
+                name="\n\n🔗 Links úteis",
+                value="• [STEM GIRL - Linktree](https://linktr.ee/stemgirlsoficial)\n• Conecte-se conosco nas redes sociais!",
+                inline=False
+            )
+
+    def _build_welcome_message(self, member, channel) -> OutboxMessage:
+        """Monta a saudação de um membro (texto simples e embed detalhado em uma única mensagem)"""
+        embed = discord.Embed(
+            title="🎉 Bem-vinda ao STEM GIRL!",
+            description=f"Olá **{member.name}**! Seja muito bem-vinda à nossa comunidade!",
+            color=discord.Color.green()
+        )
+        self._add_welcome_fields(embed)
+
+        embed.set_thumbnail(url=member.avatar.url if member.avatar else member.default_avatar.url)
+        embed.set_footer(text=f"Você é o membro #{member.guild.member_count} do servidor!")
+
+        return OutboxMessage(member.guild.id, channel.id, 'welcome',
+                             content=f"Bem-vinda, {member.mention}! 🌷", embeds=[embed])
+
+    def _build_burst_content(self, members: list) -> str:
+        """
+        Texto da saudação agrupada, mencionando até burst_max_mentions membros
+
+        As menções param antes de o texto passar do limite de caracteres de uma
+        mensagem do Discord; os membros restantes entram em "e mais N pessoa(s)".
+        """
+        mentions = []
+        length = len("Bem-vindas, ")
+        for member in members[:self.burst_max_mentions]:
+            length += len(member.mention) + (2 if mentions else 0)
+            remaining = len(members) - len(mentions) - 1
+            # Sem restantes, a última vírgula vira " e " (um caractere a mais)
+            tail = f" e mais {remaining} pessoa(s)! 🌷" if remaining else " ! 🌷"
+            if length + len(tail) > self.MAX_CONTENT_LENGTH:
+                break
+            mentions.append(member.mention)
+
+        remaining = len(members) - len(mentions)
+        if remaining:
+            return f"Bem-vindas, {', '.join(mentions)} e mais {remaining} pessoa(s)! 🌷"
+        return f"Bem-vindas, {', '.join(mentions[:-1])} e {mentions[-1]}! 🌷"
+
+    def _build_burst_message(self, guild, members: list, channel) -> OutboxMessage:
+        """Monta a saudação agrupada de uma rajada"""
+        content = self._build_burst_content(members)
+
+        embed = discord.Embed(
+            title="🎉 Bem-vindas ao STEM GIRL!",
+            description=f"Olá às **{len(members)}** novas integrantes! Sejam muito bem-vindas à nossa comunidade!",
+            color=discord.Color.green()
+        )
+        self._add_welcome_fields(embed)
+
+        if guild.icon:
+            embed.set_thumbnail(url=guild.icon.url)
+        embed.set_footer(text=f"Agora somos {guild.member_count} membros no servidor!")
+
+        return OutboxMessage(guild.id, channel.id, 'welcome', content=content, embeds=[embed])
+
+    async def _flush_burst_later(self, guild):
+        """Envia a mensagem agrupada ao fim da janela"""
+        await asyncio.sleep(self.burst_window)
+        self._burst_tasks.pop(guild.id, None)
+        await self._flush_burst(guild)
+
+    async def _flush_burst(self, guild):
+        """Grava na outbox a saudação dos membros acumulados de um servidor"""
+        members = self._bursts.pop(guild.id, [])
+        if not members:
+            return
+
+        welcome_channel = self._get_channel(guild, self.WELCOME_CHANNEL_ID)
+        if welcome_channel is None:
+            logger.warning("Canal de boas-vindas não encontrado", extra={'guild': guild.id})
+            return
+        if not self._can_send(guild, welcome_channel, "boas-vindas"):
+            return
+
+        try:
+            if len(members) == 1:
+                message = self._build_welcome_message(members[0], welcome_channel)
+            else:
+                message = self._build_burst_message(guild, members, welcome_channel)
+                logger.info("Boas-vindas agrupadas para %d membro(s)", len(members), extra={'guild': guild.id})
+            if not await message_dispatcher.send(message):
+                logger.error("Não foi possível enfileirar a mensagem de boas-vindas", extra={'guild': guild.id})
+
+        except Exception as e:
+            logger.error(f"Erro ao montar mensagem de boas-vindas: {e}", extra={'guild': guild.id})
+
     @commands.Cog.listener()
     async def on_member_join(self, member):
         """Evento executado quando um membro entra no servidor"""
-        # Usar ID específico do canal de boas-vindas
-        welcome_channel = member.guild.get_channel(1396900097610088538)
-        
+        guild = member.guild
+        if self._register_join(guild.id):
+            # Rajada: acumular e enviar uma única mensagem ao fim da janela
+            self._bursts.setdefault(guild.id, []).append(member)
+            if guild.id not in self._burst_tasks:
+                self._burst_tasks[guild.id] = asyncio.get_running_loop().create_task(self._flush_burst_later(guild))
+            return
+
+        welcome_channel = self._get_channel(guild, self.WELCOME_CHANNEL_ID)
+
         if welcome_channel:
-            # Verificar se o bot tem permissão para enviar mensagens no canal
-            bot_member = member.guild.me
-            if bot_member is None:
-                print("Bot member não encontrado no guild")
-                return
-                
-            if not welcome_channel.permissions_for(bot_member).send_messages:
-                print(f"Bot não tem permissão para enviar mensagens no canal de boas-vindas: {welcome_channel.name}")
+            if not self._can_send(guild, welcome_channel, "boas-vindas"):
                 return
-            
+
             try:
-                # Mensagem simples de boas-vindas
-                await welcome_channel.send(f"Bem-vinda, {member.mention}! 🌷")
-                
-                # Embed detalhado
-                embed = discord.Embed(
-                    title="🎉 Bem-vinda ao STEM GIRL!",
-                    description=f"Olá **{member.name}**! Seja muito bem-vinda à nossa comunidade!",
-                    color=discord.Color.green()
-                )
-                
-                
-                embed.add_field(
-                    name="📋 Próximos passos",
-                    value="• Apresente-se no canal #apresentações\n• Leia as regras em #regras\n• Participe das conversas!",
-                    inline=False
-                )
-                
-                embed.add_field(
-                    name="🎯 Eventos",
-                    value="\n\nUse `/eventos` para ver os próximos eventos da semana!",
-                    inline=False
-                )
+                # Gravar na outbox; o despachante envia respeitando os limites de taxa
+                if not await message_dispatcher.send(self._build_welcome_message(member, welcome_channel)):
+                    logger.error("Não foi possível enfileirar a mensagem de boas-vindas", extra={'guild': guild.id})
 
-                embed.add_field(
-                        name="\n\n🔗 Links úteis",
-                        value="• [STEM GIRL - Linktree](https://linktr.ee/stemgirlsoficial)\n• Conecte-se conosco nas redes sociais!",
-                        inline=False
-                    )
-                
-                
-                embed.set_thumbnail(url=member.avatar.url if member.avatar else member.default_avatar.url)
-                embed.set_footer(text=f"Você é o membro #{len(member.guild.members)} do servidor!")
-                
-                await welcome_channel.send(embed=embed)
-                
-            except discord.Forbidden:
-                print(f"Bot não tem permissão para enviar mensagens no canal de boas-vindas: {welcome_channel.name}")
             except Exception as e:
-                print(f"Erro ao enviar mensagem de boas-vindas: {e}")
+                logger.error(f"Erro ao montar mensagem de boas-vindas: {e}", extra={'guild': guild.id})
         else:
-            print("Canal de boas-vindas não encontrado")
-            
-    
+            logger.warning("Canal de boas-vindas não encontrado", extra={'guild': guild.id})
+
     @commands.Cog.listener()
     async def on_member_remove(self, member):
         """Evento executado quando um membro sai do servidor"""
-        # Usar ID específico do canal de saídas
-        leave_channel = member.guild.get_channel(1396901336619941909)
-        
+        leave_channel = self._get_channel(member.guild, self.LEAVE_CHANNEL_ID)
+
         if leave_channel:
-            # Verificar se o bot tem permissão para enviar mensagens no canal
-            bot_member = member.guild.me
-            if bot_member is None:
-                print("Bot member não encontrado no guild")
-                return
-                
-            if not leave_channel.permissions_for(bot_member).send_messages:
-                print(f"Bot não tem permissão para enviar mensagens no canal de saídas: {leave_channel.name}")
+            if not self._can_send(member.guild, leave_channel, "saídas"):
                 return
-            
+
             try:
                 # Obter informações detalhadas para a equipe de moderação
                 current_time = datetime.now().strftime("%d/%m/%Y às %H:%M:%S")
                 member_count = member.guild.member_count
-                
+
                 # Embed detalhado para a staff
                 embed = discord.Embed(
                     title="👋 Membro Saiu do Servidor",
                     description=f"**{member.name}** deixou o servidor",
                     color=discord.Color.red()
                 )
-                
+
                 embed.add_field(
                     name="📋 Informações do Usuário",
                     value=f"**Nome:** {member.name}\n**ID:** {member.id}\n**Entrou no servidor:** {member.joined_at.strftime('%d/%m/%Y')}",
                     inline=True
                 )
-                
+
                 embed.add_field(
                     name="⏰ Informações da Saída",
                     value=f"**Hora da saída:** {current_time}\n**Membros restantes:** {member_count}",
                     inline=True
                 )
-                
+
                 embed.set_thumbnail(url=member.avatar.url if member.avatar else member.default_avatar.url)
                 embed.set_footer(text="Informações para a equipe de moderação")
-                
-                await leave_channel.send(embed=embed)
-                
-            except discord.Forbidden:
-                print(f"Bot não tem permissão para enviar mensagens no canal de saídas: {leave_channel.name}")
+
+                message = OutboxMessage(member.guild.id, leave_channel.id, 'leave', embeds=[embed])
+                if not await message_dispatcher.send(message):
+                    logger.error("Não foi possível enfileirar a mensagem de saída", extra={'guild': member.guild.id})
+
             except Exception as e:
-                print(f"Erro ao enviar mensagem de saída: {e}")
+                logger.error(f"Erro ao montar mensagem de saída: {e}", extra={'guild': member.guild.id})
         else:
-            print("Canal de saídas não encontrado")
+            logger.warning("Canal de saídas não encontrado", extra={'guild': member.guild.id})
 
 async def setup(bot):
     """Função necessária para carregar o Cog"""
     await bot.add_cog(Welcome(bot))
-    print("Cog Welcome carregado e comandos registrados!") 
\ No newline at end of file
+    print("Cog Welcome carregado e comandos registrados!")
@@ -1,37 +1,10 @@
 import discord
+from dados.recurrence import FREQUENCY_LABELS, MONTH_NAMES
 
 # Opções de frequência para eventos recorrentes (simplificadas)
+# Ordem: não se repete, semanais (7), quinzenais (7), mensais, anual e dias úteis
 FREQUENCY_CHOICES = [
-    # Opção para eventos únicos
-    discord.app_commands.Choice(name="Não se repete", value="Não se repete"),
-    
-    # Frequências semanais (7 opções)
-    discord.app_commands.Choice(name="Semanalmente a cada Segunda-feira", value="Semanalmente a cada Segunda-feira"),
-    discord.app_commands.Choice(name="Semanalmente a cada Terça-feira", value="Semanalmente a cada Terça-feira"),
-    discord.app_commands.Choice(name="Semanalmente a cada Quarta-feira", value="Semanalmente a cada Quarta-feira"),
-    discord.app_commands.Choice(name="Semanalmente a cada Quinta-feira", value="Semanalmente a cada Quinta-feira"),
-    discord.app_commands.Choice(name="Semanalmente a cada Sexta-feira", value="Semanalmente a cada Sexta-feira"),
-    discord.app_commands.Choice(name="Semanalmente a cada Sábado", value="Semanalmente a cada Sábado"),
-    discord.app_commands.Choice(name="Semanalmente a cada Domingo", value="Semanalmente a cada Domingo"),
-    
-    # Frequências quinzenais (7 opções)
-    discord.app_commands.Choice(name="Quinzenalmente a cada Segunda-feira", value="Quinzenalmente a cada Segunda-feira"),
-    discord.app_commands.Choice(name="Quinzenalmente a cada Terça-feira", value="Quinzenalmente a cada Terça-feira"),
-    discord.app_commands.Choice(name="Quinzenalmente a cada Quarta-feira", value="Quinzenalmente a cada Quarta-feira"),
-    discord.app_commands.Choice(name="Quinzenalmente a cada Quinta-feira", value="Quinzenalmente a cada Quinta-feira"),
-    discord.app_commands.Choice(name="Quinzenalmente a cada Sexta-feira", value="Quinzenalmente a cada Sexta-feira"),
-    discord.app_commands.Choice(name="Quinzenalmente a cada Sábado", value="Quinzenalmente a cada Sábado"),
-    discord.app_commands.Choice(name="Quinzenalmente a cada Domingo", value="Quinzenalmente a cada Domingo"),
-    
-    # Frequências mensais (simplificadas)
-    discord.app_commands.Choice(name="Mensalmente (mesmo dia)", value="Mensalmente (mesmo dia)"),
-    discord.app_commands.Choice(name="Mensalmente (mesmo dia da semana)", value="Mensalmente (mesmo dia da semana)"),
-    
-    # Frequências anuais
-    discord.app_commands.Choice(name="Anualmente (mesmo dia)", value="Anualmente (mesmo dia)"),
-    
-    # Frequências diárias
-    discord.app_commands.Choice(name="Todos os dias úteis (segunda a sexta-feira)", value="Todos os dias úteis (segunda a sexta-feira)")
+    discord.app_commands.Choice(name=label, value=label) for label in FREQUENCY_LABELS
 ]
 
 # Opções de detalhes para eventos recorrentes (limitado a 25 para respeitar o limite do Discord)
@@ -47,18 +20,7 @@ DETAILS_CHOICES = [
     discord.app_commands.Choice(name="Última semana", value="última semana"),
     
     # Detalhes para eventos anuais
-    discord.app_commands.Choice(name="Janeiro", value="Janeiro"),
-    discord.app_commands.Choice(name="Fevereiro", value="Fevereiro"),
-    discord.app_commands.Choice(name="Março", value="Março"),
-    discord.app_commands.Choice(name="Abril", value="Abril"),
-    discord.app_commands.Choice(name="Maio", value="Maio"),
-    discord.app_commands.Choice(name="Junho", value="Junho"),
-    discord.app_commands.Choice(name="Julho", value="Julho"),
-    discord.app_commands.Choice(name="Agosto", value="Agosto"),
-    discord.app_commands.Choice(name="Setembro", value="Setembro"),
-    discord.app_commands.Choice(name="Outubro", value="Outubro"),
-    discord.app_commands.Choice(name="Novembro", value="Novembro"),
-    discord.app_commands.Choice(name="Dezembro", value="Dezembro"),
+    *(discord.app_commands.Choice(name=month, value=month) for month in MONTH_NAMES),
     
     # Combinações comuns para anual
     discord.app_commands.Choice(name="1 de Janeiro", value="1 de Janeiro"),
@@ -1,9 +1,14 @@
+import math
 import discord
 from datetime import datetime
+from dados.event_datetime import format_date_with_weekday, parse_event_datetime
 
 class EventFormatters:
     """Classe para formatar e construir Embeds de eventos"""
     
+    # Eventos por embed quando vários lembretes saem juntos (o despachante junta até 10 embeds por mensagem)
+    REMINDER_EVENTS_PER_EMBED = 10
+    
     @staticmethod
     def _format_date_with_day(date_str: str) -> str:
         """
@@ -15,21 +20,7 @@ class EventFormatters:
         Returns:
             str: Data formatada com dia da semana (ex: "22/07/2025 (Terça-feira)")
         """
-        try:
-            date_obj = datetime.strptime(date_str, "%d/%m/%Y")
-            weekdays = {
-                0: "Segunda-feira",
-                1: "Terça-feira", 
-                2: "Quarta-feira",
-                3: "Quinta-feira",
-                4: "Sexta-feira",
-                5: "Sábado",
-                6: "Domingo"
-            }
-            weekday_name = weekdays[date_obj.weekday()]
-            return f"{date_str} ({weekday_name})"
-        except ValueError:
-            return date_str
+        return format_date_with_weekday(date_str)
     
     @staticmethod
     def build_user_events_embed(events_list: list) -> discord.Embed:
@@ -37,7 +28,7 @@ class EventFormatters:
         Constrói um Embed formatado para usuários finais (eventos da semana atual)
         
         Args:
-            events_list: Lista de tuplas de eventos (id, name, date, time, link)
+            events_list: Lista de EventRow (id, name, date, time, link)
             
         Returns:
             discord.Embed: Embed formatado para usuários
@@ -57,18 +48,16 @@ class EventFormatters:
         )
         
         for event in events_list:
-            event_id, name, date, time, link = event
-            
             # Formatar data com dia da semana
-            formatted_date = EventFormatters._format_date_with_day(date)
+            formatted_date = EventFormatters._format_date_with_day(event.date)
             
             # Construir informações do evento
-            event_info = f" {formatted_date} às {time}"
-            if link:
-                event_info += f"\n🔗 [Clique aqui para ver o evento]({link})"
+            event_info = f" {formatted_date} às {event.time}"
+            if event.link:
+                event_info += f"\n🔗 [Clique aqui para ver o evento]({event.link})"
             
             embed.add_field(
-                name=f"🎯 {name}",
+                name=f"🎯 {event.name}",
                 value=event_info,
                 inline=False
             )
@@ -76,13 +65,16 @@ class EventFormatters:
         return embed
     
     @staticmethod
-    def build_mod_events_embed(events_list: list, filter_type: str = "todos") -> discord.Embed:
+    def build_mod_events_embed(events_list: list, filter_type: str = "todos", page: int = None,
+                               has_more: bool = False) -> discord.Embed:
         """
         Constrói um Embed formatado para moderadores com filtros
         
         Args:
-            events_list: Lista de tuplas de eventos completos (id, name, date, time, link, created_by, type, status, frequency, recurrence_details)
+            events_list: Lista de EventRow completos (id, name, date, time, link, created_by, type, status, frequency, recurrence_details[, version])
             filter_type: Tipo de filtro aplicado
+            page: Número da página exibida (None quando a listagem cabe em uma página)
+            has_more: Indica se existem páginas seguintes
             
         Returns:
             discord.Embed: Embed formatado para moderadores
@@ -117,34 +109,45 @@ class EventFormatters:
         }
         filter_name = filter_names.get(filter_type, "Eventos")
         
+        # Sem contagem total: a listagem paginada nunca percorre a tabela inteira
+        if page is None:
+            description = f"Total de eventos: {len(events_list)}"
+        else:
+            description = f"Página {page} - {len(events_list)} evento(s) nesta página"
+        
         embed = discord.Embed(
             title=f"Moderação - {filter_name}",
-            description=f"Total de eventos: {len(events_list)}",
+            description=description,
             color=discord.Color.purple()
         )
         
+        if page is not None:
+            embed.set_footer(text="Use os botões abaixo para navegar" if has_more else "Fim da listagem")
+        
         for event in events_list:
-            event_id, name, date, time, link, created_by, event_type, status, frequency, recurrence_details = event
-            
             # Formatar data com dia da semana
-            formatted_date = EventFormatters._format_date_with_day(date)
+            formatted_date = EventFormatters._format_date_with_day(event.date)
             
             # Construir informações detalhadas para moderação
-            event_info = f"**ID:** {event_id}\n"
-            event_info += f"**Data:** {formatted_date} às {time}\n"
-            event_info += f"**Tipo:** {event_type.title()}\n"
-            event_info += f"**Status:** {status.title()}\n"
-            event_info += f"**Criado por:** <@{created_by}>\n"
+            event_info = f"**ID:** {event.id}\n"
+            event_info += f"**Data:** {formatted_date} às {event.time}\n"
+            event_info += f"**Tipo:** {event.type.title()}\n"
+            event_info += f"**Status:** {event.status.title()}\n"
+            event_info += f"**Criado por:** <@{event.created_by}>\n"
+            # A versão só vem nas consultas paginadas de /modeventos
+            version = event.get('version')
+            if version is not None:
+                event_info += f"**Versão:** {version}\n"
             
-            if frequency:
-                event_info += f"**Frequência:** {frequency}\n"
-            if recurrence_details:
-                event_info += f"**Detalhes:** {recurrence_details}\n"
-            if link:
-                event_info += f"**Link:** [Clique aqui]({link})\n"
+            if event.frequency:
+                event_info += f"**Frequência:** {event.frequency}\n"
+            if event.recurrence_details:
+                event_info += f"**Detalhes:** {event.recurrence_details}\n"
+            if event.link:
+                event_info += f"**Link:** [Clique aqui]({event.link})\n"
             
             embed.add_field(
-                name=f"{name}",
+                name=f"{event.name}",
                 value=event_info,
                 inline=False
             )
@@ -247,13 +250,14 @@ class EventFormatters:
         return embed
     
     @staticmethod
-    def build_event_updated_embed(event_id: int, updated_fields: dict) -> discord.Embed:
+    def build_event_updated_embed(event_id: int, updated_fields: dict, version: int = None) -> discord.Embed:
         """
         Constrói um Embed para confirmar alteração de evento
         
         Args:
             event_id: ID do evento alterado
             updated_fields: Dicionário com campos alterados {campo: novo_valor}
+            version: Nova versão do evento (opcional)
             
         Returns:
             discord.Embed: Embed de confirmação
@@ -267,6 +271,9 @@ class EventFormatters:
         for field, value in updated_fields.items():
             embed.add_field(name=f"Novo {field.title()}", value=str(value), inline=True)
         
+        if version is not None:
+            embed.set_footer(text=f"Versão atual: {version} (informe em 'versao' para não sobrescrever alterações de outro administrador)")
+        
         return embed
     
     @staticmethod
@@ -296,4 +303,77 @@ class EventFormatters:
         embed.add_field(name="Hora", value=time, inline=True)
         embed.add_field(name="ID", value=event_id, inline=True)
         
-        return embed 
\ No newline at end of file
+        return embed 
+    
+    @staticmethod
+    def _format_time_until(minutes: int) -> str:
+        """
+        Descreve quanto falta para um evento começar
+        
+        Args:
+            minutes: Minutos até o início
+            
+        Returns:
+            str: Texto como "em 10 minutos", "em 1 hora", "em 2 h 30 min" ou "em 1 dia"
+        """
+        if minutes < 60:
+            return "em 1 minuto" if minutes <= 1 else f"em {minutes} minutos"
+        if minutes < 1440:
+            hours, rest = divmod(minutes, 60)
+            if rest:
+                return f"em {hours} h {rest} min"
+            return "em 1 hora" if hours == 1 else f"em {hours} horas"
+        days, rest = divmod(minutes, 1440)
+        label = "1 dia" if days == 1 else f"{days} dias"
+        return f"em {label} e {rest // 60} h" if rest >= 60 else f"em {label}"
+    
+    @staticmethod
+    def build_reminder_embeds(reminders: list, now: datetime = None) -> list:
+        """
+        Constrói os Embeds de lembrete de eventos prestes a começar
+        
+        Um único lembrete gera um Embed detalhado; vários lembretes do mesmo
+        canal são agrupados em Embeds com até REMINDER_EVENTS_PER_EMBED eventos.
+        
+        Args:
+            reminders: Lista de tuplas (EventRow, antecedência_em_minutos) com name, date, time e link
+            now: Instante de referência para o tempo restante (padrão: agora)
+            
+        Returns:
+            list: Lista de discord.Embed
+        """
+        now = now or datetime.now()
+        
+        def time_until(event, offset: int) -> str:
+            starts = parse_event_datetime(event.date, event.time)
+            if starts is None:
+                return f"em {offset} minutos"
+            return EventFormatters._format_time_until(max(1, math.ceil((starts.value - now).total_seconds() / 60)))
+        
+        if len(reminders) == 1:
+            event, offset = reminders[0]
+            embed = discord.Embed(
+                title=f"⏰ Lembrete: {event.name}",
+                description=f"O evento começa {time_until(event, offset)}!",
+                color=discord.Color.orange()
+            )
+            embed.add_field(name="Data", value=EventFormatters._format_date_with_day(event.date), inline=True)
+            embed.add_field(name="Hora", value=event.time, inline=True)
+            if event.link:
+                embed.add_field(name="Link", value=f"[Clique aqui para ver o evento]({event.link})", inline=False)
+            return [embed]
+        
+        embeds = []
+        per_embed = EventFormatters.REMINDER_EVENTS_PER_EMBED
+        for start in range(0, len(reminders), per_embed):
+            embed = discord.Embed(
+                title="⏰ Eventos começando em breve" if start == 0 else "⏰ Eventos começando em breve (continuação)",
+                color=discord.Color.orange()
+            )
+            for event, offset in reminders[start:start + per_embed]:
+                event_info = f"Começa {time_until(event, offset)} - {EventFormatters._format_date_with_day(event.date)} às {event.time}"
+                if event.link:
+                    event_info += f"\n🔗 [Clique aqui para ver o evento]({event.link})"
+                embed.add_field(name=f"🎯 {event.name}", value=event_info, inline=False)
+            embeds.append(embed)
+        return embeds
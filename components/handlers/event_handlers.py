@@ -1,7 +1,15 @@
 import discord
+from dados.database import UPDATE_OK, UPDATE_NOT_FOUND, UPDATE_STALE, UPDATE_WRONG_STATUS, UPDATE_INVALID_DATETIME
 from services import events_service
+from services import event_timer
+from services.reminder_service import AsyncReminderService
+from services.reminder_timer import reminder_timer
+from services.week_view_cache import week_view_cache
+from dados.recurrence import NO_REPEAT, MONTHLY_SAME_WEEKDAY, monthly_nth_label
+from dados.event_datetime import parse_date
 from components.formatters import event_formatters
 from components.validators import event_validators
+from components.views import event_views
 
 class EventHandlers:
     """Classe para gerenciar a lógica de negócio dos comandos de eventos"""
@@ -36,9 +44,10 @@ class EventHandlers:
                 return False, event_formatters.EventFormatters.build_error_embed("Data Inválida", error_msg)
             
             # Adicionar evento
-            success = events_service.EventsService.add_unique_event(nome, data, hora, link, interaction.user.id)
+            event_id = await events_service.AsyncEventsService.add_unique_event(interaction.guild_id, nome, data, hora, link, interaction.user.id)
             
-            if success:
+            if event_id:
+                event_timer.notify_event_changed(event_id)
                 embed = event_formatters.EventFormatters.build_event_added_embed(
                     event_type="único",
                     name=nome,
@@ -98,12 +107,26 @@ class EventHandlers:
             frequencia_value = frequencia.value if hasattr(frequencia, 'value') else frequencia
             detalhes_value = detalhes.value if detalhes and hasattr(detalhes, 'value') else detalhes
             
+            # Processar configurações de auto-conclusão
+            auto_complete_config = None
+            if auto_concluir and frequencia_value == NO_REPEAT:
+                auto_complete_value = auto_concluir.value if hasattr(auto_concluir, 'value') else auto_concluir
+                tempo_value = tempo_conclusao.value if tempo_conclusao and hasattr(tempo_conclusao, 'value') else "1"
+                
+                auto_complete_config = {
+                    'auto_complete': auto_complete_value == "sim",
+                    'complete_after_hours': float(tempo_value)
+                }
+            
             # Verificar se é evento único
-            if frequencia_value == "Não se repete":
+            if frequencia_value == NO_REPEAT:
                 # Adicionar como evento único
-                success = events_service.EventsService.add_unique_event(nome, data_inicio, hora, link, interaction.user.id)
+                event_id = await events_service.AsyncEventsService.add_unique_event(
+                    interaction.guild_id, nome, data_inicio, hora, link, interaction.user.id, auto_complete_config
+                )
                 
-                if success:
+                if event_id:
+                    event_timer.notify_event_changed(event_id)
                     embed = event_formatters.EventFormatters.build_event_added_embed(
                         event_type="único",
                         name=nome,
@@ -120,7 +143,7 @@ class EventHandlers:
                     return False, embed
             
             # Verificar se é evento mensal que precisa de seleção específica
-            if frequencia_value == "Mensalmente (mesmo dia da semana)":
+            if frequencia_value == MONTHLY_SAME_WEEKDAY:
                 # Criar seleção interativa para posição no mês
                 return await EventHandlers._handle_monthly_selection(
                     interaction, nome, data_inicio, hora, link
@@ -133,24 +156,14 @@ class EventHandlers:
                 if not is_valid:
                     return False, event_formatters.EventFormatters.build_error_embed("Detalhes Inválidos", error_msg)
             
-            # Processar configurações de auto-conclusão
-            auto_complete_config = None
-            if auto_concluir and frequencia_value == "Não se repete":
-                auto_complete_value = auto_concluir.value if hasattr(auto_concluir, 'value') else auto_concluir
-                tempo_value = tempo_conclusao.value if tempo_conclusao and hasattr(tempo_conclusao, 'value') else "1"
-                
-                auto_complete_config = {
-                    'auto_complete': auto_complete_value == "sim",
-                    'complete_after_hours': float(tempo_value)
-                }
-            
             # Adicionar evento recorrente
-            success = events_service.EventsService.add_recurring_event(
-                nome, data_inicio, hora, link, frequencia_value, processed_details, 
+            event_id = await events_service.AsyncEventsService.add_recurring_event(
+                interaction.guild_id, nome, data_inicio, hora, link, frequencia_value, processed_details, 
                 interaction.user.id, auto_complete_config
             )
             
-            if success:
+            if event_id:
+                event_timer.notify_event_changed(event_id)
                 embed = event_formatters.EventFormatters.build_event_added_embed(
                     event_type="recorrente",
                     name=nome,
@@ -191,13 +204,14 @@ class EventHandlers:
             tuple: (sucesso, embed_resposta)
         """
         try:
-            # Analisar a data para determinar o dia da semana e posição no mês
-            from datetime import datetime
-            date_obj = datetime.strptime(data_inicio, "%d/%m/%Y")
+            # Analisar a data (já validada) para determinar o dia da semana e posição no mês
+            event_date = parse_date(data_inicio)
+            if event_date is None:
+                raise ValueError("Formato de data inválido. Use DD/MM/YYYY")
             
             # Obter informações da data
-            weekday_name = EventHandlers._get_weekday_name(date_obj.weekday())
-            week_position = EventHandlers._get_week_position(date_obj)
+            weekday_name = event_date.weekday_name
+            week_position = EventHandlers._get_week_position(event_date.value)
             
             # Criar embed de seleção
             embed = discord.Embed(
@@ -256,11 +270,11 @@ class EventHandlers:
                         return
                     
                     # Criar frequência específica
-                    weekday_name = EventHandlers._get_weekday_name(date_obj.weekday())
-                    frequency_value = f"No(a) {position} {weekday_name} de cada mês"
+                    frequency_value = monthly_nth_label(position, event_date.weekday)
                     
                     # Adicionar evento
-                    success = events_service.EventsService.add_recurring_event(
+                    event_id = await events_service.AsyncEventsService.add_recurring_event(
+                        button_interaction.guild_id,
                         self.event_data['nome'], 
                         self.event_data['data_inicio'], 
                         self.event_data['hora'], 
@@ -270,7 +284,8 @@ class EventHandlers:
                         button_interaction.user.id
                     )
                     
-                    if success:
+                    if event_id:
+                        event_timer.notify_event_changed(event_id)
                         embed = event_formatters.EventFormatters.build_event_added_embed(
                             event_type="recorrente",
                             name=self.event_data['nome'],
@@ -308,20 +323,6 @@ class EventHandlers:
             )
             return False, embed
     
-    @staticmethod
-    def _get_weekday_name(weekday: int) -> str:
-        """Retorna o nome do dia da semana"""
-        weekdays = {
-            0: "Segunda-feira",
-            1: "Terça-feira", 
-            2: "Quarta-feira",
-            3: "Quinta-feira",
-            4: "Sexta-feira",
-            5: "Sábado",
-            6: "Domingo"
-        }
-        return weekdays.get(weekday, "Desconhecido")
-    
     @staticmethod
     def _get_week_position(date_obj) -> str:
         """Determina a posição da semana no mês"""
@@ -339,14 +340,19 @@ class EventHandlers:
     
     @staticmethod
     async def handle_alter_event(interaction, id_evento: int, name=None, date=None, time=None, 
-                                link=None, frequency=None, recurrence_details=None, status=None):
+                                link=None, frequency=None, recurrence_details=None, status=None, version=None):
         """
         Gerencia a alteração de um evento
         
+        A alteração é uma única atualização condicional: não há leitura prévia
+        do evento, e a resposta do banco diz se ele não existe ou se a versão
+        informada já foi superada por outra alteração.
+        
         Args:
             interaction: Objeto de interação do Discord
             id_evento: ID do evento
             **kwargs: Campos a serem alterados
+            version: Versão do evento vista pelo administrador (opcional)
             
         Returns:
             tuple: (sucesso, embed_resposta)
@@ -374,22 +380,19 @@ class EventHandlers:
             if status_value is not None:
                 update_fields['status'] = status_value
             
-            # Verificar se o evento existe
-            exists, error_msg, event = event_validators.EventValidators.validate_event_exists(id_evento)
-            if not exists:
-                return False, event_formatters.EventFormatters.build_error_embed("Evento Não Encontrado", error_msg)
-            
             # Validar campos de atualização
             is_valid, error_msg, update_fields = event_validators.EventValidators.validate_update_fields(**update_fields)
             if not is_valid:
                 return False, event_formatters.EventFormatters.build_error_embed("Campos Vazios", error_msg)
             
-            # Validar data/hora se fornecida
-            if 'date' in update_fields and 'time' in update_fields:
+            # Validar o formato de data e hora, mesmo quando apenas uma delas é fornecida
+            # (a combinação com a data/hora atual do evento é validada na alteração)
+            if 'date' in update_fields:
                 is_valid, error_msg = event_validators.EventValidators.validate_date_format(update_fields['date'])
                 if not is_valid:
                     return False, event_formatters.EventFormatters.build_error_embed("Formato Inválido", error_msg)
-                
+            
+            if 'time' in update_fields:
                 is_valid, error_msg = event_validators.EventValidators.validate_time_format(update_fields['time'])
                 if not is_valid:
                     return False, event_formatters.EventFormatters.build_error_embed("Formato Inválido", error_msg)
@@ -403,15 +406,30 @@ class EventHandlers:
                     return False, event_formatters.EventFormatters.build_error_embed("Detalhes Inválidos", error_msg)
                 update_fields['recurrence_details'] = processed_details
             
-            # Alterar evento
-            success = events_service.EventsService.alter_event(id_evento, **update_fields)
+            # Alterar evento (condicionado à versão, se informada)
+            result, event = await events_service.AsyncEventsService.alter_event(interaction.guild_id, id_evento, version, **update_fields)
             
-            if success:
+            if result == UPDATE_OK:
+                event_timer.notify_event_changed(id_evento)
                 embed = event_formatters.EventFormatters.build_event_updated_embed(
                     event_id=id_evento,
-                    updated_fields=update_fields
+                    updated_fields=update_fields,
+                    version=event.version
                 )
                 return True, embed
+            elif result == UPDATE_NOT_FOUND:
+                return False, event_formatters.EventFormatters.build_error_embed("Evento Não Encontrado", "Evento não encontrado.")
+            elif result == UPDATE_STALE:
+                return False, event_formatters.EventFormatters.build_error_embed(
+                    "Versão Desatualizada",
+                    f"O evento foi alterado por outra pessoa depois da versão {version} (versão atual: {event.version}). "
+                    f"Confira os dados em /modeventos e repita a alteração com versao {event.version}."
+                )
+            elif result == UPDATE_INVALID_DATETIME:
+                return False, event_formatters.EventFormatters.build_error_embed(
+                    "Data Inválida",
+                    "A nova data e hora do evento (combinadas com as atuais, se apenas uma foi informada) devem ser válidas e no futuro!"
+                )
             else:
                 embed = event_formatters.EventFormatters.build_error_embed(
                     "Erro",
@@ -438,8 +456,15 @@ class EventHandlers:
             tuple: (sucesso, embed_resposta)
         """
         try:
-            events = events_service.EventsService.get_week_events_for_users()
+            # Servir a visão já renderizada enquanto nenhum evento for alterado
+            embed = week_view_cache.get(interaction.guild_id)
+            if embed is not None:
+                return True, embed
+            
+            generation = week_view_cache.generation(interaction.guild_id)
+            events = await events_service.AsyncEventsService.get_week_events_for_users(interaction.guild_id)
             embed = event_formatters.EventFormatters.build_user_events_embed(events)
+            week_view_cache.put(interaction.guild_id, embed, generation, not_after=events_service.EventsService.get_week_view_expiry(events))
             return True, embed
             
         except Exception as e:
@@ -459,12 +484,19 @@ class EventHandlers:
             filter_type: Tipo de filtro a ser aplicado
             
         Returns:
-            tuple: (sucesso, embed_resposta)
+            tuple: (sucesso, embed_resposta) ou (sucesso, (embed, view)) quando houver mais de uma página
         """
         try:
-            events = events_service.EventsService.get_filtered_events_for_moderation(filter_type)
-            embed = event_formatters.EventFormatters.build_mod_events_embed(events, filter_type)
-            return True, embed
+            # Buscar apenas a primeira página; as demais são carregadas pelos botões da view
+            events, next_cursor = await events_service.AsyncEventsService.get_moderation_page(interaction.guild_id, filter_type)
+            
+            if next_cursor is None:
+                embed = event_formatters.EventFormatters.build_mod_events_embed(events, filter_type)
+                return True, embed
+            
+            embed = event_formatters.EventFormatters.build_mod_events_embed(events, filter_type, page=1, has_more=True)
+            view = event_views.ModerationEventsView(interaction, filter_type, next_cursor)
+            return True, (embed, view)
             
         except Exception as e:
             embed = event_formatters.EventFormatters.build_error_embed(
@@ -486,26 +518,23 @@ class EventHandlers:
             tuple: (sucesso, embed_resposta)
         """
         try:
-            # Verificar se o evento existe
-            exists, error_msg, event = event_validators.EventValidators.validate_event_exists(id_evento)
-            if not exists:
-                return False, event_formatters.EventFormatters.build_error_embed("Evento Não Encontrado", error_msg)
+            # Marcar como concluído apenas se ainda estiver ativo, sem leitura prévia
+            result, event = await events_service.AsyncEventsService.mark_event_as_completed(interaction.guild_id, id_evento)
             
-            # Verificar se o evento está ativo
-            is_valid, error_msg = event_validators.EventValidators.validate_event_status(event, 'ativo')
-            if not is_valid:
-                return False, event_formatters.EventFormatters.build_error_embed("Status Inválido", error_msg)
+            if result == UPDATE_NOT_FOUND:
+                return False, event_formatters.EventFormatters.build_error_embed("Evento Não Encontrado", "Evento não encontrado.")
             
-            # Marcar como concluído
-            success = events_service.EventsService.mark_event_as_completed(id_evento)
+            if result == UPDATE_WRONG_STATUS:
+                is_valid, error_msg = event_validators.EventValidators.validate_event_status(event, 'ativo')
+                return False, event_formatters.EventFormatters.build_error_embed("Status Inválido", error_msg)
             
-            if success:
-                event_id, name, date, time, link, created_by, event_type, status = event
+            if result == UPDATE_OK:
+                event_timer.notify_event_changed(id_evento)
                 embed = event_formatters.EventFormatters.build_event_completed_embed(
                     event_id=id_evento,
-                    name=name,
-                    date=date,
-                    time=time
+                    name=event.name,
+                    date=event.date,
+                    time=event.time
                 )
                 return True, embed
             else:
@@ -522,6 +551,63 @@ class EventHandlers:
             )
             return False, embed
     
+    @staticmethod
+    async def handle_set_reminder_channel(interaction, channel=None):
+        """
+        Gerencia a definição do canal de lembretes de eventos
+        
+        Args:
+            interaction: Objeto de interação do Discord
+            channel: Canal de texto que recebe os lembretes (None = desativar)
+            
+        Returns:
+            tuple: (sucesso, embed_resposta)
+        """
+        try:
+            if channel is not None:
+                # Verificar se o bot consegue publicar os lembretes no canal
+                permissions = channel.permissions_for(interaction.guild.me)
+                if not (permissions.send_messages and permissions.embed_links):
+                    return False, event_formatters.EventFormatters.build_error_embed(
+                        "Permissão Insuficiente",
+                        f"O bot precisa das permissões 'Enviar mensagens' e 'Inserir links' em {channel.mention}."
+                    )
+            
+            success = await AsyncReminderService.set_reminder_channel(interaction.guild_id, channel.id if channel else None)
+            if not success:
+                return False, event_formatters.EventFormatters.build_error_embed(
+                    "Erro",
+                    "Erro ao salvar o canal de lembretes. Tente novamente."
+                )
+            
+            reminder_timer.wake()
+            if channel is None:
+                return True, event_formatters.EventFormatters.build_success_embed(
+                    "Lembretes Desativados",
+                    "Os lembretes de eventos não serão mais enviados neste servidor."
+                )
+            
+            description = f"Os lembretes dos eventos ativos serão enviados em {channel.mention}."
+            fields = None
+            if reminder_timer.offsets:
+                fields = {"Antecedência": ", ".join(
+                    event_formatters.EventFormatters._format_time_until(offset).removeprefix("em ") for offset in reminder_timer.offsets
+                )}
+            else:
+                description += "\n⚠️ Os lembretes estão desativados na configuração do bot (REMINDER_OFFSETS)."
+            return True, event_formatters.EventFormatters.build_success_embed(
+                "Canal de Lembretes Definido",
+                description,
+                fields
+            )
+            
+        except Exception as e:
+            embed = event_formatters.EventFormatters.build_error_embed(
+                "Erro",
+                f"Erro ao definir canal de lembretes: {e}"
+            )
+            return False, embed
+    
     @staticmethod
     async def handle_permission_error(interaction, error):
         """
@@ -1,5 +1,6 @@
-from datetime import datetime
 from services import events_service
+from dados.event_datetime import parse_date, parse_time
+from dados.recurrence import RecurrenceRule, MONTH_NAMES
 
 class EventValidators:
     """Classe para validar entradas de eventos"""
@@ -15,11 +16,9 @@ class EventValidators:
         Returns:
             tuple: (é_válida, mensagem_erro)
         """
-        try:
-            datetime.strptime(date_str, '%d/%m/%Y')
-            return True, ""
-        except ValueError:
+        if parse_date(date_str) is None:
             return False, "Formato de data inválido. Use DD/MM/YYYY"
+        return True, ""
     
     @staticmethod
     def validate_time_format(time_str: str) -> tuple[bool, str]:
@@ -32,11 +31,9 @@ class EventValidators:
         Returns:
             tuple: (é_válida, mensagem_erro)
         """
-        try:
-            datetime.strptime(time_str, '%H:%M')
-            return True, ""
-        except ValueError:
+        if parse_time(time_str) is None:
             return False, "Formato de hora inválido. Use HH:MM"
+        return True, ""
     
     @staticmethod
     def validate_future_datetime(date_str: str, time_str: str) -> tuple[bool, str]:
@@ -55,17 +52,18 @@ class EventValidators:
         return True, ""
     
     @staticmethod
-    def validate_event_exists(event_id: int) -> tuple[bool, str, object]:
+    def validate_event_exists(guild_id: int, event_id: int) -> tuple[bool, str, object]:
         """
         Valida se um evento existe no banco de dados
         
         Args:
+            guild_id: ID do servidor onde o comando foi executado
             event_id: ID do evento para validar
             
         Returns:
             tuple: (existe, mensagem_erro, evento_ou_none)
         """
-        event = events_service.EventsService.get_event_by_id(event_id)
+        event = events_service.EventsService.get_event_by_id(guild_id, event_id)
         if not event:
             return False, "Evento não encontrado.", None
         return True, "", event
@@ -76,7 +74,7 @@ class EventValidators:
         Valida se um evento tem o status esperado
         
         Args:
-            event: Objeto do evento
+            event: EventRow do evento (qualquer projeção com a coluna status)
             expected_status: Status esperado (padrão: 'ativo')
             
         Returns:
@@ -85,10 +83,8 @@ class EventValidators:
         if not event:
             return False, "Evento não encontrado."
         
-        event_id, name, date, time, link, created_by, event_type, status = event
-        
-        if status != expected_status:
-            return False, f"Evento já está {status}."
+        if event.status != expected_status:
+            return False, f"Evento já está {event.status}."
         
         return True, ""
     
@@ -107,18 +103,18 @@ class EventValidators:
         if not details:
             return True, "", None
         
-        # Validações específicas por frequência
-        if "Mensalmente" in frequency:
+        # Validações específicas por regra de recorrência
+        rule = RecurrenceRule.from_frequency(frequency)
+        
+        if rule.kind == RecurrenceRule.MONTHLY_DAY or (rule.kind == RecurrenceRule.MONTHLY_NTH and rule.position is None):
             if not details.startswith("dia "):
                 return False, "Para eventos mensais, os detalhes devem ser 'dia X' (ex: 'dia 15')", None
         
-        elif "Anualmente" in frequency:
-            valid_months = ["Janeiro", "Fevereiro", "Março", "Abril", "Maio", "Junho", 
-                          "Julho", "Agosto", "Setembro", "Outubro", "Novembro", "Dezembro"]
-            if not any(month in details for month in valid_months):
+        elif rule.kind == RecurrenceRule.YEARLY:
+            if not any(month in details for month in MONTH_NAMES):
                 return False, "Para eventos anuais, os detalhes devem incluir o mês (ex: '22 de Julho')", None
         
-        elif any(freq in frequency for freq in ["Semanalmente", "Quinzenalmente", "Diariamente", "Todos os dias úteis"]):
+        elif rule.kind in (RecurrenceRule.WEEKLY, RecurrenceRule.DAILY, RecurrenceRule.BUSINESS_DAYS):
             # Para essas frequências, detalhes são opcionais e podem ser ignorados
             return True, "", None
         
@@ -0,0 +1 @@
+# Componentes de views 
\ No newline at end of file
@@ -0,0 +1,72 @@
+import discord
+import logging
+from services import events_service
+from components.formatters import event_formatters
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+class ModerationEventsView(discord.ui.View):
+    """
+    Navegação da listagem paginada de /modeventos
+
+    Apenas a página exibida é buscada no banco. A view guarda o cursor de
+    cada página visitada, então "Anterior" refaz a busca da página anterior
+    sem recarregar a listagem inteira.
+    """
+
+    def __init__(self, interaction: discord.Interaction, filter_type: str, next_cursor: tuple):
+        super().__init__(timeout=300)  # 5 minutos
+        self.interaction = interaction
+        self.filter_type = filter_type
+        self._cursors = [None]  # Cursor usado para buscar cada página visitada
+        self._next_cursor = next_cursor
+        self._update_buttons()
+
+    @property
+    def page_number(self) -> int:
+        """Número da página exibida (começando em 1)"""
+        return len(self._cursors)
+
+    def _update_buttons(self):
+        """Habilita os botões conforme a posição atual"""
+        self.previous_page.disabled = self.page_number <= 1
+        self.next_page.disabled = self._next_cursor is None
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        """Permite a navegação apenas para quem executou o comando"""
+        if interaction.user.id != self.interaction.user.id:
+            await interaction.response.send_message(
+                "❌ Apenas quem executou o comando pode navegar por esta lista.",
+                ephemeral=True
+            )
+            return False
+        return True
+
+    @discord.ui.button(label="Anterior", style=discord.ButtonStyle.secondary, emoji="◀️")
+    async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self._cursors.pop()
+        await self._show_page(interaction)
+
+    @discord.ui.button(label="Próxima", style=discord.ButtonStyle.primary, emoji="▶️")
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self._cursors.append(self._next_cursor)
+        await self._show_page(interaction)
+
+    async def _show_page(self, interaction: discord.Interaction):
+        """Busca a página atual e atualiza a mensagem"""
+        events, self._next_cursor = await events_service.AsyncEventsService.get_moderation_page(
+            self.interaction.guild_id, self.filter_type, self._cursors[-1]
+        )
+        self._update_buttons()
+        embed = event_formatters.EventFormatters.build_mod_events_embed(
+            events, self.filter_type, page=self.page_number, has_more=self._next_cursor is not None
+        )
+        await interaction.response.edit_message(embed=embed, view=self)
+
+    async def on_timeout(self):
+        """Remove os botões quando a navegação expira"""
+        try:
+            await self.interaction.edit_original_response(view=None)
+        except discord.HTTPException as e:
+            logger.debug(f"Não foi possível remover a navegação de /modeventos: {e}")
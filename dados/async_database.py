@@ -0,0 +1,122 @@
+import asyncio
+import functools
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dados.database import db_context
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+class AsyncDatabaseContext:
+    """
+    Executa operações síncronas do banco de dados fora do event loop do Discord
+
+    Escritas são encaminhadas para uma thread dedicada, o que as serializa
+    naturalmente. Leituras usam um pool separado de threads, cada uma com sua
+    própria conexão somente leitura, e portanto nunca esperam pelas escritas.
+    """
+
+    def __init__(self):
+        self._executor = None
+        self._read_executor = None
+        self._timing_hook = None
+
+    def set_timing_hook(self, hook):
+        """
+        Define a função chamada ao fim de cada operação com sua duração
+
+        Args:
+            hook: Função (operation, kind, seconds) chamada na thread do banco,
+                  onde operation é o nome da função e kind é 'read' ou 'write';
+                  None remove o hook
+        """
+        self._timing_hook = hook
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Cria a thread dedicada de escrita na primeira utilização"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='db-writer')
+            logger.debug("Thread dedicada do banco de dados iniciada")
+        return self._executor
+
+    def _get_read_executor(self) -> ThreadPoolExecutor:
+        """Cria o pool de threads de leitura na primeira utilização"""
+        if self._read_executor is None:
+            pool_size = db_context.read_pool_size
+            self._read_executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix='db-reader')
+            logger.debug(f"Pool de leitura do banco de dados iniciado com {pool_size} thread(s)")
+        return self._read_executor
+
+    async def run(self, func, *args, **kwargs):
+        """
+        Executa uma função síncrona de escrita na thread do banco
+
+        Args:
+            func: Função síncrona a ser executada
+            *args: Argumentos posicionais da função
+            **kwargs: Argumentos nomeados da função
+
+        Returns:
+            Resultado retornado pela função
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), functools.partial(self._timed_call, 'write', func, *args, **kwargs))
+
+    async def run_read(self, func, *args, **kwargs):
+        """
+        Executa uma função síncrona somente leitura no pool de leitura
+
+        Args:
+            func: Função síncrona a ser executada
+            *args: Argumentos posicionais da função
+            **kwargs: Argumentos nomeados da função
+
+        Returns:
+            Resultado retornado pela função
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_read_executor(), functools.partial(self._timed_call, 'read', func, *args, **kwargs))
+
+    def _timed_call(self, kind: str, func, *args, **kwargs):
+        """Executa a função na thread do banco e informa sua duração ao hook de tempo"""
+        hook = self._timing_hook
+        if hook is None:
+            return func(*args, **kwargs)
+
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            try:
+                hook(getattr(func, '__name__', 'desconhecida'), kind, time.perf_counter() - started)
+            except Exception as e:
+                logger.error(f"Erro no hook de tempo do banco de dados: {e}")
+
+    def shutdown(self):
+        """Finaliza as threads do banco aguardando as operações pendentes"""
+        for executor in (self._read_executor, self._executor):
+            if executor is not None:
+                executor.shutdown(wait=True)
+        self._executor = None
+        self._read_executor = None
+        logger.debug("Threads do banco de dados finalizadas")
+
+# Instância global do contexto assíncrono do banco de dados
+async_db_context = AsyncDatabaseContext()
+
+async def run_in_db(func, *args, **kwargs):
+    """Função para executar uma operação de escrita na thread do banco de dados"""
+    return await async_db_context.run(func, *args, **kwargs)
+
+async def run_read_in_db(func, *args, **kwargs):
+    """Função para executar uma operação somente leitura no pool de leitura"""
+    return await async_db_context.run_read(func, *args, **kwargs)
+
+def set_timing_hook(hook):
+    """Função para definir o hook chamado com a duração de cada operação do banco"""
+    async_db_context.set_timing_hook(hook)
+
+def shutdown():
+    """Função para finalizar as threads do banco de dados"""
+    async_db_context.shutdown()
@@ -1,110 +1,553 @@
 import sqlite3
 import os
 import logging
+import threading
+from datetime import datetime, timedelta
 from pathlib import Path
+from dados.recurrence import rule_code_for
+from dados.event_datetime import STARTS_AT_FORMAT, parse_event_datetime
+from dados.models import event_row_factory
 
 # Configurar logging
 logger = logging.getLogger(__name__)
 
+def build_starts_at(date_str: str, time_str: str) -> str:
+    """
+    Converte data (DD/MM/YYYY) e hora (HH:MM) para o formato da coluna starts_at
+    
+    Args:
+        date_str: Data no formato DD/MM/YYYY
+        time_str: Hora no formato HH:MM
+        
+    Returns:
+        str: Data/hora no formato YYYY-MM-DD HH:MM ou None se inválida
+    """
+    event_datetime = parse_event_datetime(date_str, time_str)
+    return event_datetime.starts_at if event_datetime else None
+
+# Resultados de alter_event (atualização condicional em uma única ida ao banco)
+UPDATE_OK = 'ok'
+UPDATE_NOT_FOUND = 'not_found'
+UPDATE_STALE = 'stale'
+UPDATE_WRONG_STATUS = 'wrong_status'
+UPDATE_INVALID_DATETIME = 'invalid_datetime'
+UPDATE_ERROR = 'error'
+
+# Colunas do evento devolvidas por alter_event (RETURNING)
+EVENT_RETURNING_COLUMNS = 'id, name, date, time, link, created_by, type, status, version'
+
+def build_complete_at(starts_at: str, complete_after_hours) -> str:
+    """
+    Calcula o instante de auto-conclusão de um evento único
+    
+    Args:
+        starts_at: Início do evento no formato da coluna starts_at
+        complete_after_hours: Horas após o início (aceita frações, ex: 0.5)
+        
+    Returns:
+        str: Instante no formato YYYY-MM-DD HH:MM ou None se inválido
+    """
+    try:
+        hours = 1 if complete_after_hours is None else float(complete_after_hours)
+        return (datetime.strptime(starts_at, STARTS_AT_FORMAT) + timedelta(hours=hours)).strftime(STARTS_AT_FORMAT)
+    except (ValueError, TypeError):
+        return None
+
 class DatabaseContext:
-    """Classe para gerenciar o contexto do banco de dados"""
+    """
+    Classe para gerenciar o contexto do banco de dados
     
-    def __init__(self):
-        self.db_path = Path('dados') / 'stem_bot.db'
+    Mantém uma conexão de escrita (usada apenas pela thread dedicada do banco)
+    e conexões somente leitura por thread, limitadas pelo tamanho do pool de
+    leitura. Com journal_mode=WAL, leitores nunca esperam pelas escritas.
+    """
+    
+    def __init__(self, db_path=None):
+        self.db_path = Path(db_path) if db_path is not None else Path('dados') / 'stem_bot.db'
         self.connection = None
+        self._local = threading.local()
+        self._read_connections = []
+        self._read_lock = threading.Lock()
+        self.settings = None
+    
+    def _load_settings(self) -> dict:
+        """
+        Carrega as configurações do pool e dos pragmas a partir do ambiente
+        
+        Lidas sob demanda para respeitar o .env carregado em bot.py.
+        
+        Returns:
+            dict: Configurações do banco de dados
+        """
+        if self.settings is None:
+            self.settings = {
+                'read_pool_size': max(1, int(os.getenv('DB_READ_POOL_SIZE', '4'))),
+                'synchronous': os.getenv('DB_SYNCHRONOUS', 'NORMAL').upper(),
+                'cache_size': int(os.getenv('DB_CACHE_SIZE', '-16000')),
+                'mmap_size': int(os.getenv('DB_MMAP_SIZE', str(64 * 1024 * 1024))),
+                'busy_timeout': int(os.getenv('DB_BUSY_TIMEOUT_MS', '5000'))
+            }
+            if self.settings['synchronous'] not in ('OFF', 'NORMAL', 'FULL', 'EXTRA'):
+                logger.warning(f"DB_SYNCHRONOUS inválido: {self.settings['synchronous']}, usando NORMAL")
+                self.settings['synchronous'] = 'NORMAL'
+        return self.settings
+    
+    @property
+    def read_pool_size(self) -> int:
+        """Número máximo de conexões somente leitura"""
+        return self._load_settings()['read_pool_size']
+    
+    def _apply_pragmas(self, connection, read_only: bool = False):
+        """
+        Aplica os pragmas de desempenho a uma conexão
+        
+        Args:
+            connection: Conexão SQLite recém-aberta
+            read_only: True para conexões somente leitura
+        """
+        settings = self._load_settings()
+        cursor = connection.cursor()
+        cursor.execute(f"PRAGMA busy_timeout = {settings['busy_timeout']}")
+        cursor.execute(f"PRAGMA cache_size = {settings['cache_size']}")
+        cursor.execute(f"PRAGMA mmap_size = {settings['mmap_size']}")
+        if not read_only:
+            cursor.execute("PRAGMA journal_mode = WAL")
+            cursor.execute(f"PRAGMA synchronous = {settings['synchronous']}")
+        cursor.close()
+    
+    def _open_write_connection(self):
+        """Abre a conexão de escrita configurada com WAL"""
+        connection = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._apply_pragmas(connection)
+        return connection
     
     def setup_database(self):
-        """Configura o banco de dados e cria as tabelas necessárias"""
+        """
+        Configura o banco de dados aplicando as migrações pendentes
+        
+        A versão do esquema fica em PRAGMA user_version. Com o esquema em dia,
+        a inicialização custa apenas a leitura desse pragma.
+        """
         try:
             # Criar pasta dados se não existir
             self.db_path.parent.mkdir(exist_ok=True)
             
             # Conectar ao banco de dados
-            self.connection = sqlite3.connect(self.db_path)
-            cursor = self.connection.cursor()
+            if self.connection is None:
+                self.connection = self._open_write_connection()
+            
+            self._run_migrations()
+            
+            # Eventos antigos sem servidor (busca pelo índice de guild_id, sem varrer a tabela)
+            legacy_guild_id = os.getenv('LEGACY_GUILD_ID')
+            if legacy_guild_id:
+                self.assign_legacy_events(int(legacy_guild_id))
             
-            # Verificar se a tabela events existe
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='events'")
-            table_exists = cursor.fetchone() is not None
-            
-            if not table_exists:
-                # Criar tabela de eventos com todas as colunas (incluindo auto-conclusão)
-                cursor.execute('''
-                    CREATE TABLE events (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        name TEXT NOT NULL,
-                        date TEXT NOT NULL,
-                        time TEXT NOT NULL,
-                        link TEXT,
-                        created_by INTEGER NOT NULL,
-                        type TEXT NOT NULL DEFAULT 'unico',
-                        status TEXT NOT NULL DEFAULT 'ativo',
-                        frequency TEXT,
-                        recurrence_details TEXT,
-                        auto_complete BOOLEAN DEFAULT 1,
-                        complete_after_hours INTEGER DEFAULT 1,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                ''')
-                logger.info("Tabela events criada com sucesso!")
-            else:
-                # Verificar se as novas colunas existem
-                cursor.execute("PRAGMA table_info(events)")
-                columns = [column[1] for column in cursor.fetchall()]
-                
-                # Adicionar colunas que não existem
-                if 'type' not in columns:
-                    cursor.execute('ALTER TABLE events ADD COLUMN type TEXT NOT NULL DEFAULT "unico"')
-                    logger.info("Coluna 'type' adicionada à tabela events")
-                
-                if 'status' not in columns:
-                    cursor.execute('ALTER TABLE events ADD COLUMN status TEXT NOT NULL DEFAULT "ativo"')
-                    logger.info("Coluna 'status' adicionada à tabela events")
-                
-                if 'frequency' not in columns:
-                    cursor.execute('ALTER TABLE events ADD COLUMN frequency TEXT')
-                    logger.info("Coluna 'frequency' adicionada à tabela events")
-                
-                if 'recurrence_details' not in columns:
-                    cursor.execute('ALTER TABLE events ADD COLUMN recurrence_details TEXT')
-                    logger.info("Coluna 'recurrence_details' adicionada à tabela events")
-                
-                if 'auto_complete' not in columns:
-                    cursor.execute('ALTER TABLE events ADD COLUMN auto_complete BOOLEAN DEFAULT 1')
-                    logger.info("Coluna 'auto_complete' adicionada à tabela events")
-                
-                if 'complete_after_hours' not in columns:
-                    cursor.execute('ALTER TABLE events ADD COLUMN complete_after_hours INTEGER DEFAULT 1')
-                    logger.info("Coluna 'complete_after_hours' adicionada à tabela events")
-                
-                # Atualizar eventos existentes para ter status 'ativo' e type 'unico'
-                cursor.execute('UPDATE events SET status = "ativo" WHERE status IS NULL')
-                cursor.execute('UPDATE events SET type = "unico" WHERE type IS NULL')
-                cursor.execute('UPDATE events SET auto_complete = 1 WHERE auto_complete IS NULL')
-                cursor.execute('UPDATE events SET complete_after_hours = 1 WHERE complete_after_hours IS NULL')
-                logger.info("Eventos existentes atualizados com valores padrão")
-            
-            self.connection.commit()
             logger.info(f"Banco de dados configurado: {self.db_path}")
             
         except Exception as e:
             logger.error(f"Erro ao configurar banco de dados: {e}")
             raise
     
+    def get_schema_version(self) -> int:
+        """Retorna a versão do esquema gravada em PRAGMA user_version"""
+        return self.connection.execute('PRAGMA user_version').fetchone()[0]
+    
+    def _run_migrations(self):
+        """
+        Aplica, em ordem, as migrações com versão maior que a do banco
+        
+        Cada migração roda uma única vez, em sua própria transação, junto com a
+        atualização de user_version; uma falha desfaz a migração inteira. A
+        versão é relida após obter o lock de escrita, então processos iniciando
+        ao mesmo tempo (modo sharded) não aplicam a mesma migração duas vezes.
+        """
+        latest_version = self.MIGRATIONS[-1][0]
+        if self.get_schema_version() >= latest_version:
+            return
+        
+        for version, description, migration in self.MIGRATIONS:
+            cursor = self.connection.cursor()
+            try:
+                cursor.execute('BEGIN IMMEDIATE')
+                current_version = cursor.execute('PRAGMA user_version').fetchone()[0]
+                if current_version >= version:
+                    self.connection.rollback()
+                    continue
+                
+                logger.info(f"Aplicando migração {version}: {description}")
+                migration(self, cursor)
+                cursor.execute(f'PRAGMA user_version = {int(version)}')
+                self.connection.commit()
+                
+            except Exception as e:
+                self.connection.rollback()
+                logger.error(f"Erro na migração {version} ({description}): {e}")
+                raise
+            finally:
+                cursor.close()
+        
+        logger.info(f"Esquema do banco de dados na versão {latest_version}")
+    
+    def _migration_events_schema(self, cursor):
+        """
+        Migração 1: leva a tabela events (criada ou não por versões sem controle de esquema) ao formato atual
+        
+        Args:
+            cursor: Cursor da transação da migração
+        """
+        # Verificar se a tabela events existe
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='events'")
+        table_exists = cursor.fetchone() is not None
+        
+        if not table_exists:
+            # Criar tabela de eventos com todas as colunas (incluindo auto-conclusão)
+            cursor.execute('''
+                CREATE TABLE events (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name TEXT NOT NULL,
+                    date TEXT NOT NULL,
+                    time TEXT NOT NULL,
+                    link TEXT,
+                    created_by INTEGER NOT NULL,
+                    guild_id INTEGER,
+                    type TEXT NOT NULL DEFAULT 'unico',
+                    status TEXT NOT NULL DEFAULT 'ativo',
+                    frequency TEXT,
+                    recurrence_details TEXT,
+                    auto_complete BOOLEAN DEFAULT 1,
+                    complete_after_hours INTEGER DEFAULT 1,
+                    starts_at TEXT,
+                    recurrence_rule TEXT,
+                    complete_at TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            logger.info("Tabela events criada com sucesso!")
+        else:
+            # Verificar se as novas colunas existem
+            cursor.execute("PRAGMA table_info(events)")
+            columns = [column[1] for column in cursor.fetchall()]
+            
+            # Adicionar colunas que não existem
+            if 'type' not in columns:
+                cursor.execute('ALTER TABLE events ADD COLUMN type TEXT NOT NULL DEFAULT "unico"')
+                logger.info("Coluna 'type' adicionada à tabela events")
+            
+            if 'status' not in columns:
+                cursor.execute('ALTER TABLE events ADD COLUMN status TEXT NOT NULL DEFAULT "ativo"')
+                logger.info("Coluna 'status' adicionada à tabela events")
+            
+            if 'frequency' not in columns:
+                cursor.execute('ALTER TABLE events ADD COLUMN frequency TEXT')
+                logger.info("Coluna 'frequency' adicionada à tabela events")
+            
+            if 'recurrence_details' not in columns:
+                cursor.execute('ALTER TABLE events ADD COLUMN recurrence_details TEXT')
+                logger.info("Coluna 'recurrence_details' adicionada à tabela events")
+            
+            if 'auto_complete' not in columns:
+                cursor.execute('ALTER TABLE events ADD COLUMN auto_complete BOOLEAN DEFAULT 1')
+                logger.info("Coluna 'auto_complete' adicionada à tabela events")
+            
+            if 'complete_after_hours' not in columns:
+                cursor.execute('ALTER TABLE events ADD COLUMN complete_after_hours INTEGER DEFAULT 1')
+                logger.info("Coluna 'complete_after_hours' adicionada à tabela events")
+            
+            if 'starts_at' not in columns:
+                cursor.execute('ALTER TABLE events ADD COLUMN starts_at TEXT')
+                logger.info("Coluna 'starts_at' adicionada à tabela events")
+            
+            if 'recurrence_rule' not in columns:
+                cursor.execute('ALTER TABLE events ADD COLUMN recurrence_rule TEXT')
+                logger.info("Coluna 'recurrence_rule' adicionada à tabela events")
+            
+            if 'guild_id' not in columns:
+                cursor.execute('ALTER TABLE events ADD COLUMN guild_id INTEGER')
+                logger.info("Coluna 'guild_id' adicionada à tabela events")
+            
+            if 'complete_at' not in columns:
+                cursor.execute('ALTER TABLE events ADD COLUMN complete_at TEXT')
+                logger.info("Coluna 'complete_at' adicionada à tabela events")
+            
+            # Atualizar eventos existentes para ter status 'ativo' e type 'unico'
+            cursor.execute('UPDATE events SET status = "ativo" WHERE status IS NULL')
+            cursor.execute('UPDATE events SET type = "unico" WHERE type IS NULL')
+            cursor.execute('UPDATE events SET auto_complete = 1 WHERE auto_complete IS NULL')
+            cursor.execute('UPDATE events SET complete_after_hours = 1 WHERE complete_after_hours IS NULL')
+            logger.info("Eventos existentes atualizados com valores padrão")
+            
+            self._backfill_starts_at(cursor)
+            self._backfill_recurrence_rule(cursor)
+            self._backfill_complete_at(cursor)
+        
+        # Índices das consultas de cada servidor: começam por guild_id, então o custo
+        # depende apenas da quantidade de eventos daquele servidor
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_events_guild_status_type_starts_at ON events (guild_id, status, type, starts_at)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_events_guild_status_starts_at ON events (guild_id, status, starts_at)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_events_guild_starts_at ON events (guild_id, starts_at)')
+        cursor.execute('DROP INDEX IF EXISTS idx_events_status_starts_at')
+        cursor.execute('DROP INDEX IF EXISTS idx_events_starts_at')
+        
+        # Índice das varreduras do agendador, que percorrem todos os servidores
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_events_status_type_starts_at ON events (status, type, starts_at)')
+        
+        # Índice parcial com apenas os eventos únicos que aguardam auto-conclusão
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_events_auto_complete_at ON events (complete_at)
+            WHERE type = 'unico' AND status = 'ativo' AND auto_complete = 1
+        ''')
+    
+    def _migration_command_sync_state(self, cursor):
+        """
+        Migração 2: cria a tabela com o estado da sincronização dos comandos slash
+        
+        Args:
+            cursor: Cursor da transação da migração
+        """
+        # Último hash sincronizado de cada escopo de comandos slash (global ou servidor)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS command_sync_state (
+                scope TEXT PRIMARY KEY,
+                command_hash TEXT NOT NULL,
+                synced_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+    
+    def _migration_event_version(self, cursor):
+        """
+        Migração 3: adiciona a versão dos eventos usada nas alterações otimistas
+        
+        Args:
+            cursor: Cursor da transação da migração
+        """
+        # Incrementada a cada alteração do evento; alter_event pode exigir a versão lida pelo administrador
+        cursor.execute('ALTER TABLE events ADD COLUMN version INTEGER NOT NULL DEFAULT 1')
+    
+    def _migration_reminders(self, cursor):
+        """
+        Migração 4: cria as configurações por servidor e o registro de lembretes enviados
+        
+        Args:
+            cursor: Cursor da transação da migração
+        """
+        # Configurações de cada servidor (canal dos lembretes de eventos; NULL = lembretes desativados)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS guild_settings (
+                guild_id INTEGER PRIMARY KEY,
+                reminder_channel_id INTEGER,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        # Lembretes já enviados por ocorrência (starts_at) e antecedência; uma nova
+        # ocorrência de um evento recorrente ou uma nova data recebe lembretes novos
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS reminders_sent (
+                event_id INTEGER NOT NULL,
+                starts_at TEXT NOT NULL,
+                offset_minutes INTEGER NOT NULL,
+                sent_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (event_id, starts_at, offset_minutes)
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_reminders_sent_starts_at ON reminders_sent (starts_at)')
+    
+    def _migration_outbox(self, cursor):
+        """
+        Migração 5: cria a outbox das mensagens enviadas pelo bot
+        
+        Args:
+            cursor: Cursor da transação da migração
+        """
+        # Mensagens gravadas junto com a mudança de estado que as originou e enviadas pelo
+        # MessageDispatcher; enviadas são apagadas, falhas definitivas ficam com status 'failed'.
+        # payload guarda o JSON {"content": ..., "embeds": [...]} e next_attempt_at é epoch em segundos
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS outbox (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                guild_id INTEGER,
+                channel_id INTEGER NOT NULL,
+                kind TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt_at REAL NOT NULL DEFAULT 0,
+                last_error TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_outbox_status_next_attempt ON outbox (status, next_attempt_at)')
+    
+    def _migration_outbox_claims(self, cursor):
+        """
+        Migração 6: adiciona a reserva das mensagens da outbox pelo despachante
+        
+        Args:
+            cursor: Cursor da transação da migração
+        """
+        # Instante (epoch) em que o despachante reservou a mensagem; reservadas não são lidas de novo
+        # até serem enviadas (apagadas), reagendadas ou liberadas no próximo início do despachante
+        cursor.execute('ALTER TABLE outbox ADD COLUMN claimed_at REAL')
+    
+    def _migration_recurrence_day(self, cursor):
+        """
+        Migração 7: grava nas regras mensais e anuais pelo mesmo dia o dia do mês pretendido
+        
+        Args:
+            cursor: Cursor da transação da migração
+        """
+        # Sem o dia na regra, cada avanço partia da data já ajustada ao fim do mês (31/01 -> 28/02 -> 28/03);
+        # a data atual de cada evento é a melhor informação disponível sobre o dia pretendido
+        cursor.execute("""
+            SELECT id, date, time, frequency FROM events
+            WHERE recurrence_rule IN ('monthly_day', 'yearly')
+        """)
+        updates = []
+        for event_id, date, time, frequency in cursor.fetchall():
+            event_datetime = parse_event_datetime(date, time)
+            if event_datetime is not None:
+                updates.append((rule_code_for(frequency, event_datetime.value.day), event_id))
+        
+        if updates:
+            cursor.executemany('UPDATE events SET recurrence_rule = ? WHERE id = ?', updates)
+            logger.info(f"Dia do mês gravado na regra de {len(updates)} evento(s)")
+    
+    # Migrações em ordem de versão: (versão, descrição, função); nunca altere uma migração já publicada,
+    # acrescente uma nova com a próxima versão
+    MIGRATIONS = [
+        (1, "esquema da tabela events", _migration_events_schema),
+        (2, "tabela command_sync_state", _migration_command_sync_state),
+        (3, "coluna version da tabela events", _migration_event_version),
+        (4, "tabelas guild_settings e reminders_sent", _migration_reminders),
+        (5, "tabela outbox", _migration_outbox),
+        (6, "coluna claimed_at da tabela outbox", _migration_outbox_claims),
+        (7, "dia do mês nas regras mensais e anuais", _migration_recurrence_day),
+    ]
+    
+    def _backfill_starts_at(self, cursor):
+        """
+        Preenche a coluna starts_at dos eventos que ainda não a possuem
+        
+        Args:
+            cursor: Cursor da conexão em uso pela migração
+        """
+        cursor.execute('SELECT id, date, time FROM events WHERE starts_at IS NULL')
+        rows = cursor.fetchall()
+        
+        updates = []
+        for event_id, date, time in rows:
+            starts_at = build_starts_at(date, time)
+            if starts_at is None:
+                logger.warning(f"Evento {event_id} com data/hora inválida ({date} {time}), starts_at não preenchido")
+                continue
+            updates.append((starts_at, event_id))
+        
+        if updates:
+            cursor.executemany('UPDATE events SET starts_at = ? WHERE id = ?', updates)
+            logger.info(f"Coluna 'starts_at' preenchida para {len(updates)} evento(s)")
+    
+    def _backfill_recurrence_rule(self, cursor):
+        """
+        Preenche a coluna recurrence_rule a partir do rótulo de frequência
+        
+        Args:
+            cursor: Cursor da conexão em uso pela migração
+        """
+        cursor.execute('SELECT id, frequency FROM events WHERE recurrence_rule IS NULL')
+        updates = [(rule_code_for(frequency), event_id) for event_id, frequency in cursor.fetchall()]
+        
+        if updates:
+            cursor.executemany('UPDATE events SET recurrence_rule = ? WHERE id = ?', updates)
+            logger.info(f"Coluna 'recurrence_rule' preenchida para {len(updates)} evento(s)")
+    
+    def _backfill_complete_at(self, cursor):
+        """
+        Preenche a coluna complete_at dos eventos únicos que ainda não a possuem
+        
+        Args:
+            cursor: Cursor da conexão em uso pela migração
+        """
+        cursor.execute('''
+            SELECT id, starts_at, complete_after_hours FROM events
+            WHERE type = 'unico' AND complete_at IS NULL AND starts_at IS NOT NULL
+        ''')
+        updates = [(build_complete_at(starts_at, hours), event_id) for event_id, starts_at, hours in cursor.fetchall()]
+        
+        if updates:
+            cursor.executemany('UPDATE events SET complete_at = ? WHERE id = ?', updates)
+            logger.info(f"Coluna 'complete_at' preenchida para {len(updates)} evento(s)")
+    
+    def assign_legacy_events(self, guild_id: int) -> int:
+        """
+        Atribui a um servidor todos os eventos ainda sem guild_id
+        
+        Usado quando o bot está em um único servidor, caso em que os eventos
+        antigos certamente pertencem a ele.
+        
+        Args:
+            guild_id: ID do servidor
+            
+        Returns:
+            int: Quantidade de eventos atribuídos
+        """
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            cursor.execute('UPDATE events SET guild_id = ? WHERE guild_id IS NULL', (guild_id,))
+            conn.commit()
+            
+            if cursor.rowcount > 0:
+                logger.info(f"{cursor.rowcount} evento(s) sem servidor atribuído(s) ao servidor {guild_id}")
+            return cursor.rowcount
+            
+        except Exception as e:
+            logger.error(f"Erro ao atribuir eventos antigos ao servidor {guild_id}: {e}")
+            return 0
+    
     def get_connection(self):
-        """Retorna a conexão com o banco de dados"""
+        """Retorna a conexão de escrita com o banco de dados"""
         try:
             if self.connection is None:
-                self.connection = sqlite3.connect(self.db_path)
+                self.connection = self._open_write_connection()
                 logger.debug("Nova conexão com banco de dados estabelecida")
             return self.connection
         except Exception as e:
             logger.error(f"Erro ao obter conexão com banco de dados: {e}")
             raise
     
+    def get_read_connection(self):
+        """
+        Retorna a conexão somente leitura da thread atual
+        
+        Cada thread recebe sua própria conexão, aberta na primeira utilização.
+        
+        Returns:
+            sqlite3.Connection: Conexão somente leitura
+        """
+        try:
+            connection = getattr(self._local, 'connection', None)
+            if connection is None:
+                uri = f"file:{self.db_path.resolve().as_posix()}?mode=ro"
+                connection = sqlite3.connect(uri, uri=True, check_same_thread=False)
+                self._apply_pragmas(connection, read_only=True)
+                self._local.connection = connection
+                with self._read_lock:
+                    self._read_connections.append(connection)
+                logger.debug(f"Nova conexão de leitura estabelecida ({threading.current_thread().name})")
+            return connection
+        except Exception as e:
+            logger.error(f"Erro ao obter conexão de leitura com banco de dados: {e}")
+            raise
+    
     def close_connection(self):
-        """Fecha a conexão com o banco de dados"""
+        """Fecha a conexão de escrita e todas as conexões de leitura"""
         try:
+            with self._read_lock:
+                for connection in self._read_connections:
+                    connection.close()
+                self._read_connections.clear()
+            self._local = threading.local()
+            
             if self.connection:
                 self.connection.close()
                 self.connection = None
@@ -130,9 +573,9 @@ class DatabaseContext:
             
             cursor.execute('''
                 UPDATE events 
-                SET date = ?, time = ? 
+                SET date = ?, time = ?, starts_at = ?, version = version + 1 
                 WHERE id = ?
-            ''', (new_date, new_time, event_id))
+            ''', (new_date, new_time, build_starts_at(new_date, new_time), event_id))
             
             conn.commit()
             success = cursor.rowcount > 0
@@ -148,55 +591,105 @@ class DatabaseContext:
             logger.error(f"Erro ao atualizar data do evento {event_id}: {e}")
             return False
     
-    def alter_event(self, event_id: int, **kwargs) -> bool:
+    def alter_event(self, event_id: int, guild_id: int, expected_version: int = None,
+                    expected_status: str = None, **kwargs) -> tuple:
         """
-        Altera campos específicos de um evento
+        Altera campos de um evento com uma única atualização condicional
+        
+        O UPDATE só casa se o evento pertencer ao servidor e, quando informados,
+        ainda estiver na versão e no status esperados; a linha alterada volta
+        pelo RETURNING. Apenas quando nada casa o evento é relido, na mesma
+        transação, para distinguir evento inexistente, versão desatualizada e
+        status diferente do esperado.
+        
+        Data ou hora informadas sozinhas são combinadas com as do evento: se o
+        resultado não for uma data/hora válida e futura, a alteração é desfeita,
+        então data, hora, starts_at e complete_at nunca ficam divergentes.
         
         Args:
             event_id: ID do evento a ser alterado
-            **kwargs: Campos a serem atualizados (name, date, time, link, type, status, frequency, recurrence_details)
+            guild_id: ID do servidor dono do evento
+            expected_version: Versão lida por quem pediu a alteração (None = não verificar)
+            expected_status: Status exigido para a alteração (None = não verificar)
+            **kwargs: Campos a serem atualizados (name, date, time, link, type, status, frequency, recurrence_details, recurrence_rule)
             
         Returns:
-            bool: True se o evento foi alterado com sucesso, False caso contrário
+            tuple: (resultado, evento) com resultado UPDATE_OK, UPDATE_NOT_FOUND, UPDATE_STALE,
+                   UPDATE_WRONG_STATUS, UPDATE_INVALID_DATETIME ou UPDATE_ERROR e o evento (EventRow com EVENT_RETURNING_COLUMNS)
+                   após a alteração ou, se ela não ocorreu, no estado atual
         """
+        conn = self.get_connection()
         try:
-            conn = self.get_connection()
             cursor = conn.cursor()
+            cursor.row_factory = event_row_factory
             
             # Campos permitidos para atualização
-            allowed_fields = ['name', 'date', 'time', 'link', 'type', 'status', 'frequency', 'recurrence_details']
+            allowed_fields = ['name', 'date', 'time', 'link', 'type', 'status', 'frequency', 'recurrence_details', 'recurrence_rule']
             
             # Filtrar apenas campos permitidos
             update_fields = {k: v for k, v in kwargs.items() if k in allowed_fields and v is not None}
             
             if not update_fields:
                 logger.warning("Nenhum campo válido fornecido para atualização")
-                return False
+                return UPDATE_ERROR, None
             
-            # Construir query dinamicamente
-            set_clause = ', '.join([f"{field} = ?" for field in update_fields.keys()])
-            values = list(update_fields.values()) + [event_id]
+            # Restringir ao servidor dono do evento e às condições informadas
+            where_clause = 'id = ? AND guild_id = ?'
+            where_values = [event_id, guild_id]
+            if expected_version is not None:
+                where_clause += ' AND version = ?'
+                where_values.append(expected_version)
+            if expected_status is not None:
+                where_clause += ' AND status = ?'
+                where_values.append(expected_status)
             
-            query = f'''
+            set_clause = ', '.join([f"{field} = ?" for field in update_fields.keys()])
+            cursor.execute(f'''
                 UPDATE events 
-                SET {set_clause}
-                WHERE id = ?
-            '''
+                SET {set_clause}, version = version + 1
+                WHERE {where_clause}
+                RETURNING {EVENT_RETURNING_COLUMNS}, complete_after_hours, frequency
+            ''', list(update_fields.values()) + where_values)
+            row = cursor.fetchone()
             
-            cursor.execute(query, values)
-            conn.commit()
+            if row is None:
+                cursor.execute(f'SELECT {EVENT_RETURNING_COLUMNS} FROM events WHERE id = ? AND guild_id = ?', (event_id, guild_id))
+                current = cursor.fetchone()
+                conn.rollback()
+                if current is None:
+                    logger.warning(f"Evento {event_id} não encontrado para alteração")
+                    return UPDATE_NOT_FOUND, None
+                if expected_version is not None and current.version != expected_version:
+                    logger.info(f"Alteração do evento {event_id} recusada: versão {expected_version} desatualizada (atual: {current.version})")
+                    return UPDATE_STALE, current
+                return UPDATE_WRONG_STATUS, current
             
-            updated = cursor.rowcount > 0
-            if updated:
-                logger.info(f"Evento {event_id} atualizado: {list(update_fields.keys())}")
-            else:
-                logger.warning(f"Evento {event_id} não encontrado para alteração")
+            # Manter starts_at, complete_at e recurrence_rule sincronizados quando data, hora, tipo ou frequência mudarem
+            datetime_changed = 'date' in update_fields or 'time' in update_fields
+            if datetime_changed or 'type' in update_fields or 'frequency' in update_fields:
+                event_datetime = parse_event_datetime(row.date, row.time)
+                if datetime_changed and (event_datetime is None or not event_datetime.is_future()):
+                    conn.rollback()
+                    logger.info(f"Alteração do evento {event_id} recusada: data/hora resultante inválida ou no passado ({row.date} {row.time})")
+                    return UPDATE_INVALID_DATETIME, None
+                if event_datetime is not None:
+                    starts_at = event_datetime.starts_at
+                    cursor.execute(
+                        'UPDATE events SET starts_at = ?, complete_at = ?, recurrence_rule = ? WHERE id = ?',
+                        (starts_at, build_complete_at(starts_at, row.complete_after_hours) if row.type == 'unico' else None,
+                         rule_code_for(row.frequency, event_datetime.value.day), event_id)
+                    )
+                else:
+                    cursor.execute('UPDATE events SET recurrence_rule = ? WHERE id = ?', (rule_code_for(row.frequency), event_id))
             
-            return updated
+            conn.commit()
+            logger.info(f"Evento {event_id} atualizado para a versão {row.version}: {list(update_fields.keys())}")
+            return UPDATE_OK, row
             
         except Exception as e:
+            conn.rollback()
             logger.error(f"Erro ao alterar evento {event_id}: {e}")
-            return False
+            return UPDATE_ERROR, None
 
 # Instância global do contexto do banco de dados
 db_context = DatabaseContext()
@@ -206,9 +699,13 @@ def setup_database():
     db_context.setup_database()
 
 def get_connection():
-    """Função para obter a conexão com o banco de dados"""
+    """Função para obter a conexão de escrita com o banco de dados"""
     return db_context.get_connection()
 
+def get_read_connection():
+    """Função para obter a conexão somente leitura da thread atual"""
+    return db_context.get_read_connection()
+
 def close_connection():
     """Função para fechar a conexão com o banco de dados"""
     db_context.close_connection()
@@ -217,6 +714,10 @@ def update_event_date(event_id: int, new_date: str, new_time: str) -> bool:
     """Função para atualizar a data e hora de um evento"""
     return db_context.update_event_date(event_id, new_date, new_time)
 
-def alter_event(event_id: int, **kwargs) -> bool:
-    """Função para alterar campos específicos de um evento"""
-    return db_context.alter_event(event_id, **kwargs) 
\ No newline at end of file
+def alter_event(event_id: int, guild_id: int, expected_version: int = None, expected_status: str = None, **kwargs) -> tuple:
+    """Função para alterar campos de um evento com uma única atualização condicional"""
+    return db_context.alter_event(event_id, guild_id, expected_version, expected_status, **kwargs)
+
+def assign_legacy_events(guild_id: int) -> int:
+    """Função para atribuir a um servidor os eventos ainda sem guild_id"""
+    return db_context.assign_legacy_events(guild_id) 
\ No newline at end of file
@@ -0,0 +1,135 @@
+import logging
+from datetime import datetime
+from functools import lru_cache
+from dados.recurrence import WEEKDAY_NAMES
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+# Formatos de entrada (Discord) e da coluna starts_at (ISO, ordenável lexicamente)
+DATE_FORMAT = '%d/%m/%Y'
+TIME_FORMAT = '%H:%M'
+STARTS_AT_FORMAT = '%Y-%m-%d %H:%M'
+
+class EventDateTime:
+    """
+    Data (e opcionalmente hora) de um evento já interpretada
+
+    Instâncias são imutáveis e compartilhadas: cada texto distinto é
+    convertido com strptime uma única vez e mantido em cache LRU, então
+    validadores, services e formatters reaproveitam o mesmo valor.
+    """
+
+    __slots__ = ('date_str', 'time_str', 'value')
+
+    def __init__(self, date_str: str, time_str: str, value: datetime):
+        object.__setattr__(self, 'date_str', date_str)
+        object.__setattr__(self, 'time_str', time_str)
+        object.__setattr__(self, 'value', value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("EventDateTime é imutável")
+
+    def __repr__(self):
+        return f"EventDateTime({self.date_str!r}, {self.time_str!r})"
+
+    def __eq__(self, other):
+        return isinstance(other, EventDateTime) and self.value == other.value and self.time_str == other.time_str
+
+    def __hash__(self):
+        return hash((self.value, self.time_str))
+
+    @property
+    def weekday(self) -> int:
+        """Dia da semana (0 = Segunda-feira)"""
+        return self.value.weekday()
+
+    @property
+    def weekday_name(self) -> str:
+        """Nome do dia da semana em português"""
+        return WEEKDAY_NAMES[self.value.weekday()]
+
+    @property
+    def starts_at(self) -> str:
+        """Data/hora no formato da coluna starts_at (YYYY-MM-DD HH:MM)"""
+        return self.value.strftime(STARTS_AT_FORMAT)
+
+    def is_future(self, now: datetime = None) -> bool:
+        """
+        Indica se a data/hora é posterior a um instante
+
+        Args:
+            now: Instante de referência (padrão: agora)
+
+        Returns:
+            bool: True se a data/hora é no futuro
+        """
+        return self.value > (now or datetime.now())
+
+@lru_cache(maxsize=4096)
+def parse_date(date_str: str) -> EventDateTime:
+    """
+    Interpreta uma data no formato DD/MM/YYYY
+
+    Args:
+        date_str: Data informada
+
+    Returns:
+        EventDateTime: Data à meia-noite (sem hora) ou None se inválida
+    """
+    try:
+        return EventDateTime(date_str, None, datetime.strptime(date_str, DATE_FORMAT))
+    except (ValueError, TypeError):
+        return None
+
+@lru_cache(maxsize=1024)
+def parse_time(time_str: str) -> tuple:
+    """
+    Interpreta uma hora no formato HH:MM
+
+    Args:
+        time_str: Hora informada
+
+    Returns:
+        tuple: (hora, minuto) ou None se inválida
+    """
+    try:
+        parsed = datetime.strptime(time_str, TIME_FORMAT)
+        return parsed.hour, parsed.minute
+    except (ValueError, TypeError):
+        return None
+
+@lru_cache(maxsize=4096)
+def parse_event_datetime(date_str: str, time_str: str) -> EventDateTime:
+    """
+    Interpreta a data (DD/MM/YYYY) e a hora (HH:MM) de um evento
+
+    Args:
+        date_str: Data informada
+        time_str: Hora informada
+
+    Returns:
+        EventDateTime: Data e hora combinadas ou None se alguma for inválida
+    """
+    date = parse_date(date_str)
+    time = parse_time(time_str)
+    if date is None or time is None:
+        return None
+    hour, minute = time
+    return EventDateTime(date_str, time_str, date.value.replace(hour=hour, minute=minute))
+
+@lru_cache(maxsize=4096)
+def format_date_with_weekday(date_str: str) -> str:
+    """
+    Formata uma data para exibição com o dia da semana
+
+    Args:
+        date_str: Data no formato DD/MM/YYYY
+
+    Returns:
+        str: Data com dia da semana (ex: "22/07/2025 (Terça-feira)") ou o texto original se inválida
+    """
+    date = parse_date(date_str)
+    if date is None:
+        return date_str
+    return f"{date_str} ({date.weekday_name})"
@@ -0,0 +1,82 @@
+import logging
+from collections import namedtuple
+from functools import lru_cache
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+class EventRow(tuple):
+    """
+    Linha da tabela events com acesso às colunas por nome
+
+    Cada projeção (conjunto de colunas de um SELECT ou RETURNING) ganha uma
+    subclasse própria, criada uma única vez, com um atributo somente leitura
+    por coluna. A linha continua sendo uma tupla: não há __dict__ por
+    instância, o custo de memória é o mesmo da tupla devolvida pelo sqlite3
+    e o desempacotamento posicional segue funcionando. Consumidores devem
+    preferir os nomes (event.status, event.version), que não mudam quando
+    uma coluna é acrescentada à consulta.
+    """
+
+    __slots__ = ()
+
+    # Nomes das colunas da projeção (preenchido nas subclasses)
+    _fields = ()
+
+    def get(self, column: str, default=None):
+        """
+        Valor de uma coluna que pode não fazer parte da projeção
+
+        Args:
+            column: Nome da coluna
+            default: Valor devolvido se a coluna não foi selecionada
+
+        Returns:
+            Valor da coluna ou default
+        """
+        return getattr(self, column, default) if column in self._fields else default
+
+@lru_cache(maxsize=None)
+def event_row_class(columns: tuple) -> type:
+    """
+    Retorna a classe de EventRow de uma projeção
+
+    Colunas que não são identificadores válidos ou repetidas (COUNT(*) sem
+    alias, dois id em um JOIN) viram atributos posicionais (_1, _2...), como
+    no rename do namedtuple, em vez de derrubar a consulta.
+
+    Args:
+        columns: Nomes das colunas, na ordem do SELECT
+
+    Returns:
+        type: Subclasse de EventRow com um atributo por coluna
+    """
+    base = namedtuple('EventRow', columns, rename=True)
+    return type('EventRow', (base, EventRow), {'__slots__': (), '__doc__': EventRow.__doc__})
+
+# Última projeção vista: (cursor.description, classe). O sqlite3 reaproveita a
+# mesma description para todas as linhas de um execute, então a busca da classe
+# é uma comparação de identidade por linha. A tupla é trocada de uma vez só, o
+# que mantém a leitura segura entre as threads do pool de leitura.
+_last_projection = (None, None)
+
+def event_row_factory(cursor, row: tuple) -> EventRow:
+    """
+    row_factory do sqlite3 que devolve cada linha como EventRow
+
+    Uso: cursor.row_factory = event_row_factory antes do execute.
+
+    Args:
+        cursor: Cursor que produziu a linha
+        row: Valores da linha, na ordem das colunas
+
+    Returns:
+        EventRow: Linha com as colunas da projeção da consulta
+    """
+    global _last_projection
+    description = cursor.description
+    last_description, row_class = _last_projection
+    if description is not last_description:
+        row_class = event_row_class(tuple(column[0] for column in description))
+        _last_projection = (description, row_class)
+    return tuple.__new__(row_class, row)
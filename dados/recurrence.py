@@ -0,0 +1,288 @@
+import calendar
+import logging
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+# Nomes exibidos ao usuário (fonte única para choices, validadores e serviços)
+WEEKDAY_NAMES = (
+    "Segunda-feira", "Terça-feira", "Quarta-feira", "Quinta-feira",
+    "Sexta-feira", "Sábado", "Domingo"
+)
+MONTH_NAMES = (
+    "Janeiro", "Fevereiro", "Março", "Abril", "Maio", "Junho",
+    "Julho", "Agosto", "Setembro", "Outubro", "Novembro", "Dezembro"
+)
+POSITION_NAMES = {"primeira": 1, "segunda": 2, "terceira": 3, "quarta": 4, "última": -1}
+
+NO_REPEAT = "Não se repete"
+WEEKLY_PREFIX = "Semanalmente a cada"
+BIWEEKLY_PREFIX = "Quinzenalmente a cada"
+MONTHLY_SAME_DAY = "Mensalmente (mesmo dia)"
+MONTHLY_SAME_WEEKDAY = "Mensalmente (mesmo dia da semana)"
+ANNUAL_SAME_DAY = "Anualmente (mesmo dia)"
+BUSINESS_DAYS = "Todos os dias úteis (segunda a sexta-feira)"
+
+def weekly_label(weekday: int, interval_weeks: int = 1) -> str:
+    """Retorna o rótulo de frequência semanal (ou quinzenal) para um dia da semana"""
+    prefix = BIWEEKLY_PREFIX if interval_weeks == 2 else WEEKLY_PREFIX
+    return f"{prefix} {WEEKDAY_NAMES[weekday]}"
+
+def monthly_nth_label(position_name: str, weekday: int) -> str:
+    """Retorna o rótulo de frequência mensal por posição (ex: 'No(a) primeira Segunda-feira de cada mês')"""
+    return f"No(a) {position_name} {WEEKDAY_NAMES[weekday]} de cada mês"
+
+# Opções de frequência na ordem apresentada no Discord
+FREQUENCY_LABELS = (
+    NO_REPEAT,
+    *(weekly_label(weekday) for weekday in range(7)),
+    *(weekly_label(weekday, 2) for weekday in range(7)),
+    MONTHLY_SAME_DAY,
+    MONTHLY_SAME_WEEKDAY,
+    ANNUAL_SAME_DAY,
+    BUSINESS_DAYS,
+)
+
+def _add_months(value: datetime, months: int, day: int) -> datetime:
+    """Avança N meses, ajustando o dia ao último dia do mês quando necessário"""
+    month_index = value.year * 12 + (value.month - 1) + months
+    year, month = divmod(month_index, 12)
+    month += 1
+    return value.replace(year=year, month=month, day=min(day, calendar.monthrange(year, month)[1]))
+
+def nth_weekday_of_month(year: int, month: int, weekday: int, position: int) -> int:
+    """
+    Calcula aritmeticamente o dia da N-ésima (ou última) ocorrência de um dia da semana no mês
+
+    Args:
+        year: Ano
+        month: Mês
+        weekday: Dia da semana (0 = Segunda-feira)
+        position: Ocorrência desejada (1 a 4, ou -1 para a última)
+
+    Returns:
+        int: Dia do mês
+    """
+    first_weekday, days_in_month = calendar.monthrange(year, month)
+    if position == -1:
+        last_weekday = (first_weekday + days_in_month - 1) % 7
+        return days_in_month - (last_weekday - weekday) % 7
+    return 1 + (weekday - first_weekday) % 7 + (position - 1) * 7
+
+class RecurrenceRule:
+    """
+    Regra de recorrência compilada a partir do rótulo de frequência
+
+    Instâncias são imutáveis e compartilhadas: cada rótulo (ou código
+    normalizado) distinto é interpretado uma única vez e mantido em cache.
+
+    Nas regras mensais e anuais pelo mesmo dia, day guarda o dia do mês
+    pretendido (ex: 31). A data armazenada do evento é ajustada ao último dia
+    dos meses mais curtos (31/01 -> 28/02), mas a série continua a partir do
+    dia pretendido (31/03), em vez de ficar presa no dia ajustado.
+    """
+
+    __slots__ = ('kind', 'interval', 'weekday', 'position', 'day')
+
+    NONE = 'none'
+    WEEKLY = 'weekly'
+    MONTHLY_DAY = 'monthly_day'
+    MONTHLY_NTH = 'monthly_nth'
+    YEARLY = 'yearly'
+    BUSINESS_DAYS = 'weekdays'
+    DAILY = 'daily'
+    UNKNOWN = 'unknown'
+
+    def __init__(self, kind: str, interval: int = 1, weekday: int = None, position: int = None, day: int = None):
+        object.__setattr__(self, 'kind', kind)
+        object.__setattr__(self, 'interval', interval)
+        object.__setattr__(self, 'weekday', weekday)
+        object.__setattr__(self, 'position', position)
+        object.__setattr__(self, 'day', day)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("RecurrenceRule é imutável")
+
+    def __repr__(self):
+        return f"RecurrenceRule({self.to_code()!r})"
+
+    def __eq__(self, other):
+        return isinstance(other, RecurrenceRule) and self.to_code() == other.to_code()
+
+    def __hash__(self):
+        return hash(self.to_code())
+
+    @property
+    def is_recurring(self) -> bool:
+        """Indica se a regra gera novas ocorrências"""
+        return self.kind != RecurrenceRule.NONE
+
+    def to_code(self) -> str:
+        """
+        Serializa a regra no formato normalizado armazenado no banco
+
+        Returns:
+            str: Código da regra (ex: 'weekly:2:4', 'monthly_nth:-1:4', 'monthly_day:31')
+        """
+        if self.kind == RecurrenceRule.WEEKLY:
+            return f"{self.kind}:{self.interval}:{self.weekday}"
+        if self.kind == RecurrenceRule.MONTHLY_NTH and self.position is not None:
+            return f"{self.kind}:{self.position}:{self.weekday}"
+        if self.kind in (RecurrenceRule.MONTHLY_DAY, RecurrenceRule.YEARLY) and self.day is not None:
+            return f"{self.kind}:{self.day}"
+        return self.kind
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def from_code(code: str) -> 'RecurrenceRule':
+        """
+        Reconstrói uma regra a partir do código normalizado
+
+        Args:
+            code: Código gerado por to_code
+
+        Returns:
+            RecurrenceRule: Regra correspondente
+        """
+        kind, *params = code.split(':')
+        if kind == RecurrenceRule.WEEKLY:
+            return RecurrenceRule(kind, interval=int(params[0]), weekday=int(params[1]))
+        if kind == RecurrenceRule.MONTHLY_NTH and params:
+            return RecurrenceRule(kind, position=int(params[0]), weekday=int(params[1]))
+        if kind in (RecurrenceRule.MONTHLY_DAY, RecurrenceRule.YEARLY) and params:
+            return RecurrenceRule(kind, day=int(params[0]))
+        return RecurrenceRule(kind)
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def from_frequency(frequency_option: str) -> 'RecurrenceRule':
+        """
+        Interpreta o rótulo de frequência do Discord UI
+
+        Args:
+            frequency_option: Rótulo de frequência (ex: 'Semanalmente a cada Segunda-feira')
+
+        Returns:
+            RecurrenceRule: Regra correspondente
+        """
+        if not frequency_option or frequency_option == NO_REPEAT:
+            return RecurrenceRule(RecurrenceRule.NONE)
+
+        for prefix, interval in ((WEEKLY_PREFIX, 1), (BIWEEKLY_PREFIX, 2)):
+            if frequency_option.startswith(prefix):
+                weekday_name = frequency_option[len(prefix):].strip()
+                if weekday_name in WEEKDAY_NAMES:
+                    return RecurrenceRule(RecurrenceRule.WEEKLY, interval=interval, weekday=WEEKDAY_NAMES.index(weekday_name))
+
+        if frequency_option == MONTHLY_SAME_DAY:
+            return RecurrenceRule(RecurrenceRule.MONTHLY_DAY)
+
+        if frequency_option == MONTHLY_SAME_WEEKDAY:
+            # Posição e dia da semana derivados da data do evento
+            return RecurrenceRule(RecurrenceRule.MONTHLY_NTH)
+
+        if frequency_option.startswith("No(a) ") and frequency_option.endswith(" de cada mês"):
+            parts = frequency_option.split()
+            if len(parts) >= 3 and parts[1] in POSITION_NAMES and parts[2] in WEEKDAY_NAMES:
+                return RecurrenceRule(RecurrenceRule.MONTHLY_NTH,
+                                      position=POSITION_NAMES[parts[1]], weekday=WEEKDAY_NAMES.index(parts[2]))
+
+        if frequency_option == ANNUAL_SAME_DAY:
+            return RecurrenceRule(RecurrenceRule.YEARLY)
+
+        if "Todos os dias úteis" in frequency_option:
+            return RecurrenceRule(RecurrenceRule.BUSINESS_DAYS)
+
+        if "Diariamente" in frequency_option:
+            return RecurrenceRule(RecurrenceRule.DAILY)
+
+        logger.warning(f"Frequência não reconhecida: {frequency_option}, usando fallback de 1 dia")
+        return RecurrenceRule(RecurrenceRule.UNKNOWN)
+
+    def next_after(self, anchor: datetime, after: datetime) -> datetime:
+        """
+        Calcula em tempo constante a primeira ocorrência estritamente posterior a um instante
+
+        Args:
+            anchor: Ocorrência atual do evento (data e hora)
+            after: Instante de referência (a ocorrência retornada é posterior a ele)
+
+        Returns:
+            datetime: Próxima ocorrência ou None para eventos que não se repetem
+        """
+        kind = self.kind
+        if kind == RecurrenceRule.NONE:
+            return None
+
+        if after < anchor:
+            after = anchor
+
+        if kind == RecurrenceRule.WEEKLY:
+            period = timedelta(weeks=self.interval)
+            return anchor + period * ((after - anchor) // period + 1)
+
+        if kind == RecurrenceRule.MONTHLY_DAY:
+            day = self.day or anchor.day
+            months = (after.year - anchor.year) * 12 + (after.month - anchor.month)
+            candidate = _add_months(anchor, months, day)
+            if candidate <= after:
+                candidate = _add_months(anchor, months + 1, day)
+            return candidate
+
+        if kind == RecurrenceRule.MONTHLY_NTH:
+            weekday = anchor.weekday() if self.weekday is None else self.weekday
+            position = self.position
+            if position is None:
+                position = (anchor.day - 1) // 7 + 1
+                if position > 4:
+                    position = -1
+
+            # A série avança sempre para um mês posterior ao da ocorrência atual
+            month_start = _add_months(anchor.replace(day=1), 1, 1)
+            if (after.year, after.month) > (month_start.year, month_start.month):
+                month_start = month_start.replace(year=after.year, month=after.month)
+            for months in (0, 1):
+                candidate = _add_months(month_start, months, 1)
+                candidate = candidate.replace(day=nth_weekday_of_month(candidate.year, candidate.month, weekday, position))
+                if candidate > after:
+                    return candidate
+            return None
+
+        if kind == RecurrenceRule.YEARLY:
+            day = self.day or anchor.day
+            years = max(1, after.year - anchor.year)
+            candidate = _add_months(anchor, years * 12, day)
+            if candidate <= after:
+                candidate = _add_months(anchor, (years + 1) * 12, day)
+            return candidate
+
+        if kind == RecurrenceRule.BUSINESS_DAYS:
+            candidate = after.replace(hour=anchor.hour, minute=anchor.minute, second=0, microsecond=0)
+            if candidate <= after:
+                candidate += timedelta(days=1)
+            if candidate.weekday() >= 5:  # Sábado ou domingo
+                candidate += timedelta(days=7 - candidate.weekday())
+            return candidate
+
+        # Diariamente (ou fallback para frequências não reconhecidas)
+        period = timedelta(days=1)
+        return anchor + period * ((after - anchor) // period + 1)
+
+def rule_code_for(frequency_option: str, day: int = None) -> str:
+    """
+    Função para obter o código normalizado de uma frequência
+
+    Args:
+        frequency_option: Rótulo de frequência
+        day: Dia do mês da data do evento; fixa o dia pretendido das regras
+             mensais e anuais pelo mesmo dia (sem ele, vale o dia da data atual)
+
+    Returns:
+        str: Código da regra
+    """
+    rule = RecurrenceRule.from_frequency(frequency_option)
+    if day is not None and rule.kind in (RecurrenceRule.MONTHLY_DAY, RecurrenceRule.YEARLY):
+        rule = RecurrenceRule(rule.kind, day=day)
+    return rule.to_code()
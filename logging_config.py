@@ -1,6 +1,211 @@
+import atexit
+import copy
+import gzip
+import json
 import logging
+import logging.handlers
 import os
-from datetime import datetime
+import queue
+import shutil
+import threading
+import time
+from datetime import datetime, timedelta
+
+# Listener e handler da fila de logs (criados por setup_logging)
+_listener = None
+_queue_handler = None
+
+# Campos fixos do modo JSON, preenchidos com extra={...} nas chamadas de log
+JSON_FIELDS = ('guild', 'event_id', 'command', 'duration_ms')
+
+class JsonFormatter(logging.Formatter):
+    """Formata cada registro como uma linha JSON com campos fixos (LOG_FORMAT=json)"""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage()
+        }
+        for field in JSON_FIELDS:
+            entry[field] = getattr(record, field, None)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+class DebugSamplingFilter(logging.Filter):
+    """
+    Amostragem de registros DEBUG por ponto de chamada
+    
+    Mantém 1 a cada round(1 / rate) registros DEBUG vindos da mesma linha de
+    código; demais níveis passam sempre. Roda antes do enfileiramento, então
+    registros descartados não custam nada à fila nem ao listener.
+    """
+    
+    def __init__(self, rate: float):
+        super().__init__()
+        self.every = max(1, round(1 / rate)) if rate > 0 else 0
+        self._counts = {}
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno != logging.DEBUG or self.every == 1:
+            return True
+        if self.every == 0:
+            return False
+        key = (record.pathname, record.lineno)
+        count = self._counts.get(key, 0)
+        self._counts[key] = count + 1
+        return count % self.every == 0
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler com fila limitada que nunca bloqueia quem registra o log
+    
+    Com a fila cheia o registro é descartado e contado; assim que houver espaço,
+    um aviso com a quantidade descartada é enfileirado. Quem registra apenas
+    fixa o conteúdo do registro (mensagem com os argumentos, traceback e campos
+    extras); o formatter e a escrita ficam para a thread do listener.
+    """
+    
+    # Formatter usado apenas para o texto do traceback, igual ao padrão do logging
+    _exception_formatter = logging.Formatter()
+    
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self._lock = threading.Lock()
+        self.dropped = 0
+        self._unreported = 0
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Fixa o conteúdo do registro antes de enfileirá-lo
+        
+        O listener lê o registro em outra thread, depois que quem registrou já
+        seguiu em frente: argumentos mutáveis (listas, dicionários, linhas de
+        eventos) alterados nesse meio tempo apareceriam com o valor novo, e o
+        traceback poderia já não ser o da exceção tratada. Por isso a mensagem
+        é combinada com os argumentos aqui, o traceback vira texto e campos
+        extras não escalares viram texto; o restante da formatação (data,
+        nível, layout ou JSON) continua no listener.
+        """
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = self._exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        for field in JSON_FIELDS:
+            value = record.__dict__.get(field)
+            if value is not None and not isinstance(value, (str, int, float)):
+                record.__dict__[field] = str(value)
+        return record
+    
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+                self._unreported += 1
+            return
+        
+        if self._unreported:
+            with self._lock:
+                unreported, self._unreported = self._unreported, 0
+            warning = logging.LogRecord(
+                __name__, logging.WARNING, __file__, 0,
+                f"{unreported} registro(s) de log descartado(s): fila de logs cheia", None, None
+            )
+            try:
+                self.queue.put_nowait(warning)
+            except queue.Full:
+                with self._lock:
+                    self._unreported += unreported
+
+class CompressedRotatingFileHandler(logging.handlers.BaseRotatingHandler):
+    """
+    Arquivo de log com rotação por tamanho e por tempo
+    
+    O arquivo ativo tem nome fixo; ao atingir max_bytes ou ao fim de cada
+    período de rotate_hours (alinhado à meia-noite), ele é renomeado com a data
+    e hora da rotação e comprimido com gzip. São mantidos no máximo
+    backup_count arquivos comprimidos, nenhum mais antigo que retention_days.
+    """
+    
+    def __init__(self, filename: str, max_bytes: int, rotate_hours: float, backup_count: int,
+                 retention_days: float, encoding: str = 'utf-8'):
+        super().__init__(filename, 'a', encoding=encoding, delay=True)
+        self.max_bytes = max_bytes
+        self.rotate_interval = timedelta(hours=rotate_hours) if rotate_hours > 0 else None
+        self.backup_count = backup_count
+        self.retention = timedelta(days=retention_days) if retention_days > 0 else None
+        self.rollover_at = self._compute_rollover_at(datetime.now())
+    
+    def _compute_rollover_at(self, now: datetime) -> datetime:
+        """Próximo fim de período, nunca além da meia-noite seguinte"""
+        if self.rotate_interval is None:
+            return None
+        midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        periods = (now - midnight) // self.rotate_interval + 1
+        return min(midnight + periods * self.rotate_interval, midnight + timedelta(days=1))
+    
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        if self.rollover_at is not None and datetime.now() >= self.rollover_at:
+            return True
+        if self.max_bytes > 0:
+            if self.stream is None:
+                self.stream = self._open()
+            message = f"{self.format(record)}\n"
+            if self.stream.tell() + len(message.encode(self.encoding or 'utf-8')) >= self.max_bytes:
+                return True
+        return False
+    
+    def doRollover(self):
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+        
+        now = datetime.now()
+        self.rollover_at = self._compute_rollover_at(now)
+        
+        if os.path.exists(self.baseFilename) and os.path.getsize(self.baseFilename) > 0:
+            rotated = f"{self.baseFilename}.{now.strftime('%Y%m%d-%H%M%S')}"
+            suffix = 1
+            while os.path.exists(f"{rotated}.gz"):
+                rotated = f"{self.baseFilename}.{now.strftime('%Y%m%d-%H%M%S')}-{suffix}"
+                suffix += 1
+            os.rename(self.baseFilename, rotated)
+            with open(rotated, 'rb') as source, gzip.open(f"{rotated}.gz", 'wb') as target:
+                shutil.copyfileobj(source, target)
+            os.remove(rotated)
+        
+        self._remove_old_backups()
+        self.stream = self._open()
+    
+    def _remove_old_backups(self):
+        """Aplica a retenção por quantidade e por idade aos arquivos comprimidos"""
+        directory, base_name = os.path.split(self.baseFilename)
+        backups = sorted(
+            os.path.join(directory, name) for name in os.listdir(directory)
+            if name.startswith(f"{base_name}.") and name.endswith('.gz')
+        )
+        
+        expired = []
+        if self.backup_count > 0 and len(backups) > self.backup_count:
+            expired = backups[:len(backups) - self.backup_count]
+        if self.retention is not None:
+            oldest_allowed = time.time() - self.retention.total_seconds()
+            expired += [path for path in backups if path not in expired and os.path.getmtime(path) < oldest_allowed]
+        
+        for path in expired:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
 
 def setup_logging():
     """
@@ -8,46 +213,70 @@ def setup_logging():
     
     Configura:
     - Logging para console (INFO)
-    - Logging para arquivo (DEBUG)
-    - Formato estruturado com timestamp
-    - Rotação de logs por data
+    - Logging para arquivo (DEBUG), com rotação por tamanho e tempo e compressão gzip
+    - Formato estruturado com timestamp (texto ou JSON com LOG_FORMAT=json)
+    - Fila limitada: formatação e escrita rodam em uma thread própria (QueueListener)
+    - Nível mínimo (LOG_LEVEL) e amostragem de registros DEBUG (LOG_DEBUG_SAMPLE_RATE)
     """
+    global _listener, _queue_handler
+    
+    # Reconfiguração: finalizar o listener anterior antes de criar outro
+    if _listener is not None:
+        _listener.stop()
     
     # Criar pasta de logs se não existir
-    logs_dir = 'logs'
+    logs_dir = os.getenv('LOG_DIR', 'logs')
     if not os.path.exists(logs_dir):
         os.makedirs(logs_dir)
     
-    # Nome do arquivo de log com data
-    log_filename = f"logs/bot_{datetime.now().strftime('%Y%m%d')}.log"
+    # Arquivo ativo com nome fixo; os rotacionados recebem data/hora e .gz
+    log_filename = os.path.join(logs_dir, 'bot.log')
     
-    # Configurar formato do log
+    # Configurar formato do log (LOG_FORMAT=json gera uma linha JSON por registro)
     log_format = '%(asctime)s %(levelname)-8s %(name)-20s %(message)s'
     date_format = '%Y-%m-%d %H:%M:%S'
+    json_mode = os.getenv('LOG_FORMAT', 'text').strip().lower() == 'json'
     
-    # Configurar handlers
+    # Configurar handlers (executados pela thread do listener)
     handlers = []
     
     # Handler para console (INFO e acima)
     console_handler = logging.StreamHandler()
     console_handler.setLevel(logging.INFO)
-    console_formatter = logging.Formatter(log_format, date_format)
+    console_formatter = JsonFormatter() if json_mode else logging.Formatter(log_format, date_format)
     console_handler.setFormatter(console_formatter)
     handlers.append(console_handler)
     
     # Handler para arquivo (DEBUG e acima)
-    file_handler = logging.FileHandler(log_filename, encoding='utf-8')
+    file_handler = CompressedRotatingFileHandler(
+        log_filename,
+        max_bytes=int(os.getenv('LOG_MAX_BYTES', str(10 * 1024 * 1024))),
+        rotate_hours=float(os.getenv('LOG_ROTATE_HOURS', '24')),
+        backup_count=int(os.getenv('LOG_BACKUP_COUNT', '30')),
+        retention_days=float(os.getenv('LOG_RETENTION_DAYS', '30'))
+    )
     file_handler.setLevel(logging.DEBUG)
-    file_formatter = logging.Formatter(log_format, date_format)
+    file_formatter = JsonFormatter() if json_mode else logging.Formatter(log_format, date_format)
     file_handler.setFormatter(file_formatter)
     handlers.append(file_handler)
     
+    # Fila limitada entre quem registra e o listener
+    log_queue = queue.Queue(maxsize=max(1, int(os.getenv('LOG_QUEUE_SIZE', '10000'))))
+    _queue_handler = DroppingQueueHandler(log_queue)
+    
+    # Amostragem de registros DEBUG (1.0 = todos)
+    debug_sample_rate = float(os.getenv('LOG_DEBUG_SAMPLE_RATE', '1.0'))
+    if debug_sample_rate < 1:
+        _queue_handler.addFilter(DebugSamplingFilter(debug_sample_rate))
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    
     # Configurar logging root
+    # Com LOG_LEVEL acima de DEBUG, chamadas logger.debug retornam antes de criar o registro
+    log_level = getattr(logging, os.getenv('LOG_LEVEL', 'DEBUG').strip().upper(), logging.DEBUG)
     logging.basicConfig(
-        level=logging.DEBUG,
-        format=log_format,
-        datefmt=date_format,
-        handlers=handlers,
+        level=log_level,
+        handlers=[_queue_handler],
         force=True  # Força reconfiguração se já configurado
     )
     
@@ -59,18 +288,42 @@ def setup_logging():
     # Log de inicialização
     logger = logging.getLogger(__name__)
     logger.info("Sistema de logging configurado")
-    logger.info(f"Logs sendo salvos em: {log_filename}")
+    logger.info("Logs sendo salvos em: %s", log_filename)
     
     return logger
 
+def shutdown_logging():
+    """Escreve os registros ainda na fila e finaliza a thread do listener"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+# Garantir que os últimos registros cheguem ao disco ao encerrar o processo
+atexit.register(shutdown_logging)
+
+def get_logging_stats() -> dict:
+    """
+    Retorna os contadores da fila de logs
+    
+    Returns:
+        dict: queued (registros aguardando escrita) e dropped (descartados por fila cheia)
+    """
+    if _queue_handler is None:
+        return {'queued': 0, 'dropped': 0}
+    return {
+        'queued': _queue_handler.queue.qsize(),
+        'dropped': _queue_handler.dropped
+    }
+
 def get_logger(name):
     """
     Retorna um logger configurado para o módulo especificado
     
     Args:
         name: Nome do módulo (geralmente __name__)
-        
+    
     Returns:
         logging.Logger: Logger configurado
     """
-    return logging.getLogger(name) 
\ No newline at end of file
+    return logging.getLogger(name)
@@ -0,0 +1,176 @@
+import os
+import json
+import asyncio
+import hashlib
+import logging
+import discord
+from dados.database import get_connection, get_read_connection
+from dados.async_database import run_in_db, run_read_in_db
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+class CommandSync:
+    """
+    Sincronização dos comandos slash baseada em diferenças
+
+    Cada escopo (global ou um servidor) tem a árvore de comandos serializada
+    e resumida em um hash. O último hash sincronizado fica na tabela
+    command_sync_state, então reinícios e reconexões só chamam a API do
+    Discord para os escopos cujos comandos realmente mudaram.
+    """
+
+    @staticmethod
+    def get_concurrency() -> int:
+        """Número máximo de sincronizações de servidor simultâneas (COMMAND_SYNC_CONCURRENCY)"""
+        return max(1, int(os.getenv('COMMAND_SYNC_CONCURRENCY', '3')))
+
+    @staticmethod
+    def scope_key(application_id: int, guild: discord.abc.Snowflake = None) -> str:
+        """
+        Identificador persistido de um escopo de sincronização
+
+        Inclui o ID da aplicação para que a troca de token force uma nova sincronização.
+
+        Args:
+            application_id: ID da aplicação do bot
+            guild: Servidor (None = comandos globais)
+
+        Returns:
+            str: Chave do escopo
+        """
+        if guild is None:
+            return f"{application_id}:global"
+        return f"{application_id}:guild:{guild.id}"
+
+    @staticmethod
+    def compute_hash(tree: discord.app_commands.CommandTree, guild: discord.abc.Snowflake = None) -> str:
+        """
+        Calcula o hash da árvore de comandos de um escopo
+
+        Args:
+            tree: Árvore de comandos do bot
+            guild: Servidor (None = comandos globais)
+
+        Returns:
+            str: Hash SHA-256 do payload enviado ao Discord
+        """
+        payload = [command.to_dict() for command in tree.get_commands(guild=guild)]
+        serialized = json.dumps(payload, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+        return hashlib.sha256(serialized.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def get_synced_hashes() -> dict:
+        """
+        Busca o último hash sincronizado de cada escopo
+
+        Returns:
+            dict: Mapa escopo -> hash
+        """
+        try:
+            conn = get_read_connection()
+            cursor = conn.cursor()
+            cursor.execute('SELECT scope, command_hash FROM command_sync_state')
+            return dict(cursor.fetchall())
+
+        except Exception as e:
+            logger.error(f"Erro ao buscar estado de sincronização dos comandos: {e}")
+            return {}
+
+    @staticmethod
+    def save_synced_hash(scope: str, command_hash: str) -> bool:
+        """
+        Registra o hash sincronizado de um escopo
+
+        Args:
+            scope: Chave do escopo
+            command_hash: Hash da árvore sincronizada
+
+        Returns:
+            bool: True se registrado com sucesso
+        """
+        try:
+            conn = get_connection()
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT INTO command_sync_state (scope, command_hash, synced_at)
+                VALUES (?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT(scope) DO UPDATE SET command_hash = excluded.command_hash, synced_at = excluded.synced_at
+            ''', (scope, command_hash))
+            conn.commit()
+            return True
+
+        except Exception as e:
+            logger.error(f"Erro ao registrar sincronização do escopo {scope}: {e}")
+            return False
+
+    @staticmethod
+    async def sync_scope(bot, guild: discord.abc.Snowflake = None, synced_hashes: dict = None, force: bool = False):
+        """
+        Sincroniza um escopo caso seus comandos tenham mudado
+
+        Args:
+            bot: Instância do bot
+            guild: Servidor (None = comandos globais)
+            synced_hashes: Hashes já carregados (None = consultar o banco)
+            force: Sincronizar mesmo sem alterações (comando /sync)
+
+        Returns:
+            list: Comandos sincronizados, ou None se o escopo já estava atualizado
+        """
+        if synced_hashes is None:
+            synced_hashes = await run_read_in_db(CommandSync.get_synced_hashes)
+
+        scope = CommandSync.scope_key(bot.application_id, guild)
+        command_hash = CommandSync.compute_hash(bot.tree, guild)
+        if not force and synced_hashes.get(scope) == command_hash:
+            return None
+
+        synced = await bot.tree.sync(guild=guild)
+        await run_in_db(CommandSync.save_synced_hash, scope, command_hash)
+        return synced
+
+    @staticmethod
+    async def sync_guilds(bot, guilds: list) -> dict:
+        """
+        Sincroniza, com concorrência limitada, os servidores cujos comandos mudaram
+
+        Args:
+            bot: Instância do bot
+            guilds: Servidores conectados
+
+        Returns:
+            dict: Estatísticas (synced, unchanged, skipped, failed)
+        """
+        synced_hashes = await run_read_in_db(CommandSync.get_synced_hashes)
+        semaphore = asyncio.Semaphore(CommandSync.get_concurrency())
+        stats = {'synced': 0, 'unchanged': 0, 'skipped': 0, 'failed': 0}
+
+        async def sync_guild(guild):
+            # Verificar se o bot tem permissões no servidor
+            if not guild.me.guild_permissions.manage_guild:
+                logger.warning(f"    ⚠️  Bot sem permissão 'Manage Server' em {guild.name}")
+                stats['skipped'] += 1
+                return
+
+            async with semaphore:
+                try:
+                    synced = await CommandSync.sync_scope(bot, guild, synced_hashes)
+                    if synced is None:
+                        stats['unchanged'] += 1
+                        return
+                    stats['synced'] += 1
+                    logger.info(f"    ✅ Sincronizados {len(synced)} comandos em {guild.name} (ID: {guild.id})")
+
+                except discord.Forbidden:
+                    stats['failed'] += 1
+                    logger.error(f"    ❌ Sem permissão para sincronizar em {guild.name}")
+                except discord.HTTPException as e:
+                    stats['failed'] += 1
+                    logger.error(f"    ❌ Erro HTTP ao sincronizar em {guild.name}: {e}")
+                except Exception as e:
+                    stats['failed'] += 1
+                    logger.error(f"    ❌ Erro ao sincronizar em {guild.name}: {e}")
+
+        await asyncio.gather(*(sync_guild(guild) for guild in guilds))
+        return stats
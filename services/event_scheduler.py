@@ -1,13 +1,41 @@
 import logging
+import functools
+import time
+from datetime import datetime
 from services import events_service
+from services.metrics import metrics
 
 # Configurar logging
 logger = logging.getLogger(__name__)
 
+def measured_sweep(sweep: str, done_key: str):
+    """
+    Registra nas métricas a duração e os eventos tocados por uma varredura
+    
+    Args:
+        sweep: Nome da varredura (label das métricas)
+        done_key: Chave do resultado com a quantidade de eventos processados com sucesso
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper():
+            started = time.perf_counter()
+            result = func()
+            metrics.observe('stem_scheduler_sweep_seconds', time.perf_counter() - started, sweep=sweep)
+            metrics.inc('stem_scheduler_sweeps_total', sweep=sweep, success=result['success'])
+            if result['success']:
+                metrics.inc('stem_scheduler_rows_total', result[done_key], sweep=sweep, result='done')
+                metrics.inc('stem_scheduler_rows_total', result['failed_events'], sweep=sweep, result='failed')
+            metrics.set('stem_scheduler_last_sweep_timestamp_seconds', time.time(), sweep=sweep)
+            return result
+        return wrapper
+    return decorator
+
 class EventScheduler:
     """Classe para gerenciar tarefas agendadas de eventos"""
     
     @staticmethod
+    @measured_sweep('recurring', 'updated_events')
     def update_recurring_events():
         """
         Atualiza eventos recorrentes que já passaram
@@ -28,53 +56,63 @@ class EventScheduler:
                     'total_events': 0,
                     'updated_events': 0,
                     'failed_events': 0,
+                    'event_ids': [],
                     'message': 'Nenhum evento recorrente vencido encontrado'
                 }
             
-            logger.info(f"Encontrados {len(past_due_events)} eventos recorrentes vencidos")
+            logger.info("Encontrados %d eventos recorrentes vencidos", len(past_due_events))
             
             updated_count = 0
             failed_count = 0
             failed_events = []
+            updated_ids = []
             
+            # Calcular todas as próximas ocorrências em memória
+            pending_updates = []
             for event in past_due_events:
-                event_id, name, date, time, frequency, recurrence_details = event
+                event_id, name = event.id, event.name
                 
                 try:
-                    logger.debug(f"Processando evento '{name}' (ID: {event_id}) - {date} {time}")
+                    logger.debug("Processando evento '%s' (ID: %s) - %s %s", name, event_id, event.date, event.time, extra={'event_id': event_id})
                     
-                    # Calcular próxima ocorrência
-                    next_date, next_time = events_service.EventsService.calculate_next_occurrence(
-                        date, time, frequency, recurrence_details
+                    # Calcular a primeira ocorrência futura (recupera atrasos de vários períodos de uma vez)
+                    next_date, next_time = events_service.EventsService.calculate_next_occurrence_after(
+                        event.date, event.time, event.frequency, event.recurrence_details, rule_code=event.recurrence_rule
                     )
                     
                     if next_date and next_time:
-                        # Atualizar evento para próxima ocorrência
-                        success = events_service.EventsService.update_event_to_next_occurrence(
-                            event_id, next_date, next_time
-                        )
-                        
-                        if success:
-                            updated_count += 1
-                            logger.info(f"Evento '{name}' (ID: {event_id}) atualizado para {next_date} {next_time}")
-                        else:
-                            failed_count += 1
-                            error_msg = f"Falha ao atualizar evento '{name}' (ID: {event_id})"
-                            failed_events.append(error_msg)
-                            logger.error(error_msg)
+                        pending_updates.append((event_id, name, next_date, next_time))
                     else:
                         failed_count += 1
                         error_msg = f"Não foi possível calcular próxima ocorrência para evento '{name}' (ID: {event_id})"
                         failed_events.append(error_msg)
-                        logger.error(error_msg)
+                        logger.error(error_msg, extra={'event_id': event_id})
                         
                 except Exception as e:
                     failed_count += 1
                     error_msg = f"Erro ao processar evento '{name}' (ID: {event_id}): {e}"
                     failed_events.append(error_msg)
-                    logger.error(error_msg)
+                    logger.error(error_msg, extra={'event_id': event_id})
             
-            logger.info(f"Atualização concluída: {updated_count}/{len(past_due_events)} eventos atualizados")
+            # Gravar todas as atualizações em uma única transação
+            if pending_updates:
+                success = events_service.EventsService.apply_next_occurrences(
+                    [(event_id, next_date, next_time) for event_id, _, next_date, next_time in pending_updates]
+                )
+                
+                for event_id, name, next_date, next_time in pending_updates:
+                    if success:
+                        updated_count += 1
+                        updated_ids.append(event_id)
+                        logger.info("Evento '%s' (ID: %s) atualizado para %s %s", name, event_id, next_date, next_time,
+                                    extra={'event_id': event_id})
+                    else:
+                        failed_count += 1
+                        error_msg = f"Falha ao atualizar evento '{name}' (ID: {event_id})"
+                        failed_events.append(error_msg)
+                        logger.error(error_msg, extra={'event_id': event_id})
+            
+            logger.info("Atualização concluída: %d/%d eventos atualizados", updated_count, len(past_due_events))
             
             return {
                 'success': True,
@@ -82,6 +120,7 @@ class EventScheduler:
                 'updated_events': updated_count,
                 'failed_events': failed_count,
                 'failed_details': failed_events,
+                'event_ids': updated_ids,
                 'message': f"Atualização concluída: {updated_count}/{len(past_due_events)} eventos atualizados"
             }
             
@@ -97,26 +136,32 @@ class EventScheduler:
     @staticmethod
     def get_scheduler_status():
         """
-        Retorna o status atual do agendador
+        Retorna o status atual do agendador a partir das métricas, sem consultar o banco
         
         Returns:
             dict: Status do agendador
         """
         try:
-            # Verificar se há eventos recorrentes ativos
-            active_recurring = events_service.EventsService.get_all_active_recurring_events_past_due()
-            
-            # Verificar eventos futuros
-            future_events = events_service.EventsService.get_active_events_for_users()
+            last_sweeps = [
+                metrics.get('stem_scheduler_last_sweep_timestamp_seconds', sweep=sweep)
+                for sweep in ('recurring', 'auto_complete')
+            ]
+            last_sweep = max((timestamp for timestamp in last_sweeps if timestamp is not None), default=None)
+            next_due = metrics.get('stem_scheduler_next_due_timestamp_seconds')
             
             status = {
-                'active_recurring_count': len(active_recurring),
-                'future_events_count': len(future_events),
+                'armed_events_count': int(metrics.get('stem_scheduler_armed_events', 0)),
+                'next_due': datetime.fromtimestamp(next_due).strftime('%d/%m/%Y %H:%M') if next_due else None,
+                'sweeps_count': int(metrics.total('stem_scheduler_sweeps_total')),
+                'failed_sweeps_count': int(metrics.total('stem_scheduler_sweeps_total', success=False)),
+                'updated_events_count': int(metrics.total('stem_scheduler_rows_total', sweep='recurring', result='done')),
+                'completed_events_count': int(metrics.total('stem_scheduler_rows_total', sweep='auto_complete', result='done')),
+                'failed_events_count': int(metrics.total('stem_scheduler_rows_total', result='failed')),
                 'scheduler_healthy': True,
-                'last_check': 'Agora'
+                'last_check': datetime.fromtimestamp(last_sweep).strftime('%d/%m/%Y %H:%M:%S') if last_sweep else 'Nunca'
             }
             
-            logger.debug(f"Status do scheduler: {status}")
+            logger.debug("Status do scheduler: %s", status)
             return status
             
         except Exception as e:
@@ -128,6 +173,7 @@ class EventScheduler:
             } 
 
     @staticmethod
+    @measured_sweep('auto_complete', 'completed_events')
     def auto_complete_unique_events():
         """
         Auto-conclui eventos únicos vencidos
@@ -148,40 +194,31 @@ class EventScheduler:
                     'total_events': 0,
                     'completed_events': 0,
                     'failed_events': 0,
+                    'event_ids': [],
                     'message': 'Nenhum evento único vencido para auto-conclusão'
                 }
             
-            logger.info(f"Encontrados {len(events_to_complete)} eventos únicos para auto-conclusão")
+            logger.info("Encontrados %d eventos únicos para auto-conclusão", len(events_to_complete))
             
             completed_count = 0
             failed_count = 0
             failed_events = []
             
+            # Marcar todos como concluídos em uma única transação
+            success = events_service.EventsService.mark_events_as_completed([event.id for event in events_to_complete])
+            
             for event in events_to_complete:
-                event_id, name, date, time, auto_complete, complete_after_hours = event
-                
-                try:
-                    logger.debug(f"Auto-concluindo evento '{name}' (ID: {event_id}) - {date} {time}")
-                    
-                    # Marcar como concluído
-                    success = events_service.EventsService.mark_event_as_completed(event_id)
-                    
-                    if success:
-                        completed_count += 1
-                        logger.info(f"Evento único '{name}' (ID: {event_id}) auto-concluído após {complete_after_hours} hora(s)")
-                    else:
-                        failed_count += 1
-                        error_msg = f"Falha ao auto-concluir evento '{name}' (ID: {event_id})"
-                        failed_events.append(error_msg)
-                        logger.error(error_msg)
-                        
-                except Exception as e:
+                if success:
+                    completed_count += 1
+                    logger.info("Evento único '%s' (ID: %s) auto-concluído após %s hora(s)", event.name, event.id, event.complete_after_hours,
+                                extra={'event_id': event.id})
+                else:
                     failed_count += 1
-                    error_msg = f"Erro ao auto-concluir evento '{name}' (ID: {event_id}): {e}"
+                    error_msg = f"Falha ao auto-concluir evento '{event.name}' (ID: {event.id})"
                     failed_events.append(error_msg)
-                    logger.error(error_msg)
+                    logger.error(error_msg, extra={'event_id': event.id})
             
-            logger.info(f"Auto-conclusão concluída: {completed_count}/{len(events_to_complete)} eventos concluídos")
+            logger.info("Auto-conclusão concluída: %d/%d eventos concluídos", completed_count, len(events_to_complete))
             
             return {
                 'success': True,
@@ -189,6 +226,7 @@ class EventScheduler:
                 'completed_events': completed_count,
                 'failed_events': failed_count,
                 'failed_details': failed_events,
+                'event_ids': [event.id for event in events_to_complete] if success else [],
                 'message': f"Auto-conclusão concluída: {completed_count}/{len(events_to_complete)} eventos concluídos"
             }
             
@@ -0,0 +1,230 @@
+import asyncio
+import heapq
+import logging
+from datetime import datetime, timedelta
+from dados.async_database import run_in_db
+from services import events_service
+from services import event_scheduler
+from services.reminder_timer import reminder_timer
+from services.metrics import metrics
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+class EventTimer:
+    """
+    Agendador orientado a eventos baseado em min-heap
+
+    Carrega uma única vez os próximos instantes de vencimento, dorme até o mais
+    próximo e só então executa as varreduras do EventScheduler. Alterações em
+    eventos rearmam apenas o evento afetado, sem recarregar a tabela.
+    """
+
+    # Teto de uma espera contínua; protege contra ajustes no relógio do sistema
+    MAX_SLEEP_SECONDS = 3600
+    
+    # Espera antes de tentar novamente um evento que a varredura não conseguiu avançar
+    RETRY_DELAY = timedelta(minutes=1)
+
+    def __init__(self):
+        self._heap = []
+        self._due = {}
+        self._wakeup = None
+        self._task = None
+        self._pending = set()
+
+    def is_running(self) -> bool:
+        """Indica se o agendador está em execução"""
+        return self._task is not None and not self._task.done()
+
+    def start(self, before_start=None):
+        """
+        Inicia o agendador no event loop atual
+
+        Args:
+            before_start: Corrotina opcional aguardada antes da primeira carga
+                          (por exemplo, bot.wait_until_ready)
+        """
+        if self.is_running():
+            logger.info("Agendador de eventos já está em execução, pulando inicialização")
+            return
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._run(before_start))
+        logger.info("Agendador de eventos iniciado")
+
+    def stop(self):
+        """Interrompe o agendador e descarta os instantes armados"""
+        if self.is_running():
+            self._task.cancel()
+            logger.info("Agendador de eventos parado")
+        self._task = None
+        self._heap.clear()
+        self._due.clear()
+
+    def arm(self, event_id: int, due_at: datetime):
+        """
+        Arma (ou rearma) o vencimento de um evento
+
+        Args:
+            event_id: ID do evento
+            due_at: Instante em que o agendador deve agir
+        """
+        self._due[event_id] = due_at
+        heapq.heappush(self._heap, (due_at, event_id))
+        # Acordar o laço apenas se o novo instante for o mais próximo
+        if self._wakeup is not None and self._heap[0] == (due_at, event_id):
+            self._wakeup.set()
+
+    def disarm(self, event_id: int):
+        """
+        Remove o vencimento de um evento
+
+        A entrada correspondente no heap é descartada preguiçosamente.
+
+        Args:
+            event_id: ID do evento
+        """
+        self._due.pop(event_id, None)
+
+    def _peek(self) -> datetime:
+        """Retorna o próximo instante válido, descartando entradas obsoletas"""
+        while self._heap:
+            due_at, event_id = self._heap[0]
+            if self._due.get(event_id) == due_at:
+                return due_at
+            heapq.heappop(self._heap)
+        return None
+
+    def _pop_due(self, now: datetime) -> list:
+        """Remove do heap e retorna os eventos vencidos até o instante informado"""
+        due_ids = []
+        while True:
+            due_at = self._peek()
+            if due_at is None or due_at > now:
+                return due_ids
+            _, event_id = heapq.heappop(self._heap)
+            del self._due[event_id]
+            due_ids.append(event_id)
+
+    def get_next_due(self) -> datetime:
+        """Retorna o próximo instante armado, ou None se não houver"""
+        return self._peek()
+
+    async def reload(self):
+        """Recarrega todos os instantes pendentes a partir do banco de dados"""
+        due_instants = await events_service.AsyncEventsService.get_due_instants()
+        self._heap = [(due_at, event_id) for event_id, due_at in due_instants]
+        heapq.heapify(self._heap)
+        self._due = {event_id: due_at for event_id, due_at in due_instants}
+        logger.info("Agendador carregado com %d evento(s) pendente(s)", len(self._due))
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def rearm(self, event_ids: list, not_before: datetime = None):
+        """
+        Recalcula o vencimento dos eventos informados
+
+        Eventos que não estão mais pendentes (concluídos, cancelados, removidos)
+        são desarmados.
+
+        Args:
+            event_ids: IDs dos eventos alterados
+            not_before: Instante mínimo para o novo vencimento (opcional)
+        """
+        due_instants = dict(await events_service.AsyncEventsService.get_due_instants(list(event_ids)))
+        for event_id in event_ids:
+            due_at = due_instants.get(event_id)
+            if due_at is None:
+                self.disarm(event_id)
+                continue
+            if not_before is not None and due_at < not_before:
+                logger.warning("Evento %s continua vencido após a varredura, nova tentativa às %s", event_id, f"{not_before:%H:%M:%S}",
+                               extra={'event_id': event_id})
+                due_at = not_before
+            self.arm(event_id, due_at)
+
+    def notify_event_changed(self, event_id: int):
+        """
+        Agenda o rearme de um evento criado ou alterado
+
+        Args:
+            event_id: ID do evento
+        """
+        if not self.is_running():
+            return
+        task = asyncio.get_running_loop().create_task(self.rearm([event_id]))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _run(self, before_start):
+        """Laço principal: dorme até o próximo vencimento e executa as varreduras"""
+        if before_start is not None:
+            await before_start()
+
+        # Eventos vencidos enquanto o bot estava parado disparam na primeira iteração
+        await self.reload()
+
+        while True:
+            self._wakeup.clear()
+            due_at = self._peek()
+            metrics.set('stem_scheduler_armed_events', len(self._due))
+            metrics.set('stem_scheduler_next_due_timestamp_seconds', due_at.timestamp() if due_at is not None else 0)
+            timeout = None
+            if due_at is not None:
+                timeout = min(max(0.0, (due_at - datetime.now()).total_seconds()), self.MAX_SLEEP_SECONDS)
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+                continue  # Novo instante armado; recalcular a espera
+            except asyncio.TimeoutError:
+                pass
+
+            due_ids = self._pop_due(datetime.now())
+            if due_ids:
+                await self._fire(due_ids)
+
+    async def _fire(self, due_ids: list):
+        """
+        Executa as varreduras para os eventos vencidos e rearma-os
+
+        As varreduras avançam ou concluem todos os eventos vencidos, não só os
+        do heap; os eventos alterados fora de due_ids também são rearmados, para
+        que entradas obsoletas não disparem varreduras desnecessárias.
+        """
+        if not due_ids:
+            return
+
+        logger.info("%d evento(s) vencido(s), executando varreduras", len(due_ids))
+        touched_ids = set()
+        try:
+            result = await run_in_db(event_scheduler.EventScheduler.update_recurring_events)
+            if result['success']:
+                logger.info("Verificação concluída: %s", result['message'])
+                touched_ids.update(result['event_ids'])
+            else:
+                logger.error(f"Erro na verificação: {result['error']}")
+
+            auto_complete_result = await run_in_db(event_scheduler.EventScheduler.auto_complete_unique_events)
+            if auto_complete_result['success']:
+                logger.info("Auto-conclusão concluída: %s", auto_complete_result['message'])
+                touched_ids.update(auto_complete_result['event_ids'])
+            else:
+                logger.error(f"Erro na auto-conclusão: {auto_complete_result['error']}")
+        except Exception as e:
+            logger.error(f"Erro ao executar varreduras do agendador: {e}")
+        finally:
+            await self.rearm(due_ids, not_before=datetime.now() + self.RETRY_DELAY)
+            other_ids = touched_ids.difference(due_ids)
+            if other_ids:
+                await self.rearm(list(other_ids))
+            # Eventos recorrentes avançados ganham lembretes para a nova ocorrência
+            reminder_timer.wake()
+
+# Instância global do agendador de eventos
+event_timer = EventTimer()
+
+def notify_event_changed(event_id: int):
+    """Função para rearmar um evento após criação ou alteração"""
+    event_timer.notify_event_changed(event_id)
+    # A nova data ou o novo status podem antecipar ou cancelar um lembrete
+    reminder_timer.wake()
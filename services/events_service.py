@@ -1,7 +1,14 @@
 import sqlite3
 import logging
 from datetime import datetime, timedelta
-from dados.database import get_connection, update_event_date, alter_event
+from dados.database import get_connection, get_read_connection, update_event_date, alter_event, build_starts_at, build_complete_at, STARTS_AT_FORMAT
+from dados.database import UPDATE_OK, UPDATE_ERROR
+from dados.models import EventRow, event_row_factory
+from dados.async_database import run_in_db, run_read_in_db
+from dados.recurrence import RecurrenceRule, NO_REPEAT, rule_code_for
+from dados.event_datetime import parse_date, parse_event_datetime
+from services.week_view_cache import week_view_cache
+from services.shard_config import shard_config
 
 # Configurar logging
 logger = logging.getLogger(__name__)
@@ -9,6 +16,20 @@ logger = logging.getLogger(__name__)
 class EventsService:
     """Serviço para gerenciar operações de eventos no banco de dados"""
     
+    # Eventos por página em /modeventos (cada evento é um campo do embed; o Discord aceita até 25)
+    MODERATION_PAGE_SIZE = 10
+    
+    # Colunas da listagem de moderação; starts_at serve de cursor para a próxima página
+    _MODERATION_COLUMNS = 'id, name, date, time, link, created_by, type, status, frequency, recurrence_details, version, starts_at'
+    
+    # Filtros de /modeventos que correspondem a um status
+    _MODERATION_STATUS_FILTERS = {
+        "ativos": "ativo",
+        "concluidos": "concluido",
+        "cancelados": "cancelado",
+        "adiados": "adiado"
+    }
+    
     @staticmethod
     def _validate_future_datetime(date_str: str, time_str: str) -> bool:
         """
@@ -21,16 +42,35 @@ class EventsService:
         Returns:
             bool: True se a data/hora é no futuro, False caso contrário
         """
-        try:
-            # Converter strings para datetime
-            event_datetime = datetime.strptime(f"{date_str} {time_str}", "%d/%m/%Y %H:%M")
-            current_datetime = datetime.now()
-            
-            return event_datetime > current_datetime
-            
-        except ValueError as e:
-            logger.error(f"Erro ao validar data/hora: {e}")
+        event_datetime = parse_event_datetime(date_str, time_str)
+        if event_datetime is None:
+            logger.error(f"Erro ao validar data/hora: formato inválido ({date_str} {time_str})")
             return False
+        
+        return event_datetime.is_future()
+    
+    @staticmethod
+    def _now_starts_at() -> str:
+        """
+        Retorna a data/hora atual no formato da coluna starts_at
+        
+        Returns:
+            str: Data/hora atual (YYYY-MM-DD HH:MM)
+        """
+        return datetime.now().strftime(STARTS_AT_FORMAT)
+    
+    @staticmethod
+    def _current_week_bounds() -> tuple:
+        """
+        Calcula os limites da semana atual no formato da coluna starts_at
+        
+        Returns:
+            tuple: (início_da_semana, início_da_próxima_semana), intervalo semiaberto
+        """
+        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        week_start = today - timedelta(days=today.weekday())
+        next_week_start = week_start + timedelta(days=7)
+        return week_start.strftime(STARTS_AT_FORMAT), next_week_start.strftime(STARTS_AT_FORMAT)
     
     @staticmethod
     def _get_weekday_name(date_str: str) -> str:
@@ -43,64 +83,69 @@ class EventsService:
         Returns:
             str: Nome do dia da semana em português
         """
-        try:
-            date_obj = datetime.strptime(date_str, "%d/%m/%Y")
-            weekdays = {
-                0: "Segunda-feira",
-                1: "Terça-feira", 
-                2: "Quarta-feira",
-                3: "Quinta-feira",
-                4: "Sexta-feira",
-                5: "Sábado",
-                6: "Domingo"
-            }
-            return weekdays[date_obj.weekday()]
-        except ValueError:
-            return "Data inválida"
+        date = parse_date(date_str)
+        return date.weekday_name if date else "Data inválida"
     
     @staticmethod
-    def add_unique_event(name: str, date: str, time: str, link: str, created_by: int) -> bool:
+    def add_unique_event(guild_id: int, name: str, date: str, time: str, link: str, created_by: int,
+                         auto_complete_config: dict = None) -> int:
         """
         Adiciona um novo evento único ao banco de dados
         
         Args:
+            guild_id: ID do servidor dono do evento
             name: Nome do evento
             date: Data do evento (DD/MM/YYYY)
             time: Hora do evento (HH:MM)
             link: Link do evento (opcional)
             created_by: ID do usuário que criou o evento
+            auto_complete_config: Configurações de auto-conclusão (auto_complete, complete_after_hours)
             
         Returns:
-            bool: True se o evento foi adicionado com sucesso, False caso contrário
+            int: ID do evento adicionado, ou False em caso de erro
         """
         try:
             # Validar se a data/hora é no futuro
-            if not EventsService._validate_future_datetime(date, time):
+            event_datetime = parse_event_datetime(date, time)
+            if event_datetime is None or not event_datetime.is_future():
                 raise ValueError("A data e hora do evento devem ser no futuro")
             
+            # Processar configurações de auto-conclusão
+            auto_complete = 1  # Padrão: True
+            complete_after_hours = 1  # Padrão: 1 hora
+            
+            if auto_complete_config:
+                auto_complete = 1 if auto_complete_config.get('auto_complete', True) else 0
+                complete_after_hours = auto_complete_config.get('complete_after_hours', 1)
+            
+            starts_at = event_datetime.starts_at
+            
             conn = get_connection()
             cursor = conn.cursor()
             
             cursor.execute('''
-                INSERT INTO events (name, date, time, link, created_by, type, status)
-                VALUES (?, ?, ?, ?, ?, 'unico', 'ativo')
-            ''', (name, date, time, link, created_by))
+                INSERT INTO events (guild_id, name, date, time, link, created_by, type, status, auto_complete, complete_after_hours, starts_at, complete_at, recurrence_rule)
+                VALUES (?, ?, ?, ?, ?, ?, 'unico', 'ativo', ?, ?, ?, ?, ?)
+            ''', (guild_id, name, date, time, link, created_by, auto_complete, complete_after_hours, starts_at,
+                  build_complete_at(starts_at, complete_after_hours), RecurrenceRule.NONE))
             
             conn.commit()
-            return True
+            week_view_cache.invalidate(guild_id)
+            return cursor.lastrowid
             
         except Exception as e:
             logger.error(f"Erro ao adicionar evento único: {e}")
             return False
     
     @staticmethod
-    def add_recurring_event(name: str, start_date: str, time: str, link: str, 
+    def add_recurring_event(guild_id: int, name: str, start_date: str, time: str, link: str, 
                           frequency_option: str, recurrence_detail_input: str = None, created_by: int = None,
-                          auto_complete_config: dict = None) -> bool:
+                          auto_complete_config: dict = None) -> int:
         """
         Adiciona um novo evento recorrente ao banco de dados
         
         Args:
+            guild_id: ID do servidor dono do evento
             name: Nome do evento
             start_date: Data de início (DD/MM/YYYY)
             time: Hora do evento (HH:MM)
@@ -110,26 +155,18 @@ class EventsService:
             created_by: ID do usuário que criou o evento
             
         Returns:
-            bool: True se o evento foi adicionado com sucesso, False caso contrário
+            int: ID do evento adicionado, ou False em caso de erro
         """
         try:
-            # Validar se a data/hora é no futuro
-            if not EventsService._validate_future_datetime(start_date, time):
-                raise ValueError("A data e hora do evento devem ser no futuro")
-            
-            # Validar formato da data
-            try:
-                datetime.strptime(start_date, '%d/%m/%Y')
-            except ValueError:
-                logger.error(f"Formato de data inválido: {start_date}. Use DD/MM/YYYY")
+            # Validar formato da data e da hora (interpretadas uma única vez)
+            event_datetime = parse_event_datetime(start_date, time)
+            if event_datetime is None:
+                logger.error(f"Formato de data/hora inválido: {start_date} {time}. Use DD/MM/YYYY e HH:MM")
                 return False
             
-            # Validar formato da hora
-            try:
-                datetime.strptime(time, '%H:%M')
-            except ValueError:
-                logger.error(f"Formato de hora inválido: {time}. Use HH:MM")
-                return False
+            # Validar se a data/hora é no futuro
+            if not event_datetime.is_future():
+                raise ValueError("A data e hora do evento devem ser no futuro")
             
             conn = get_connection()
             cursor = conn.cursor()
@@ -138,28 +175,70 @@ class EventsService:
             auto_complete = 1  # Padrão: True
             complete_after_hours = 1  # Padrão: 1 hora
             
-            if auto_complete_config and frequency_option == "Não se repete":
+            if auto_complete_config and frequency_option == NO_REPEAT:
                 auto_complete = 1 if auto_complete_config.get('auto_complete', True) else 0
                 complete_after_hours = auto_complete_config.get('complete_after_hours', 1)
             
             # Determinar tipo baseado na frequência
             event_type = EventsService._determine_event_type(frequency_option)
             
+            starts_at = event_datetime.starts_at
+            complete_at = build_complete_at(starts_at, complete_after_hours) if event_type == 'unico' else None
+            
             cursor.execute('''
-                INSERT INTO events (name, date, time, link, created_by, type, status, frequency, recurrence_details, auto_complete, complete_after_hours)
-                VALUES (?, ?, ?, ?, ?, ?, 'ativo', ?, ?, ?, ?)
-            ''', (name, start_date, time, link, created_by, event_type, frequency_option, recurrence_detail_input, auto_complete, complete_after_hours))
+                INSERT INTO events (guild_id, name, date, time, link, created_by, type, status, frequency, recurrence_details, auto_complete, complete_after_hours, starts_at, complete_at, recurrence_rule)
+                VALUES (?, ?, ?, ?, ?, ?, ?, 'ativo', ?, ?, ?, ?, ?, ?, ?)
+            ''', (guild_id, name, start_date, time, link, created_by, event_type, frequency_option, recurrence_detail_input, auto_complete, complete_after_hours,
+                  starts_at, complete_at, rule_code_for(frequency_option, event_datetime.value.day)))
             
             conn.commit()
-            return True
+            week_view_cache.invalidate(guild_id)
+            return cursor.lastrowid
             
         except Exception as e:
             logger.error(f"Erro ao adicionar evento recorrente: {e}")
             return False
     
+    @staticmethod
+    def _get_rule(frequency_option: str, rule_code: str = None) -> RecurrenceRule:
+        """
+        Obtém a regra de recorrência compilada de um evento
+        
+        Args:
+            frequency_option: Opção de frequência do Discord UI
+            rule_code: Código normalizado armazenado no banco (preferencial)
+            
+        Returns:
+            RecurrenceRule: Regra em cache para a frequência
+        """
+        if rule_code:
+            return RecurrenceRule.from_code(rule_code)
+        return RecurrenceRule.from_frequency(frequency_option)
+    
+    @staticmethod
+    def _parse_anchor(date_str: str, time_str: str) -> datetime:
+        """
+        Converte a data e a hora armazenadas de um evento em datetime
+        
+        Args:
+            date_str: Data no formato DD/MM/YYYY
+            time_str: Hora no formato HH:MM
+            
+        Returns:
+            datetime: Data/hora do evento
+            
+        Raises:
+            ValueError: Se a data ou a hora forem inválidas
+        """
+        event_datetime = parse_event_datetime(date_str, time_str)
+        if event_datetime is None:
+            raise ValueError(f"data/hora inválida: {date_str} {time_str}")
+        return event_datetime.value
+    
     @staticmethod
     def calculate_next_occurrence(current_date_str: str, current_time_str: str, 
-                                frequency_option: str, recurrence_details_internal: str) -> tuple:
+                                frequency_option: str, recurrence_details_internal: str,
+                                rule_code: str = None) -> tuple:
         """
         Calcula a próxima ocorrência de um evento recorrente baseado nas opções do Discord
         
@@ -168,108 +247,104 @@ class EventsService:
             current_time_str: Hora atual do evento (HH:MM)
             frequency_option: Opção de frequência do Discord UI
             recurrence_details_internal: Detalhes internos da recorrência
+            rule_code: Código normalizado da regra (opcional, evita reinterpretar a frequência)
             
         Returns:
             tuple: (nova_data_str, nova_hora_str) ou (None, None) se erro
         """
         try:
-            current_date = datetime.strptime(current_date_str, "%d/%m/%Y")
-            current_time = datetime.strptime(current_time_str, "%H:%M").time()
+            anchor = EventsService._parse_anchor(current_date_str, current_time_str)
+            rule = EventsService._get_rule(frequency_option, rule_code)
             
-            # Mapear opções do Discord para cálculos
-            if frequency_option == "Não se repete":
-                # Evento único, não calcular próxima ocorrência
+            # Avançar exatamente um período a partir da ocorrência atual
+            next_datetime = rule.next_after(anchor, anchor)
+            if next_datetime is None:
                 logger.info("Evento único, não há próxima ocorrência")
                 return None, None
-                
-            elif "Semanalmente a cada" in frequency_option:
-                # Sempre avançar 7 dias para eventos semanais
-                next_date = current_date + timedelta(weeks=1)
-                logger.info(f"Evento semanal: próxima ocorrência em {next_date.strftime('%d/%m/%Y')}")
-                    
-            elif "Quinzenalmente a cada" in frequency_option:
-                # Sempre avançar 14 dias para eventos quinzenais
-                next_date = current_date + timedelta(weeks=2)
-                logger.info(f"Evento quinzenal: próxima ocorrência em {next_date.strftime('%d/%m/%Y')}")
-                    
-            elif frequency_option == "Mensalmente (mesmo dia)":
-                # Próximo mês, mesmo dia
-                if current_date.month == 12:
-                    next_date = current_date.replace(year=current_date.year + 1, month=1)
-                else:
-                    next_date = current_date.replace(month=current_date.month + 1)
-                logger.info(f"Evento mensal (mesmo dia): próxima ocorrência em {next_date.strftime('%d/%m/%Y')}")
-                    
-            elif "No(a)" in frequency_option and "de cada mês" in frequency_option:
-                # Evento mensal com posição específica (primeira, segunda, etc.)
-                if current_date.month == 12:
-                    next_date = current_date.replace(year=current_date.year + 1, month=1, day=1)
-                else:
-                    next_date = current_date.replace(month=current_date.month + 1, day=1)
-                
-                # Extrair informações da frequência
-                parts = frequency_option.split()
-                position = parts[1]  # primeira, segunda, terceira, quarta, última
-                weekday_name = parts[2]  # Segunda-feira, Terça-feira, etc.
-                
-                # Mapear nome do dia para número
-                weekday_map = {
-                    "Segunda-feira": 0, "Terça-feira": 1, "Quarta-feira": 2,
-                    "Quinta-feira": 3, "Sexta-feira": 4, "Sábado": 5, "Domingo": 6
-                }
-                weekday_num = weekday_map.get(weekday_name, 0)
-                
-                # Encontrar a ocorrência correta
-                if position == "última":
-                    # Última ocorrência do mês
-                    last_occurrence = None
-                    temp_date = next_date
-                    while temp_date.month == next_date.month:
-                        if temp_date.weekday() == weekday_num:
-                            last_occurrence = temp_date
-                        temp_date += timedelta(days=1)
-                    next_date = last_occurrence
-                else:
-                    # Primeira, segunda, terceira ou quarta ocorrência
-                    position_map = {"primeira": 1, "segunda": 2, "terceira": 3, "quarta": 4}
-                    target_occurrence = position_map.get(position, 1)
-                    
-                    occurrences = 0
-                    while occurrences < target_occurrence:
-                        if next_date.weekday() == weekday_num:
-                            occurrences += 1
-                        if occurrences < target_occurrence:
-                            next_date += timedelta(days=1)
-                            
-                logger.info(f"Evento mensal ({position} {weekday_name}): próxima ocorrência em {next_date.strftime('%d/%m/%Y')}")
-                    
-            elif frequency_option == "Anualmente (mesmo dia)":
-                # Próximo ano, mesmo dia e mês
-                next_date = current_date.replace(year=current_date.year + 1)
-                logger.info(f"Evento anual: próxima ocorrência em {next_date.strftime('%d/%m/%Y')}")
-                
-            elif "Todos os dias úteis" in frequency_option:
-                # Próximo dia útil (segunda a sexta)
-                next_date = current_date + timedelta(days=1)
-                while next_date.weekday() >= 5:  # Sábado ou domingo
-                    next_date += timedelta(days=1)
-                logger.info(f"Evento dias úteis: próxima ocorrência em {next_date.strftime('%d/%m/%Y')}")
-                    
-            else:
-                # Fallback: avançar 1 dia para qualquer frequência não reconhecida
-                logger.warning(f"Frequência não reconhecida: {frequency_option}, usando fallback de 1 dia")
-                next_date = current_date + timedelta(days=1)
             
-            next_date_str = next_date.strftime("%d/%m/%Y")
-            next_time_str = current_time_str
+            next_date_str = next_datetime.strftime("%d/%m/%Y")
+            logger.debug("Próxima ocorrência calculada: %s %s para frequência '%s'", next_date_str, current_time_str, frequency_option)
+            return next_date_str, current_time_str
             
-            logger.info(f"Próxima ocorrência calculada: {next_date_str} {next_time_str} para frequência '{frequency_option}'")
-            return next_date_str, next_time_str
+        except Exception as e:
+            logger.error(f"Erro ao calcular próxima ocorrência: {e}")
+            return None, None
+    
+    @staticmethod
+    def calculate_next_occurrence_after(current_date_str: str, current_time_str: str,
+                                        frequency_option: str, recurrence_details_internal: str,
+                                        after: datetime = None, rule_code: str = None) -> tuple:
+        """
+        Calcula a primeira ocorrência posterior a um instante, recuperando qualquer atraso de uma vez
+        
+        Diferente de calculate_next_occurrence, que avança um único período, este
+        método salta diretamente para a primeira ocorrência após "agora" em tempo
+        constante, mesmo que o evento esteja meses atrasado.
+        
+        Args:
+            current_date_str: Data atual do evento (DD/MM/YYYY)
+            current_time_str: Hora atual do evento (HH:MM)
+            frequency_option: Opção de frequência do Discord UI
+            recurrence_details_internal: Detalhes internos da recorrência
+            after: Instante de referência (padrão: agora)
+            rule_code: Código normalizado da regra (opcional, evita reinterpretar a frequência)
+            
+        Returns:
+            tuple: (nova_data_str, nova_hora_str) ou (None, None) se erro
+        """
+        try:
+            anchor = EventsService._parse_anchor(current_date_str, current_time_str)
+            rule = EventsService._get_rule(frequency_option, rule_code)
+            next_datetime = rule.next_after(anchor, after or datetime.now())
+            
+            if next_datetime is None:
+                logger.info("Evento único, não há próxima ocorrência")
+                return None, None
+            
+            return next_datetime.strftime("%d/%m/%Y"), current_time_str
             
         except Exception as e:
             logger.error(f"Erro ao calcular próxima ocorrência: {e}")
             return None, None
     
+    @staticmethod
+    def project_next_occurrences(current_date_str: str, current_time_str: str,
+                                 frequency_option: str, recurrence_details_internal: str,
+                                 count: int, after: datetime = None, rule_code: str = None) -> list:
+        """
+        Projeta as próximas K ocorrências de um evento recorrente
+        
+        Args:
+            current_date_str: Data atual do evento (DD/MM/YYYY)
+            current_time_str: Hora atual do evento (HH:MM)
+            frequency_option: Opção de frequência do Discord UI
+            recurrence_details_internal: Detalhes internos da recorrência
+            count: Quantidade de ocorrências a projetar
+            after: Instante de referência (padrão: agora)
+            rule_code: Código normalizado da regra (opcional, evita reinterpretar a frequência)
+            
+        Returns:
+            list: Lista de tuplas (data_str, hora_str) em ordem cronológica
+        """
+        try:
+            anchor = EventsService._parse_anchor(current_date_str, current_time_str)
+            rule = EventsService._get_rule(frequency_option, rule_code)
+            reference = after or datetime.now()
+            
+            occurrences = []
+            for _ in range(count):
+                next_datetime = rule.next_after(anchor, reference)
+                if next_datetime is None:
+                    break
+                occurrences.append((next_datetime.strftime("%d/%m/%Y"), current_time_str))
+                reference = next_datetime
+            
+            return occurrences
+            
+        except Exception as e:
+            logger.error(f"Erro ao projetar próximas ocorrências: {e}")
+            return []
+    
     @staticmethod
     def _determine_event_type(frequency: str) -> str:
         """
@@ -281,67 +356,71 @@ class EventsService:
         Returns:
             str: 'unico' ou 'recorrente'
         """
-        if frequency == "Não se repete":
-            return "unico"
-        else:
+        if RecurrenceRule.from_frequency(frequency).is_recurring:
             return "recorrente"
+        else:
+            return "unico"
     
     @staticmethod
-    def alter_event(event_id: int, **kwargs) -> bool:
+    def alter_event(guild_id: int, event_id: int, expected_version: int = None, **kwargs) -> tuple:
         """
-        Altera campos específicos de um evento
+        Altera campos específicos de um evento em uma única ida ao banco
         
         Args:
+            guild_id: ID do servidor dono do evento
             event_id: ID do evento
+            expected_version: Versão do evento conhecida por quem altera (None = sobrescrever sem verificar)
             **kwargs: Campos a serem alterados
             
         Returns:
-            bool: True se alterado com sucesso, False caso contrário
+            tuple: (resultado, evento) conforme dados.database.alter_event
         """
         try:
-            # Validar data/hora se fornecida
-            if 'date' in kwargs and 'time' in kwargs:
-                if not EventsService._validate_future_datetime(kwargs['date'], kwargs['time']):
-                    raise ValueError("A nova data e hora devem ser no futuro")
+            # A data/hora resultante (informada ou combinada com a do evento) é validada por alter_event,
+            # que também recalcula recurrence_rule a partir da data e da frequência resultantes
             
             # Se a frequência foi alterada, atualizar automaticamente o tipo
             if 'frequency' in kwargs:
                 new_type = EventsService._determine_event_type(kwargs['frequency'])
                 kwargs['type'] = new_type
-                logger.info(f"Tipo do evento {event_id} atualizado para '{new_type}' baseado na frequência '{kwargs['frequency']}'")
+                logger.info("Tipo do evento %s atualizado para '%s' baseado na frequência '%s'", event_id, new_type, kwargs['frequency'],
+                            extra={'guild': guild_id, 'event_id': event_id})
             
             # Usar função do banco de dados
-            return alter_event(event_id, **kwargs)
+            result, event = alter_event(event_id, guild_id, expected_version, **kwargs)
+            if result == UPDATE_OK:
+                week_view_cache.invalidate(guild_id)
+            return result, event
             
         except Exception as e:
             logger.error(f"Erro ao alterar evento: {e}")
-            return False
+            return UPDATE_ERROR, None
     
     @staticmethod
     def get_all_active_recurring_events_past_due() -> list:
         """
         Busca todos os eventos recorrentes ativos cuja data e hora já passaram
         
+        Com shards divididos entre processos, considera apenas os servidores
+        dos shards deste processo.
+        
         Returns:
-            list: Lista de tuplas com os dados dos eventos (id, name, date, time, frequency, recurrence_details)
+            list: Lista de EventRow (id, name, date, time, frequency, recurrence_details, recurrence_rule)
         """
         try:
-            conn = get_connection()
+            conn = get_read_connection()
             cursor = conn.cursor()
+            cursor.row_factory = event_row_factory
             
-            # Data e hora atual
-            now = datetime.now()
-            current_date = now.strftime('%d/%m/%Y')
-            current_time = now.strftime('%H:%M')
-            
-            cursor.execute('''
-                SELECT id, name, date, time, frequency, recurrence_details
+            shard_clause, shard_params = shard_config.sql_filter()
+            cursor.execute(f'''
+                SELECT id, name, date, time, frequency, recurrence_details, recurrence_rule
                 FROM events
-                WHERE type = 'recorrente' 
-                AND status = 'ativo'
-                AND (date < ? OR (date = ? AND time <= ?))
-                ORDER BY date, time
-            ''', (current_date, current_date, current_time))
+                WHERE status = 'ativo'
+                AND type = 'recorrente'
+                AND starts_at <= ?{shard_clause}
+                ORDER BY starts_at
+            ''', (EventsService._now_starts_at(), *shard_params))
             
             events = cursor.fetchall()
             return events
@@ -366,7 +445,8 @@ class EventsService:
         try:
             success = update_event_date(event_id, next_date_str, next_time_str)
             if success:
-                logger.info(f"Evento {event_id} atualizado para {next_date_str} {next_time_str}")
+                week_view_cache.invalidate()
+                logger.info("Evento %s atualizado para %s %s", event_id, next_date_str, next_time_str, extra={'event_id': event_id})
             return success
             
         except Exception as e:
@@ -374,57 +454,114 @@ class EventsService:
             return False
     
     @staticmethod
-    def mark_event_as_completed(event_id: int) -> bool:
+    def mark_event_as_completed(guild_id: int, event_id: int, expected_version: int = None) -> tuple:
         """
-        Marca um evento como concluído
+        Marca um evento ativo como concluído em uma única ida ao banco
         
         Args:
+            guild_id: ID do servidor dono do evento
             event_id: ID do evento a ser marcado como concluído
+            expected_version: Versão do evento conhecida por quem conclui (None = não verificar)
             
         Returns:
-            bool: True se o evento foi marcado com sucesso, False caso contrário
+            tuple: (resultado, evento) conforme dados.database.alter_event; UPDATE_WRONG_STATUS se o evento não estava ativo
+        """
+        result, event = alter_event(event_id, guild_id, expected_version, expected_status='ativo', status='concluido')
+        if result == UPDATE_OK:
+            week_view_cache.invalidate(guild_id)
+        return result, event
+    
+    @staticmethod
+    def apply_next_occurrences(updates: list) -> bool:
         """
+        Atualiza vários eventos para suas próximas ocorrências em uma única transação
+        
+        Args:
+            updates: Lista de tuplas (event_id, nova_data_str, nova_hora_str)
+        
+        Returns:
+            bool: True se todas as atualizações foram gravadas, False caso contrário (nada é gravado)
+        """
+        if not updates:
+            return True
+        
+        conn = get_connection()
         try:
-            conn = get_connection()
             cursor = conn.cursor()
+            cursor.executemany('''
+                UPDATE events
+                SET date = ?, time = ?, starts_at = ?, version = version + 1
+                WHERE id = ?
+            ''', [(date, time, build_starts_at(date, time), event_id) for event_id, date, time in updates])
             
-            cursor.execute('''
-                UPDATE events 
-                SET status = 'concluido' 
+            conn.commit()
+            week_view_cache.invalidate()
+            logger.info("%d evento(s) atualizado(s) para a próxima ocorrência em uma única transação", len(updates))
+            return True
+        
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Erro ao atualizar eventos para a próxima ocorrência: {e}")
+            return False
+    
+    @staticmethod
+    def mark_events_as_completed(event_ids: list) -> bool:
+        """
+        Marca vários eventos como concluídos em uma única transação
+        
+        Args:
+            event_ids: IDs dos eventos a serem marcados como concluídos
+        
+        Returns:
+            bool: True se a transação foi gravada, False caso contrário (nada é gravado)
+        """
+        if not event_ids:
+            return True
+        
+        conn = get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.executemany('''
+                UPDATE events
+                SET status = 'concluido', version = version + 1
                 WHERE id = ? AND status = 'ativo'
-            ''', (event_id,))
+            ''', [(event_id,) for event_id in event_ids])
             
             conn.commit()
-            return cursor.rowcount > 0
-            
+            week_view_cache.invalidate()
+            if cursor.rowcount < len(event_ids):
+                logger.info("%d evento(s) já não estavam ativos e foram ignorados", len(event_ids) - cursor.rowcount)
+            return True
+        
         except Exception as e:
-            logger.error(f"Erro ao marcar evento como concluído: {e}")
+            conn.rollback()
+            logger.error(f"Erro ao marcar eventos como concluídos: {e}")
             return False
     
     @staticmethod
-    def get_active_events_for_users() -> list:
+    def get_active_events_for_users(guild_id: int) -> list:
         """
         Busca eventos ativos e futuros para usuários
         
+        Args:
+            guild_id: ID do servidor
+            
         Returns:
-            list: Lista de tuplas com os dados dos eventos (id, name, date, time, link)
+            list: Lista de EventRow (id, name, date, time, link)
         """
         try:
-            conn = get_connection()
+            conn = get_read_connection()
             cursor = conn.cursor()
-            
-            # Data e hora atual
-            now = datetime.now()
-            current_date = now.strftime('%d/%m/%Y')
-            current_time = now.strftime('%H:%M')
+            cursor.row_factory = event_row_factory
             
             cursor.execute('''
                 SELECT id, name, date, time, link
                 FROM events
-                WHERE status = 'ativo' 
-                AND (date > ? OR (date = ? AND time > ?))
-                ORDER BY date, time
-            ''', (current_date, current_date, current_time))
+                WHERE guild_id = ?
+                AND status = 'ativo' 
+                AND starts_at > ?
+                ORDER BY starts_at
+            ''', (guild_id, EventsService._now_starts_at()))
             
             events = cursor.fetchall()
             return events
@@ -434,22 +571,27 @@ class EventsService:
             return []
     
     @staticmethod
-    def get_all_events_for_moderation() -> list:
+    def get_all_events_for_moderation(guild_id: int) -> list:
         """
         Busca todos os eventos para moderação
         
+        Args:
+            guild_id: ID do servidor
+            
         Returns:
-            list: Lista de tuplas com todos os dados dos eventos
+            list: Lista de EventRow com todos os dados dos eventos
         """
         try:
-            conn = get_connection()
+            conn = get_read_connection()
             cursor = conn.cursor()
+            cursor.row_factory = event_row_factory
             
             cursor.execute('''
                 SELECT id, name, date, time, link, created_by, type, status, frequency, recurrence_details
                 FROM events
-                ORDER BY date DESC, time DESC
-            ''')
+                WHERE guild_id = ?
+                ORDER BY starts_at DESC
+            ''', (guild_id,))
             
             events = cursor.fetchall()
             return events
@@ -459,28 +601,32 @@ class EventsService:
             return []
     
     @staticmethod
-    def get_events_of_the_week() -> list:
+    def get_events_of_the_week(guild_id: int) -> list:
         """
         Busca eventos ativos da semana atual e futuros (mantido para compatibilidade)
         
+        Args:
+            guild_id: ID do servidor
+            
         Returns:
-            list: Lista de tuplas com os dados dos eventos (id, name, date, time, link, created_by, type, status)
+            list: Lista de EventRow (id, name, date, time, link, created_by, type, status)
         """
         try:
-            conn = get_connection()
+            conn = get_read_connection()
             cursor = conn.cursor()
+            cursor.row_factory = event_row_factory
             
             # Calcular início da semana atual
-            today = datetime.now()
-            week_start = today - timedelta(days=today.weekday())
+            week_start, _ = EventsService._current_week_bounds()
             
             cursor.execute('''
                 SELECT id, name, date, time, link, created_by, type, status
                 FROM events
-                WHERE status = 'ativo' 
-                AND date >= ?
-                ORDER BY date, time
-            ''', (week_start.strftime('%d/%m/%Y'),))
+                WHERE guild_id = ?
+                AND status = 'ativo' 
+                AND starts_at >= ?
+                ORDER BY starts_at
+            ''', (guild_id, week_start))
             
             events = cursor.fetchall()
             return events
@@ -490,22 +636,51 @@ class EventsService:
             return []
     
     @staticmethod
-    def get_all_events() -> list:
+    def get_week_view_expiry(events: list) -> datetime:
+        """
+        Calcula até quando a visão semanal de /eventos permanece correta
+        
+        A listagem só contém eventos futuros da semana atual, então ela muda
+        quando o primeiro evento listado começa ou quando a semana vira.
+        
+        Args:
+            events: Eventos retornados por get_week_events_for_users (ordenados por início)
+            
+        Returns:
+            datetime: Instante em que a visão deve ser recalculada
+        """
+        _, next_week_start = EventsService._current_week_bounds()
+        expires_at = datetime.strptime(next_week_start, STARTS_AT_FORMAT)
+        if events:
+            try:
+                first_start = EventsService._parse_anchor(events[0].date, events[0].time)
+                expires_at = min(expires_at, first_start)
+            except ValueError:
+                pass
+        return expires_at
+    
+    @staticmethod
+    def get_all_events(guild_id: int) -> list:
         """
         Busca todos os eventos do banco de dados (mantido para compatibilidade)
         
+        Args:
+            guild_id: ID do servidor
+            
         Returns:
-            list: Lista de tuplas com os dados dos eventos
+            list: Lista de EventRow com os dados dos eventos
         """
         try:
-            conn = get_connection()
+            conn = get_read_connection()
             cursor = conn.cursor()
+            cursor.row_factory = event_row_factory
             
             cursor.execute('''
                 SELECT id, name, date, time, link, created_by, type, status
                 FROM events
-                ORDER BY date, time
-            ''')
+                WHERE guild_id = ?
+                ORDER BY starts_at
+            ''', (guild_id,))
             
             events = cursor.fetchall()
             return events
@@ -515,25 +690,27 @@ class EventsService:
             return []
     
     @staticmethod
-    def get_event_by_id(event_id: int) -> tuple:
+    def get_event_by_id(guild_id: int, event_id: int) -> EventRow:
         """
         Busca um evento específico pelo ID
         
         Args:
+            guild_id: ID do servidor dono do evento
             event_id: ID do evento
             
         Returns:
-            tuple: Dados do evento ou None se não encontrado
+            EventRow: Dados do evento ou None se não encontrado
         """
         try:
-            conn = get_connection()
+            conn = get_read_connection()
             cursor = conn.cursor()
+            cursor.row_factory = event_row_factory
             
             cursor.execute('''
                 SELECT id, name, date, time, link, created_by, type, status
                 FROM events
-                WHERE id = ?
-            ''', (event_id,))
+                WHERE id = ? AND guild_id = ?
+            ''', (event_id, guild_id))
             
             event = cursor.fetchone()
             return event
@@ -543,11 +720,12 @@ class EventsService:
             return None
     
     @staticmethod
-    def delete_event(event_id: int) -> bool:
+    def delete_event(guild_id: int, event_id: int) -> bool:
         """
         Remove um evento do banco de dados
         
         Args:
+            guild_id: ID do servidor dono do evento
             event_id: ID do evento a ser removido
             
         Returns:
@@ -557,8 +735,9 @@ class EventsService:
             conn = get_connection()
             cursor = conn.cursor()
             
-            cursor.execute('DELETE FROM events WHERE id = ?', (event_id,))
+            cursor.execute('DELETE FROM events WHERE id = ? AND guild_id = ?', (event_id, guild_id))
             conn.commit()
+            week_view_cache.invalidate(guild_id)
             
             return cursor.rowcount > 0
             
@@ -569,39 +748,35 @@ class EventsService:
  
 
     @staticmethod
-    def get_week_events_for_users() -> list:
+    def get_week_events_for_users(guild_id: int) -> list:
         """
         Busca eventos ativos da semana atual para usuários
         
+        Args:
+            guild_id: ID do servidor
+            
         Returns:
-            list: Lista de tuplas com os dados dos eventos (id, name, date, time, link)
+            list: Lista de EventRow (id, name, date, time, link)
         """
         try:
-            conn = get_connection()
+            conn = get_read_connection()
             cursor = conn.cursor()
+            cursor.row_factory = event_row_factory
             
-            # Calcular início e fim da semana atual
-            today = datetime.now()
-            week_start = today - timedelta(days=today.weekday())
-            week_end = week_start + timedelta(days=6)
-            
-            # Data e hora atual
-            now = datetime.now()
-            current_date = now.strftime('%d/%m/%Y')
-            current_time = now.strftime('%H:%M')
+            # Limite superior da semana atual; o inferior é o momento atual
+            _, next_week_start = EventsService._current_week_bounds()
             
             cursor.execute('''
                 SELECT id, name, date, time, link
                 FROM events
-                WHERE status = 'ativo' 
-                AND date >= ? AND date <= ?
-                AND (date > ? OR (date = ? AND time > ?))
-                ORDER BY date, time
-            ''', (week_start.strftime('%d/%m/%Y'), week_end.strftime('%d/%m/%Y'), 
-                  current_date, current_date, current_time))
+                WHERE guild_id = ?
+                AND status = 'ativo' 
+                AND starts_at > ? AND starts_at < ?
+                ORDER BY starts_at
+            ''', (guild_id, EventsService._now_starts_at(), next_week_start))
             
             events = cursor.fetchall()
-            logger.info(f"Encontrados {len(events)} eventos da semana para usuários")
+            logger.info("Encontrados %d eventos da semana para usuários", len(events), extra={'guild': guild_id})
             return events
             
         except Exception as e:
@@ -609,85 +784,87 @@ class EventsService:
             return []
     
     @staticmethod
-    def get_filtered_events_for_moderation(filter_type: str = "todos") -> list:
+    def get_filtered_events_for_moderation(guild_id: int, filter_type: str = "todos") -> list:
         """
         Busca eventos filtrados para moderação
         
         Args:
+            guild_id: ID do servidor
             filter_type: Tipo de filtro ("todos", "ativos", "concluidos", "cancelados", "adiados", "ultimos", "semana")
             
         Returns:
-            list: Lista de tuplas com os dados dos eventos
+            list: Lista de EventRow com os dados dos eventos
         """
         try:
-            conn = get_connection()
+            conn = get_read_connection()
             cursor = conn.cursor()
+            cursor.row_factory = event_row_factory
             
             if filter_type == "todos":
                 # Todos os eventos
                 cursor.execute('''
                     SELECT id, name, date, time, link, created_by, type, status, frequency, recurrence_details
                     FROM events
-                    ORDER BY date DESC, time DESC
-                ''')
+                    WHERE guild_id = ?
+                    ORDER BY starts_at DESC
+                ''', (guild_id,))
                 
             elif filter_type == "ativos":
                 # Apenas eventos ativos
                 cursor.execute('''
                     SELECT id, name, date, time, link, created_by, type, status, frequency, recurrence_details
                     FROM events
-                    WHERE status = 'ativo'
-                    ORDER BY date DESC, time DESC
-                ''')
+                    WHERE guild_id = ? AND status = 'ativo'
+                    ORDER BY starts_at DESC
+                ''', (guild_id,))
                 
             elif filter_type == "concluidos":
                 # Apenas eventos concluídos
                 cursor.execute('''
                     SELECT id, name, date, time, link, created_by, type, status, frequency, recurrence_details
                     FROM events
-                    WHERE status = 'concluido'
-                    ORDER BY date DESC, time DESC
-                ''')
+                    WHERE guild_id = ? AND status = 'concluido'
+                    ORDER BY starts_at DESC
+                ''', (guild_id,))
                 
             elif filter_type == "cancelados":
                 # Apenas eventos cancelados
                 cursor.execute('''
                     SELECT id, name, date, time, link, created_by, type, status, frequency, recurrence_details
                     FROM events
-                    WHERE status = 'cancelado'
-                    ORDER BY date DESC, time DESC
-                ''')
+                    WHERE guild_id = ? AND status = 'cancelado'
+                    ORDER BY starts_at DESC
+                ''', (guild_id,))
                 
             elif filter_type == "adiados":
                 # Apenas eventos adiados
                 cursor.execute('''
                     SELECT id, name, date, time, link, created_by, type, status, frequency, recurrence_details
                     FROM events
-                    WHERE status = 'adiado'
-                    ORDER BY date DESC, time DESC
-                ''')
+                    WHERE guild_id = ? AND status = 'adiado'
+                    ORDER BY starts_at DESC
+                ''', (guild_id,))
                 
             elif filter_type == "ultimos":
                 # Últimos 10 eventos adicionados
                 cursor.execute('''
                     SELECT id, name, date, time, link, created_by, type, status, frequency, recurrence_details
                     FROM events
+                    WHERE guild_id = ?
                     ORDER BY id DESC
                     LIMIT 10
-                ''')
+                ''', (guild_id,))
                 
             elif filter_type == "semana":
                 # Eventos da semana atual
-                today = datetime.now()
-                week_start = today - timedelta(days=today.weekday())
-                week_end = week_start + timedelta(days=6)
+                week_start, next_week_start = EventsService._current_week_bounds()
                 
                 cursor.execute('''
                     SELECT id, name, date, time, link, created_by, type, status, frequency, recurrence_details
                     FROM events
-                    WHERE date >= ? AND date <= ?
-                    ORDER BY date, time
-                ''', (week_start.strftime('%d/%m/%Y'), week_end.strftime('%d/%m/%Y')))
+                    WHERE guild_id = ? AND starts_at >= ? AND starts_at < ?
+                    ORDER BY starts_at
+                ''', (guild_id, week_start, next_week_start))
                 
             else:
                 # Filtro inválido, retornar todos
@@ -695,61 +872,274 @@ class EventsService:
                 cursor.execute('''
                     SELECT id, name, date, time, link, created_by, type, status, frequency, recurrence_details
                     FROM events
-                    ORDER BY date DESC, time DESC
-                ''')
+                    WHERE guild_id = ?
+                    ORDER BY starts_at DESC
+                ''', (guild_id,))
             
             events = cursor.fetchall()
-            logger.info(f"Encontrados {len(events)} eventos com filtro '{filter_type}' para moderação")
+            logger.info("Encontrados %d eventos com filtro '%s' para moderação", len(events), filter_type, extra={'guild': guild_id})
             return events
             
         except Exception as e:
             logger.error(f"Erro ao buscar eventos filtrados para moderação: {e}")
             return [] 
 
+    @staticmethod
+    def get_moderation_page(guild_id: int, filter_type: str = "todos", cursor: tuple = None, page_size: int = None) -> tuple:
+        """
+        Busca uma página de eventos filtrados para moderação (paginação por keyset)
+        
+        Cada página é uma busca por intervalo no índice a partir do último
+        evento da página anterior, então o custo não depende do tamanho da
+        tabela nem da página exibida.
+        
+        Args:
+            guild_id: ID do servidor
+            filter_type: Tipo de filtro ("todos", "ativos", "concluidos", "cancelados", "adiados", "ultimos", "semana")
+            cursor: Posição (starts_at, id) do último evento da página anterior (None = primeira página)
+            page_size: Quantidade de eventos por página (padrão: MODERATION_PAGE_SIZE)
+            
+        Returns:
+            tuple: (eventos_da_página, cursor_da_próxima_página ou None se for a última)
+        """
+        page_size = page_size or EventsService.MODERATION_PAGE_SIZE
+        
+        try:
+            conn = get_read_connection()
+            db_cursor = conn.cursor()
+            db_cursor.row_factory = event_row_factory
+            
+            if filter_type == "ultimos":
+                # Últimos 10 eventos adicionados (sempre uma única página)
+                db_cursor.execute(f'''
+                    SELECT {EventsService._MODERATION_COLUMNS}
+                    FROM events
+                    WHERE guild_id = ?
+                    ORDER BY id DESC
+                    LIMIT ?
+                ''', (guild_id, min(page_size, 10)))
+                return db_cursor.fetchall(), None
+            
+            if filter_type == "semana":
+                # Eventos da semana atual, em ordem cronológica
+                week_start, next_week_start = EventsService._current_week_bounds()
+                conditions = ["guild_id = ?", "starts_at >= ? AND starts_at < ?"]
+                params = [guild_id, week_start, next_week_start]
+                if cursor is not None:
+                    conditions.append("(starts_at, id) > (?, ?)")
+                    params.extend(cursor)
+                
+                db_cursor.execute(f'''
+                    SELECT {EventsService._MODERATION_COLUMNS}
+                    FROM events
+                    WHERE {' AND '.join(conditions)}
+                    ORDER BY starts_at, id
+                    LIMIT ?
+                ''', params + [page_size + 1])
+                rows = db_cursor.fetchall()
+                
+            else:
+                status = EventsService._MODERATION_STATUS_FILTERS.get(filter_type)
+                if status is None and filter_type != "todos":
+                    logger.warning(f"Filtro inválido '{filter_type}', retornando todos os eventos")
+                
+                base_conditions, base_params = ["guild_id = ?"], [guild_id]
+                if status is not None:
+                    base_conditions.append("status = ?")
+                    base_params.append(status)
+                
+                rows = []
+                # Eventos com starts_at, do mais recente para o mais antigo
+                if cursor is None or cursor[0] is not None:
+                    conditions, params = list(base_conditions), list(base_params)
+                    conditions.append("starts_at IS NOT NULL")
+                    if cursor is not None:
+                        conditions.append("(starts_at, id) < (?, ?)")
+                        params.extend(cursor)
+                    
+                    db_cursor.execute(f'''
+                        SELECT {EventsService._MODERATION_COLUMNS}
+                        FROM events
+                        WHERE {' AND '.join(conditions)}
+                        ORDER BY starts_at DESC, id DESC
+                        LIMIT ?
+                    ''', params + [page_size + 1])
+                    rows = db_cursor.fetchall()
+                
+                # Eventos legados sem starts_at (data inválida) aparecem por último
+                if len(rows) <= page_size:
+                    conditions, params = list(base_conditions), list(base_params)
+                    conditions.append("starts_at IS NULL")
+                    if cursor is not None and cursor[0] is None:
+                        conditions.append("id < ?")
+                        params.append(cursor[1])
+                    
+                    db_cursor.execute(f'''
+                        SELECT {EventsService._MODERATION_COLUMNS}
+                        FROM events
+                        WHERE {' AND '.join(conditions)}
+                        ORDER BY id DESC
+                        LIMIT ?
+                    ''', params + [page_size + 1 - len(rows)])
+                    rows += db_cursor.fetchall()
+            
+            next_cursor = None
+            if len(rows) > page_size:
+                rows = rows[:page_size]
+                next_cursor = (rows[-1].starts_at, rows[-1].id)
+            
+            logger.info("Página com %d eventos com filtro '%s' para moderação", len(rows), filter_type, extra={'guild': guild_id})
+            return rows, next_cursor
+            
+        except Exception as e:
+            logger.error(f"Erro ao buscar página de eventos para moderação: {e}")
+            return [], None
+    
+    @staticmethod
+    def get_due_instants(event_ids: list = None) -> list:
+        """
+        Busca os próximos instantes em que o agendador precisa agir
+        
+        Para eventos recorrentes ativos o instante é o início do evento; para
+        eventos únicos com auto-conclusão, o instante persistido em complete_at.
+        Eventos únicos sem complete_at (registros antigos sem complete_after_hours)
+        ficam de fora: a varredura de auto-conclusão nunca os alcançaria e o
+        agendador os dispararia a cada nova tentativa. Apenas servidores dos
+        shards deste processo são considerados.
+        
+        Args:
+            event_ids: IDs específicos a consultar (None = todos os pendentes)
+            
+        Returns:
+            list: Lista de tuplas (id, instante_datetime)
+        """
+        try:
+            conn = get_read_connection()
+            cursor = conn.cursor()
+            
+            query = '''
+                SELECT id, type, starts_at, complete_at
+                FROM events
+                WHERE status = 'ativo'
+                AND ((type = 'recorrente' AND starts_at IS NOT NULL)
+                     OR (type = 'unico' AND auto_complete = 1 AND complete_at IS NOT NULL))
+            '''
+            # Apenas servidores dos shards deste processo
+            shard_clause, params = shard_config.sql_filter()
+            query += shard_clause
+            if event_ids is not None:
+                if not event_ids:
+                    return []
+                query += f" AND id IN ({', '.join('?' for _ in event_ids)})"
+                params += list(event_ids)
+            
+            cursor.execute(query, params)
+            
+            due_instants = []
+            for event_id, event_type, starts_at, complete_at in cursor.fetchall():
+                due_at = complete_at if event_type == 'unico' else starts_at
+                due_instants.append((event_id, datetime.strptime(due_at, STARTS_AT_FORMAT)))
+            
+            return due_instants
+            
+        except Exception as e:
+            logger.error(f"Erro ao buscar instantes de vencimento: {e}")
+            return []
+    
     @staticmethod
     def get_unique_events_past_due_for_auto_complete() -> list:
         """
         Busca eventos únicos vencidos que devem ser auto-concluídos
         
+        Apenas servidores dos shards deste processo são considerados.
+        
         Returns:
-            list: Lista de tuplas com os dados dos eventos (id, name, date, time, auto_complete, complete_after_hours)
+            list: Lista de EventRow (id, name, date, time, auto_complete, complete_after_hours)
         """
         try:
-            conn = get_connection()
+            conn = get_read_connection()
             cursor = conn.cursor()
+            cursor.row_factory = event_row_factory
             
-            # Data e hora atual
-            now = datetime.now()
-            current_date = now.strftime('%d/%m/%Y')
-            current_time = now.strftime('%H:%M')
-            
-            cursor.execute('''
+            # Apenas eventos cujo instante de auto-conclusão já passou; sem estatísticas (ANALYZE)
+            # o planejador preferiria (status, type, starts_at), por isso o índice parcial é fixado
+            shard_clause, shard_params = shard_config.sql_filter()
+            cursor.execute(f'''
                 SELECT id, name, date, time, auto_complete, complete_after_hours
-                FROM events
-                WHERE type = 'unico' 
+                FROM events INDEXED BY idx_events_auto_complete_at
+                WHERE type = 'unico'
                 AND status = 'ativo'
                 AND auto_complete = 1
-                AND (date < ? OR (date = ? AND time < ?))
-            ''', (current_date, current_date, current_time))
-            
-            events = cursor.fetchall()
+                AND complete_at <= ?{shard_clause}
+                ORDER BY complete_at
+            ''', (EventsService._now_starts_at(), *shard_params))
             
-            # Filtrar eventos que já passaram do tempo de auto-conclusão
-            events_to_complete = []
-            for event in events:
-                event_id, name, date, time, auto_complete, complete_after_hours = event
-                
-                # Calcular quando o evento deve ser concluído
-                event_datetime = datetime.strptime(f"{date} {time}", "%d/%m/%Y %H:%M")
-                complete_datetime = event_datetime + timedelta(hours=complete_after_hours)
-                
-                # Se já passou do tempo de conclusão, adicionar à lista
-                if now >= complete_datetime:
-                    events_to_complete.append(event)
+            events_to_complete = cursor.fetchall()
             
-            logger.info(f"Encontrados {len(events_to_complete)} eventos únicos vencidos para auto-conclusão")
+            logger.info("Encontrados %d eventos únicos vencidos para auto-conclusão", len(events_to_complete))
             return events_to_complete
             
         except Exception as e:
             logger.error(f"Erro ao buscar eventos únicos vencidos para auto-conclusão: {e}")
-            return [] 
\ No newline at end of file
+            return [] 
+
+class AsyncEventsService:
+    """
+    Fachada assíncrona do EventsService para uso nos handlers e Cogs
+
+    Cada método delega para o EventsService: escritas rodam na thread dedicada
+    do banco de dados e leituras no pool somente leitura, sem bloquear o
+    event loop do Discord.
+    """
+
+    @staticmethod
+    async def add_unique_event(guild_id: int, name: str, date: str, time: str, link: str, created_by: int,
+                               auto_complete_config: dict = None) -> int:
+        """Versão assíncrona de EventsService.add_unique_event"""
+        return await run_in_db(EventsService.add_unique_event, guild_id, name, date, time, link, created_by, auto_complete_config)
+
+    @staticmethod
+    async def add_recurring_event(guild_id: int, name: str, start_date: str, time: str, link: str,
+                                  frequency_option: str, recurrence_detail_input: str = None, created_by: int = None,
+                                  auto_complete_config: dict = None) -> int:
+        """Versão assíncrona de EventsService.add_recurring_event"""
+        return await run_in_db(
+            EventsService.add_recurring_event, guild_id, name, start_date, time, link,
+            frequency_option, recurrence_detail_input, created_by, auto_complete_config
+        )
+
+    @staticmethod
+    async def alter_event(guild_id: int, event_id: int, expected_version: int = None, **kwargs) -> tuple:
+        """Versão assíncrona de EventsService.alter_event"""
+        return await run_in_db(EventsService.alter_event, guild_id, event_id, expected_version, **kwargs)
+
+    @staticmethod
+    async def mark_event_as_completed(guild_id: int, event_id: int, expected_version: int = None) -> tuple:
+        """Versão assíncrona de EventsService.mark_event_as_completed"""
+        return await run_in_db(EventsService.mark_event_as_completed, guild_id, event_id, expected_version)
+
+    @staticmethod
+    async def get_event_by_id(guild_id: int, event_id: int) -> EventRow:
+        """Versão assíncrona de EventsService.get_event_by_id"""
+        return await run_read_in_db(EventsService.get_event_by_id, guild_id, event_id)
+
+    @staticmethod
+    async def get_week_events_for_users(guild_id: int) -> list:
+        """Versão assíncrona de EventsService.get_week_events_for_users"""
+        return await run_read_in_db(EventsService.get_week_events_for_users, guild_id)
+
+    @staticmethod
+    async def get_filtered_events_for_moderation(guild_id: int, filter_type: str = "todos") -> list:
+        """Versão assíncrona de EventsService.get_filtered_events_for_moderation"""
+        return await run_read_in_db(EventsService.get_filtered_events_for_moderation, guild_id, filter_type)
+
+    @staticmethod
+    async def get_moderation_page(guild_id: int, filter_type: str = "todos", cursor: tuple = None,
+                                  page_size: int = None) -> tuple:
+        """Versão assíncrona de EventsService.get_moderation_page"""
+        return await run_read_in_db(EventsService.get_moderation_page, guild_id, filter_type, cursor, page_size)
+
+    @staticmethod
+    async def get_due_instants(event_ids: list = None) -> list:
+        """Versão assíncrona de EventsService.get_due_instants"""
+        return await run_read_in_db(EventsService.get_due_instants, event_ids)
@@ -0,0 +1,81 @@
+import asyncio
+import logging
+import time
+from services.metrics import metrics
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+class EventLoopLagMonitor:
+    """
+    Mede o atraso (lag) do event loop do Discord
+
+    Uma tarefa dorme por um intervalo fixo e compara o tempo real decorrido
+    com o esperado; a diferença é o tempo em que o loop ficou ocupado com
+    outro trabalho (por exemplo, I/O síncrono do banco de dados).
+    """
+
+    def __init__(self, interval: float = 0.5, warn_threshold_ms: float = 100.0):
+        self.interval = interval
+        self.warn_threshold_ms = warn_threshold_ms
+        self._task = None
+        self.reset()
+
+    def reset(self):
+        """Zera as estatísticas coletadas"""
+        self.samples = 0
+        self.last_lag_ms = 0.0
+        self.max_lag_ms = 0.0
+        self.total_lag_ms = 0.0
+
+    def is_running(self) -> bool:
+        """Indica se o monitor está em execução"""
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """Inicia a medição no event loop atual"""
+        if self.is_running():
+            return
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        logger.info("Monitor de lag do event loop iniciado")
+
+    def stop(self):
+        """Interrompe a medição"""
+        if self.is_running():
+            self._task.cancel()
+        self._task = None
+
+    async def _run(self):
+        """Laço de medição do atraso do event loop"""
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag_ms = max(0.0, (time.perf_counter() - started - self.interval) * 1000)
+
+            metrics.observe('stem_event_loop_lag_seconds', lag_ms / 1000)
+            self.samples += 1
+            self.last_lag_ms = lag_ms
+            self.total_lag_ms += lag_ms
+            if lag_ms > self.max_lag_ms:
+                self.max_lag_ms = lag_ms
+
+            if lag_ms >= self.warn_threshold_ms:
+                logger.warning(f"Event loop bloqueado por {lag_ms:.1f}ms")
+
+    def get_stats(self) -> dict:
+        """
+        Retorna as estatísticas de lag do event loop
+
+        Returns:
+            dict: Último, máximo e médio lag em milissegundos e número de amostras
+        """
+        avg_lag_ms = self.total_lag_ms / self.samples if self.samples else 0.0
+        return {
+            'samples': self.samples,
+            'last_lag_ms': round(self.last_lag_ms, 2),
+            'max_lag_ms': round(self.max_lag_ms, 2),
+            'avg_lag_ms': round(avg_lag_ms, 2)
+        }
+
+# Instância global do monitor de lag
+loop_monitor = EventLoopLagMonitor()
@@ -0,0 +1,341 @@
+import asyncio
+import logging
+import time
+from collections import deque
+import discord
+from services.outbox_service import AsyncOutboxService
+from services.metrics import metrics
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+class TokenBucket:
+    """
+    Balde de fichas para limitar a taxa de envios
+
+    Args:
+        capacity: Envios permitidos de uma vez (rajada)
+        period: Segundos para recompor todas as fichas
+    """
+
+    def __init__(self, capacity: int, period: float):
+        self.capacity = capacity
+        self.rate = capacity / period
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+
+    def take(self) -> float:
+        """
+        Consome uma ficha, se houver
+
+        Returns:
+            float: 0 se a ficha foi consumida, ou os segundos até haver uma ficha disponível
+        """
+        now = time.monotonic()
+        if now < self.paused_until:
+            return self.paused_until - now
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def pause(self, seconds: float):
+        """Esvazia o balde e bloqueia novos envios por alguns segundos (resposta 429 do Discord)"""
+        self.tokens = 0.0
+        self.updated = self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+class MessageDispatcher:
+    """
+    Despachante único das mensagens enviadas pelo bot, alimentado pela outbox
+
+    Quem gera uma mensagem a grava na outbox (services.outbox_service) e acorda
+    o despachante. O laço principal reserva as mensagens pendentes na conexão
+    de escrita (uma mensagem nunca é lida duas vezes) e as distribui em uma
+    fila por canal; cada fila tem uma tarefa que a esvazia, juntando
+    mensagens consecutivas em um único envio (até 10 embeds, 6000 caracteres
+    de embeds e 2000 de texto, limites do Discord), então uma rajada de
+    entradas ou lembretes vira poucas mensagens. Cada envio consome uma ficha
+    do balde do canal (5 mensagens a cada 5 segundos) e do balde global do bot
+    (50 requisições por segundo) antes de chegar ao limitador do discord.py.
+
+    Mensagens enviadas são apagadas da outbox. Falhas temporárias são
+    reagendadas no banco com espera exponencial (sobrevivem a reinícios) e
+    canais inexistentes ou sem permissão marcam as mensagens como falhas. A
+    entrega é "pelo menos uma vez": se o bot parar entre o envio e a remoção,
+    a reserva é liberada no próximo início e a mensagem é reenviada.
+    """
+
+    # Limites de um envio
+    MAX_EMBEDS_PER_MESSAGE = 10
+    MAX_CHARS_PER_MESSAGE = 6000
+    MAX_CONTENT_PER_MESSAGE = 2000
+
+    # Baldes de taxa: (envios, período em segundos)
+    CHANNEL_RATE = (5, 5.0)
+    GLOBAL_RATE = (50, 1.0)
+
+    # Tentativas por mensagem e espera inicial (dobrada a cada falha)
+    MAX_ATTEMPTS = 5
+    RETRY_BASE_DELAY = 2.0
+
+    # Mensagens lidas da outbox por consulta e teto de uma espera sem novidades
+    FETCH_LIMIT = 500
+    MAX_SLEEP_SECONDS = 60
+
+    def __init__(self):
+        self._queues = {}  # channel_id -> deque de OutboxMessage
+        self._workers = {}  # channel_id -> tarefa que esvazia a fila
+        self._buckets = {}  # channel_id -> TokenBucket
+        self._global_bucket = TokenBucket(*self.GLOBAL_RATE)
+        self._backlog = False  # a última consulta atingiu FETCH_LIMIT
+        self._get_channel = None
+        self._fetch_channel = None
+        self._wakeup = None
+        self._task = None
+
+    def is_running(self) -> bool:
+        """Indica se o despachante está em execução"""
+        return self._task is not None and not self._task.done()
+
+    def start(self, get_channel, before_start=None, fetch_channel=None):
+        """
+        Inicia o despachante no event loop atual
+
+        Args:
+            get_channel: Função que resolve um ID de canal (por exemplo, bot.get_channel)
+            before_start: Corrotina opcional aguardada antes da primeira leitura da outbox
+                          (por exemplo, bot.wait_until_ready)
+            fetch_channel: Corrotina opcional que busca na API um canal fora do cache
+                           (por exemplo, bot.fetch_channel)
+        """
+        if self.is_running():
+            logger.info("Despachante de mensagens já está em execução, pulando inicialização")
+            return
+        self._get_channel = get_channel
+        self._fetch_channel = fetch_channel
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._run(before_start))
+        logger.info("Despachante de mensagens iniciado")
+
+    def stop(self):
+        """Interrompe o despachante; mensagens não enviadas continuam na outbox"""
+        for worker in list(self._workers.values()):
+            worker.cancel()
+        if self.is_running():
+            self._task.cancel()
+            logger.info("Despachante de mensagens parado")
+        self._task = None
+        self._workers.clear()
+        self._queues.clear()
+
+    def wake(self):
+        """Faz o laço ler a outbox novamente (após gravar mensagens)"""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def send(self, message) -> bool:
+        """
+        Grava uma mensagem na outbox e acorda o despachante
+
+        Para mensagens que acompanham uma mudança de estado, grave com
+        OutboxService.insert_messages na mesma transação e chame wake().
+
+        Args:
+            message: OutboxMessage a enviar
+
+        Returns:
+            bool: True se gravada na outbox
+        """
+        if not await AsyncOutboxService.add_messages([message]):
+            return False
+        self.wake()
+        return True
+
+    def pending(self) -> int:
+        """Mensagens da outbox nas filas em memória"""
+        return sum(len(queue) for queue in self._queues.values())
+
+    async def _run(self, before_start):
+        """Laço principal: distribui as mensagens pendentes e dorme até o próximo reenvio"""
+        if before_start is not None:
+            await before_start()
+
+        # Mensagens reservadas por uma execução anterior (bot parado antes de enviá-las)
+        await AsyncOutboxService.release_claims()
+
+        while True:
+            self._wakeup.clear()
+            now = time.time()
+            try:
+                messages = await AsyncOutboxService.claim_pending(self.FETCH_LIMIT, now)
+                self._backlog = len(messages) == self.FETCH_LIMIT
+                self._enqueue(messages)
+                next_at = await AsyncOutboxService.get_next_attempt_at(now)
+            except Exception as e:
+                logger.error(f"Erro no despachante de mensagens: {e}")
+                next_at = now + self.RETRY_BASE_DELAY
+
+            timeout = self.MAX_SLEEP_SECONDS
+            if next_at is not None:
+                timeout = min(max(0.0, next_at - time.time()), self.MAX_SLEEP_SECONDS)
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def _enqueue(self, messages: list):
+        """Coloca nas filas dos canais as mensagens reservadas"""
+        loop = asyncio.get_running_loop()
+        for message in messages:
+            self._queues.setdefault(message.channel_id, deque()).append(message)
+
+            worker = self._workers.get(message.channel_id)
+            if worker is None or worker.done():
+                self._workers[message.channel_id] = loop.create_task(self._drain(message.channel_id))
+
+    async def _acquire(self, channel_id: int) -> TokenBucket:
+        """Aguarda uma ficha do balde do canal e uma do balde global"""
+        bucket = self._buckets.get(channel_id)
+        if bucket is None:
+            bucket = self._buckets[channel_id] = TokenBucket(*self.CHANNEL_RATE)
+        for current in (bucket, self._global_bucket):
+            while (delay := current.take()) > 0:
+                await asyncio.sleep(delay)
+        return bucket
+
+    def _take_batch(self, queue: deque) -> list:
+        """Retira da fila as mensagens consecutivas que cabem em um único envio"""
+        batch = []
+        embeds = chars = content = 0
+        while queue:
+            message = queue[0]
+            message_embeds = len(message.embeds)
+            message_chars = sum(len(discord.Embed.from_dict(embed)) for embed in message.embeds)
+            message_content = len(message.content) + 1 if message.content else 0
+            if batch and (embeds + message_embeds > self.MAX_EMBEDS_PER_MESSAGE
+                          or chars + message_chars > self.MAX_CHARS_PER_MESSAGE
+                          or content + message_content > self.MAX_CONTENT_PER_MESSAGE + 1):
+                break
+            batch.append(queue.popleft())
+            embeds += message_embeds
+            chars += message_chars
+            content += message_content
+        return batch
+
+    async def _resolve_channel(self, channel_id: int):
+        """
+        Resolve o canal de destino no momento do envio
+
+        Usa o cache do bot e, se o canal não estiver nele (cache frio após uma
+        reconexão), busca na API; discord.NotFound e discord.Forbidden da busca
+        são tratados como canal indisponível.
+
+        Raises:
+            LookupError: Se o canal não foi encontrado e não há busca na API
+        """
+        channel = self._get_channel(channel_id)
+        if channel is None and self._fetch_channel is not None:
+            channel = await self._fetch_channel(channel_id)
+        if channel is None:
+            raise LookupError("canal não encontrado")
+        return channel
+
+    async def _send(self, channel, batch: list):
+        """Envia as mensagens do lote como uma única mensagem do Discord"""
+        content = '\n'.join(message.content for message in batch if message.content) or None
+        embeds = [discord.Embed.from_dict(embed) for message in batch for embed in message.embeds]
+        await channel.send(content=content, embeds=embeds)
+
+    async def _drain(self, channel_id: int):
+        """Esvazia a fila de um canal, um envio agrupado por vez"""
+        queue = self._queues[channel_id]
+        try:
+            while queue:
+                bucket = await self._acquire(channel_id)
+                batch = self._take_batch(queue)
+                try:
+                    channel = await self._resolve_channel(channel_id)
+                    await self._send(channel, batch)
+
+                except (LookupError, discord.Forbidden, discord.NotFound) as e:
+                    # Todo o restante da fila falharia da mesma forma
+                    batch.extend(queue)
+                    queue.clear()
+                    logger.error(f"Canal {channel_id} indisponível para envio ({e}); {len(batch)} mensagem(ns) marcada(s) como falha")
+                    metrics.inc('stem_dispatch_messages_total', result='failed')
+                    await self._finish(batch, 'failed', AsyncOutboxService.mark_failed, str(e))
+
+                except discord.HTTPException as e:
+                    if e.status == 429:
+                        # Limite estourado mesmo com os baldes: pausar o canal e tentar o mesmo lote de novo
+                        retry_after = float(e.response.headers.get('Retry-After', self.RETRY_BASE_DELAY))
+                        logger.warning(f"Limite de taxa no canal {channel_id}, pausando por {retry_after:g} s")
+                        bucket.pause(retry_after)
+                        queue.extendleft(reversed(batch))
+                    elif e.status < 500:
+                        # Recusada pela API (mensagem inválida): repetir não adianta
+                        logger.error(f"Mensagem recusada pelo Discord no canal {channel_id}: {e}")
+                        metrics.inc('stem_dispatch_messages_total', result='failed')
+                        await self._finish(batch, 'failed', AsyncOutboxService.mark_failed, str(e))
+                    else:
+                        await self._retry(channel_id, queue, batch, e)
+
+                except Exception as e:
+                    await self._retry(channel_id, queue, batch, e)
+
+                else:
+                    metrics.inc('stem_dispatch_messages_total', result='sent')
+                    await self._finish(batch, 'sent', AsyncOutboxService.delete_sent)
+        finally:
+            # Sem await entre o fim do laço e a limpeza: nada é enfileirado no meio
+            self._queues.pop(channel_id, None)
+            self._workers.pop(channel_id, None)
+            if self._backlog:
+                self.wake()
+
+    async def _retry(self, channel_id: int, queue: deque, batch: list, error: Exception):
+        """
+        Reagenda no banco um lote que falhou temporariamente, com espera exponencial
+
+        O restante da fila do canal é adiado para o mesmo instante, preservando
+        a ordem; mensagens que esgotaram MAX_ATTEMPTS são marcadas como falhas.
+        """
+        exhausted = [message for message in batch if message.attempts + 1 >= self.MAX_ATTEMPTS]
+        retried = [message for message in batch if message.attempts + 1 < self.MAX_ATTEMPTS]
+        waiting = list(queue)
+        queue.clear()
+
+        delay = self.RETRY_BASE_DELAY * 2 ** max(m.attempts for m in batch)
+        next_attempt_at = time.time() + delay
+        logger.warning(f"Falha ao enviar mensagem ao canal {channel_id} ({error}), nova tentativa em {delay:g} s")
+        metrics.inc('stem_dispatch_messages_total', result='retried')
+
+        if exhausted:
+            logger.error(f"{len(exhausted)} mensagem(ns) do canal {channel_id} descartada(s) após {self.MAX_ATTEMPTS} tentativa(s)")
+            await self._finish(exhausted, 'failed', AsyncOutboxService.mark_failed, str(error))
+        if retried:
+            await self._finish(retried, 'retried', AsyncOutboxService.reschedule, next_attempt_at, str(error))
+        if waiting:
+            await self._finish(waiting, None, AsyncOutboxService.reschedule, next_attempt_at)
+        self.wake()
+
+    async def _finish(self, messages: list, result: str, update, *args):
+        """
+        Grava na outbox o resultado de mensagens reservadas
+
+        Args:
+            messages: Lista de OutboxMessage
+            result: Resultado contado em stem_outbox_messages_total (None para não contar)
+            update: Método de AsyncOutboxService que recebe os IDs e args
+        """
+        message_ids = [message.message_id for message in messages]
+        await update(message_ids, *args)
+        if result is not None:
+            metrics.inc('stem_outbox_messages_total', len(message_ids), result=result)
+
+# Instância global do despachante de mensagens
+message_dispatcher = MessageDispatcher()
@@ -0,0 +1,255 @@
+import os
+import asyncio
+import logging
+import threading
+import time
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+# Limites (segundos) dos histogramas de latência
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class MetricsRegistry:
+    """
+    Registro em memória de contadores, gauges e histogramas
+
+    As métricas são declaradas uma vez (counter, gauge, histogram) e
+    atualizadas de qualquer thread; render() gera o formato de texto do
+    Prometheus. Valores mantidos por outros módulos (cache, fila de logs)
+    entram por callbacks avaliados apenas na coleta.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = {}  # nome -> (tipo, ajuda, buckets)
+        self._values = {}  # nome -> {labels: valor}
+        self._histograms = {}  # nome -> {labels: [contagens por bucket, soma, total]}
+        self._callbacks = []  # (nome, tipo, ajuda, função)
+
+    def counter(self, name: str, help_text: str):
+        """Declara um contador (apenas cresce)"""
+        self._metrics[name] = ('counter', help_text, None)
+        self._values.setdefault(name, {})
+
+    def gauge(self, name: str, help_text: str):
+        """Declara um gauge (valor instantâneo)"""
+        self._metrics[name] = ('gauge', help_text, None)
+        self._values.setdefault(name, {})
+
+    def histogram(self, name: str, help_text: str, buckets: tuple = DEFAULT_BUCKETS):
+        """Declara um histograma com os limites informados"""
+        self._metrics[name] = ('histogram', help_text, tuple(sorted(buckets)))
+        self._histograms.setdefault(name, {})
+
+    def register_callback(self, name: str, metric_type: str, help_text: str, func):
+        """
+        Registra uma métrica calculada no momento da coleta
+
+        Args:
+            name: Nome da métrica
+            metric_type: 'counter' ou 'gauge'
+            help_text: Descrição
+            func: Função sem argumentos que retorna um número ou um dict {labels (tuple de pares): número}
+        """
+        self._callbacks.append((name, metric_type, help_text, func))
+
+    @staticmethod
+    def _labels_key(labels: dict) -> tuple:
+        return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+    def inc(self, name: str, value: float = 1, **labels):
+        """Incrementa um contador"""
+        key = self._labels_key(labels)
+        with self._lock:
+            series = self._values[name]
+            series[key] = series.get(key, 0) + value
+
+    def set(self, name: str, value: float, **labels):
+        """Define o valor de um gauge"""
+        key = self._labels_key(labels)
+        with self._lock:
+            self._values[name][key] = value
+
+    def get(self, name: str, default: float = None, **labels) -> float:
+        """Retorna o valor atual de um contador ou gauge"""
+        key = self._labels_key(labels)
+        with self._lock:
+            return self._values.get(name, {}).get(key, default)
+
+    def total(self, name: str, **labels) -> float:
+        """Soma as séries de um contador cujos labels contêm os informados"""
+        wanted = set(self._labels_key(labels))
+        with self._lock:
+            return sum(value for key, value in self._values.get(name, {}).items() if wanted <= set(key))
+
+    def observe(self, name: str, value: float, **labels):
+        """Registra uma observação em um histograma"""
+        buckets = self._metrics[name][2]
+        key = self._labels_key(labels)
+        with self._lock:
+            series = self._histograms[name].get(key)
+            if series is None:
+                series = self._histograms[name][key] = [[0] * len(buckets), 0.0, 0]
+            for index, bound in enumerate(buckets):
+                if value <= bound:
+                    series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def time(self, name: str, **labels):
+        """Gerenciador de contexto que observa a duração do bloco em segundos"""
+        return _Timer(self, name, labels)
+
+    @staticmethod
+    def _format_labels(key: tuple, extra: tuple = ()) -> str:
+        pairs = key + extra
+        if not pairs:
+            return ''
+        escaped = []
+        for label, value in pairs:
+            value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+            escaped.append(f'{label}="{value}"')
+        return '{' + ','.join(escaped) + '}'
+
+    @staticmethod
+    def _format_value(value: float) -> str:
+        if isinstance(value, float) and value.is_integer():
+            return str(int(value))
+        return repr(value) if isinstance(value, float) else str(value)
+
+    def render(self) -> str:
+        """
+        Gera todas as métricas no formato de texto do Prometheus
+
+        Returns:
+            str: Corpo da resposta de /metrics
+        """
+        lines = []
+        with self._lock:
+            for name, (metric_type, help_text, buckets) in self._metrics.items():
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {metric_type}")
+                if metric_type == 'histogram':
+                    for key, (counts, total_sum, count) in self._histograms[name].items():
+                        for bound, bucket_count in zip(buckets, counts):
+                            lines.append(f"{name}_bucket{self._format_labels(key, (('le', bound),))} {bucket_count}")
+                        lines.append(f"{name}_bucket{self._format_labels(key, (('le', '+Inf'),))} {count}")
+                        lines.append(f"{name}_sum{self._format_labels(key)} {self._format_value(total_sum)}")
+                        lines.append(f"{name}_count{self._format_labels(key)} {count}")
+                else:
+                    for key, value in self._values[name].items():
+                        lines.append(f"{name}{self._format_labels(key)} {self._format_value(value)}")
+
+        for name, metric_type, help_text, func in self._callbacks:
+            try:
+                result = func()
+            except Exception as e:
+                logger.error(f"Erro ao coletar métrica {name}: {e}")
+                continue
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            if not isinstance(result, dict):
+                result = {(): result}
+            for key, value in result.items():
+                lines.append(f"{name}{self._format_labels(tuple(key))} {self._format_value(value)}")
+
+        return '\n'.join(lines) + '\n'
+
+class _Timer:
+    """Mede a duração de um bloco e a registra em um histograma"""
+
+    def __init__(self, registry: MetricsRegistry, name: str, labels: dict):
+        self.registry = registry
+        self.name = name
+        self.labels = labels
+        self.started = None
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.registry.observe(self.name, time.perf_counter() - self.started, **self.labels)
+        return False
+
+class MetricsServer:
+    """
+    Listener HTTP local e opcional que serve /metrics (METRICS_PORT)
+
+    Roda no próprio event loop com asyncio.start_server; cada coleta apenas
+    lê os valores em memória, sem consultar o banco de dados.
+    """
+
+    def __init__(self, registry: MetricsRegistry):
+        self.registry = registry
+        self._server = None
+
+    async def start(self):
+        """Inicia o listener se METRICS_PORT estiver definido"""
+        port = os.getenv('METRICS_PORT', '').strip()
+        if not port or self._server is not None:
+            return
+        host = os.getenv('METRICS_HOST', '127.0.0.1')
+        try:
+            self._server = await asyncio.start_server(self._handle, host, int(port))
+            logger.info(f"Métricas disponíveis em http://{host}:{port}/metrics")
+        except Exception as e:
+            logger.error(f"Erro ao iniciar o servidor de métricas: {e}")
+
+    async def stop(self):
+        """Encerra o listener"""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Atende uma requisição HTTP/1.0 simples"""
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), timeout=5)
+            # Descartar os cabeçalhos da requisição
+            while True:
+                line = await asyncio.wait_for(reader.readline(), timeout=5)
+                if line in (b'\r\n', b'\n', b''):
+                    break
+
+            parts = request_line.decode('latin-1').split()
+            if len(parts) >= 2 and parts[0] == 'GET' and parts[1].split('?')[0] == '/metrics':
+                status, body = '200 OK', self.registry.render().encode('utf-8')
+                content_type = 'text/plain; version=0.0.4; charset=utf-8'
+            else:
+                status, body, content_type = '404 Not Found', b'Not Found\n', 'text/plain; charset=utf-8'
+
+            writer.write(
+                f"HTTP/1.0 {status}\r\nContent-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode('latin-1') + body
+            )
+            await writer.drain()
+        except (asyncio.TimeoutError, ConnectionError) as e:
+            logger.debug(f"Requisição de métricas interrompida: {e}")
+        finally:
+            writer.close()
+
+# Registro global de métricas do bot
+metrics = MetricsRegistry()
+
+metrics.counter('stem_commands_total', "Comandos slash executados por comando e resultado")
+metrics.histogram('stem_command_duration_seconds', "Duração dos comandos slash, do recebimento da interação à conclusão")
+metrics.histogram('stem_db_operation_seconds', "Duração das operações do banco de dados por função")
+metrics.counter('stem_db_operations_total', "Operações do banco de dados por função e tipo (read/write)")
+metrics.histogram('stem_scheduler_sweep_seconds', "Duração das varreduras do agendador")
+metrics.counter('stem_scheduler_sweeps_total', "Varreduras do agendador executadas")
+metrics.counter('stem_scheduler_rows_total', "Eventos tocados pelas varreduras do agendador por resultado")
+metrics.gauge('stem_scheduler_last_sweep_timestamp_seconds', "Instante (epoch) da última varredura concluída")
+metrics.gauge('stem_scheduler_armed_events', "Eventos com vencimento armado no agendador")
+metrics.gauge('stem_scheduler_next_due_timestamp_seconds', "Instante (epoch) do próximo vencimento armado")
+metrics.counter('stem_reminders_total', "Lembretes de eventos gravados na outbox")
+metrics.gauge('stem_reminders_next_due_timestamp_seconds', "Instante (epoch) do próximo lembrete de evento")
+metrics.counter('stem_dispatch_messages_total', "Envios ao Discord do despachante por resultado (sent/retried/failed)")
+metrics.counter('stem_outbox_messages_total', "Mensagens da outbox por resultado (sent/retried/failed)")
+metrics.histogram('stem_event_loop_lag_seconds', "Atraso medido do event loop",
+                  buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0))
+
+# Servidor HTTP opcional de métricas
+metrics_server = MetricsServer(metrics)
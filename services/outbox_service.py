@@ -0,0 +1,332 @@
+import json
+import time
+import logging
+from dados.database import get_connection, get_read_connection
+from dados.async_database import run_in_db, run_read_in_db
+from services.shard_config import shard_config
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+class OutboxMessage:
+    """
+    Mensagem a ser enviada pelo bot a um canal
+
+    Os embeds ficam no formato de dicionário da API do Discord
+    (discord.Embed.to_dict), o mesmo gravado na coluna payload.
+
+    Args:
+        guild_id: Servidor do canal (usado para dividir a outbox entre shards)
+        channel_id: Canal de destino
+        kind: Origem da mensagem ('welcome', 'leave', 'reminder'...)
+        content: Texto da mensagem (opcional)
+        embeds: Embeds da mensagem, como discord.Embed ou dicionários
+        message_id: ID na outbox (apenas mensagens lidas do banco)
+        attempts: Tentativas de envio já feitas (apenas mensagens lidas do banco)
+    """
+
+    __slots__ = ('guild_id', 'channel_id', 'kind', 'content', 'embeds', 'message_id', 'attempts')
+
+    def __init__(self, guild_id: int, channel_id: int, kind: str, content: str = None, embeds: list = (),
+                 message_id: int = None, attempts: int = 0):
+        self.guild_id = guild_id
+        self.channel_id = channel_id
+        self.kind = kind
+        self.content = content
+        self.embeds = [embed if isinstance(embed, dict) else embed.to_dict() for embed in embeds]
+        self.message_id = message_id
+        self.attempts = attempts
+
+    def payload(self) -> str:
+        """Conteúdo da mensagem serializado para a coluna payload"""
+        return json.dumps({'content': self.content, 'embeds': self.embeds}, ensure_ascii=False)
+
+    @classmethod
+    def from_row(cls, row: tuple) -> 'OutboxMessage':
+        """Cria a mensagem a partir de (id, guild_id, channel_id, kind, payload, attempts)"""
+        message_id, guild_id, channel_id, kind, payload, attempts = row
+        data = json.loads(payload)
+        return cls(guild_id, channel_id, kind, data.get('content'), data.get('embeds') or (), message_id, attempts)
+
+class OutboxService:
+    """
+    Serviço da outbox: mensagens do bot gravadas no banco antes do envio
+
+    Quem gera uma mensagem a grava na mesma transação da mudança de estado
+    que a originou (por exemplo, o registro de um lembrete), então nenhuma
+    mensagem se perde se o bot parar ou o Discord falhar: o
+    MessageDispatcher as envia depois, apaga as enviadas e reagenda as que
+    falharam.
+    """
+
+    # Por quanto tempo mensagens que falharam definitivamente são mantidas para consulta
+    FAILED_RETENTION_SECONDS = 7 * 24 * 3600
+
+    @staticmethod
+    def insert_messages(cursor, messages: list):
+        """
+        Grava mensagens usando o cursor (e a transação) de quem chama, sem commit
+
+        Args:
+            cursor: Cursor da conexão de escrita
+            messages: Lista de OutboxMessage
+        """
+        cursor.executemany('''
+            INSERT INTO outbox (guild_id, channel_id, kind, payload)
+            VALUES (?, ?, ?, ?)
+        ''', [(message.guild_id, message.channel_id, message.kind, message.payload()) for message in messages])
+
+    @staticmethod
+    def add_messages(messages: list) -> bool:
+        """
+        Grava mensagens na outbox em uma transação própria
+
+        Args:
+            messages: Lista de OutboxMessage
+
+        Returns:
+            bool: True se gravadas com sucesso
+        """
+        if not messages:
+            return True
+
+        conn = get_connection()
+        try:
+            OutboxService.insert_messages(conn.cursor(), messages)
+            conn.commit()
+            return True
+
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Erro ao gravar mensagens na outbox: {e}")
+            return False
+
+    @staticmethod
+    def claim_pending(limit: int, now: float = None) -> list:
+        """
+        Reserva as mensagens pendentes cujo envio já pode ser tentado, em ordem de criação
+
+        A reserva é feita na conexão de escrita com um único UPDATE ... RETURNING:
+        uma mensagem reservada não volta em outra chamada até ser reagendada ou
+        liberada, e uma mensagem apagada após o envio nunca é lida de novo (uma
+        leitura no pool poderia ainda vê-la em seu snapshot). Apenas servidores
+        dos shards deste processo são considerados.
+
+        Args:
+            limit: Quantidade máxima de mensagens
+            now: Instante de referência em epoch (padrão: agora)
+
+        Returns:
+            list: Lista de OutboxMessage
+        """
+        now = now or time.time()
+        conn = get_connection()
+        try:
+            cursor = conn.cursor()
+
+            shard_clause, shard_params = shard_config.sql_filter()
+            cursor.execute(f'''
+                UPDATE outbox SET claimed_at = ?
+                WHERE id IN (
+                    SELECT id FROM outbox
+                    WHERE status = 'pending'
+                    AND claimed_at IS NULL
+                    AND next_attempt_at <= ?{shard_clause}
+                    ORDER BY id
+                    LIMIT ?
+                )
+                RETURNING id, guild_id, channel_id, kind, payload, attempts
+            ''', (now, now, *shard_params, limit))
+            rows = cursor.fetchall()
+            conn.commit()
+            # RETURNING não garante ordem
+            return [OutboxMessage.from_row(row) for row in sorted(rows)]
+
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Erro ao reservar mensagens pendentes da outbox: {e}")
+            return []
+
+    @staticmethod
+    def release_claims() -> bool:
+        """
+        Libera as reservas deixadas por uma execução anterior do despachante
+
+        Apenas servidores dos shards deste processo são considerados.
+
+        Returns:
+            bool: True se liberadas com sucesso
+        """
+        conn = get_connection()
+        try:
+            shard_clause, shard_params = shard_config.sql_filter()
+            conn.cursor().execute(f'''
+                UPDATE outbox SET claimed_at = NULL
+                WHERE claimed_at IS NOT NULL{shard_clause}
+            ''', shard_params)
+            conn.commit()
+            return True
+
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Erro ao liberar reservas da outbox: {e}")
+            return False
+
+    @staticmethod
+    def get_next_attempt_at(now: float = None) -> float:
+        """
+        Busca o próximo instante (epoch) em que uma mensagem adiada pode ser reenviada
+
+        Args:
+            now: Instante de referência em epoch (padrão: agora)
+
+        Returns:
+            float: Instante do próximo reenvio ou None se não houver mensagem adiada
+        """
+        try:
+            conn = get_read_connection()
+            cursor = conn.cursor()
+
+            shard_clause, shard_params = shard_config.sql_filter()
+            cursor.execute(f'''
+                SELECT MIN(next_attempt_at)
+                FROM outbox
+                WHERE status = 'pending'
+                AND claimed_at IS NULL
+                AND next_attempt_at > ?{shard_clause}
+            ''', (now or time.time(), *shard_params))
+            return cursor.fetchone()[0]
+
+        except Exception as e:
+            logger.error(f"Erro ao buscar o próximo reenvio da outbox: {e}")
+            return None
+
+    @staticmethod
+    def delete_sent(message_ids: list) -> bool:
+        """
+        Remove da outbox as mensagens enviadas
+
+        Args:
+            message_ids: IDs das mensagens
+
+        Returns:
+            bool: True se removidas com sucesso
+        """
+        conn = get_connection()
+        try:
+            conn.cursor().executemany('DELETE FROM outbox WHERE id = ?', [(message_id,) for message_id in message_ids])
+            conn.commit()
+            return True
+
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Erro ao remover mensagens enviadas da outbox: {e}")
+            return False
+
+    @staticmethod
+    def reschedule(message_ids: list, next_attempt_at: float, error: str = None) -> bool:
+        """
+        Adia o envio de mensagens e libera sua reserva
+
+        Com error, conta uma tentativa para cada mensagem (falha no envio); sem
+        error, apenas adia (mensagens que esperavam atrás de uma falha).
+
+        Args:
+            message_ids: IDs das mensagens
+            next_attempt_at: Instante (epoch) da próxima tentativa
+            error: Erro da tentativa que falhou (opcional)
+
+        Returns:
+            bool: True se gravado com sucesso
+        """
+        conn = get_connection()
+        try:
+            conn.cursor().executemany('''
+                UPDATE outbox
+                SET next_attempt_at = ?, attempts = attempts + ?, last_error = COALESCE(?, last_error), claimed_at = NULL
+                WHERE id = ?
+            ''', [(next_attempt_at, 1 if error else 0, error, message_id) for message_id in message_ids])
+            conn.commit()
+            return True
+
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Erro ao reagendar mensagens da outbox: {e}")
+            return False
+
+    @staticmethod
+    def mark_failed(message_ids: list, error: str) -> bool:
+        """
+        Marca mensagens como falhas definitivas (não serão mais enviadas)
+
+        Também descarta falhas mais antigas que FAILED_RETENTION_SECONDS (em
+        mensagens falhas, next_attempt_at guarda o instante da falha).
+
+        Args:
+            message_ids: IDs das mensagens
+            error: Motivo da falha
+
+        Returns:
+            bool: True se gravado com sucesso
+        """
+        now = time.time()
+        conn = get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.executemany('''
+                UPDATE outbox
+                SET status = 'failed', attempts = attempts + 1, next_attempt_at = ?, last_error = ?, claimed_at = NULL
+                WHERE id = ?
+            ''', [(now, error, message_id) for message_id in message_ids])
+            cursor.execute("DELETE FROM outbox WHERE status = 'failed' AND next_attempt_at < ?",
+                           (now - OutboxService.FAILED_RETENTION_SECONDS,))
+            conn.commit()
+            return True
+
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Erro ao marcar mensagens da outbox como falhas: {e}")
+            return False
+
+class AsyncOutboxService:
+    """
+    Fachada assíncrona do OutboxService
+
+    Escritas rodam na thread dedicada do banco de dados e leituras no pool
+    somente leitura, sem bloquear o event loop do Discord.
+    """
+
+    @staticmethod
+    async def add_messages(messages: list) -> bool:
+        """Versão assíncrona de OutboxService.add_messages"""
+        return await run_in_db(OutboxService.add_messages, messages)
+
+    @staticmethod
+    async def claim_pending(limit: int, now: float = None) -> list:
+        """Versão assíncrona de OutboxService.claim_pending"""
+        return await run_in_db(OutboxService.claim_pending, limit, now)
+
+    @staticmethod
+    async def release_claims() -> bool:
+        """Versão assíncrona de OutboxService.release_claims"""
+        return await run_in_db(OutboxService.release_claims)
+
+    @staticmethod
+    async def get_next_attempt_at(now: float = None) -> float:
+        """Versão assíncrona de OutboxService.get_next_attempt_at"""
+        return await run_read_in_db(OutboxService.get_next_attempt_at, now)
+
+    @staticmethod
+    async def delete_sent(message_ids: list) -> bool:
+        """Versão assíncrona de OutboxService.delete_sent"""
+        return await run_in_db(OutboxService.delete_sent, message_ids)
+
+    @staticmethod
+    async def reschedule(message_ids: list, next_attempt_at: float, error: str = None) -> bool:
+        """Versão assíncrona de OutboxService.reschedule"""
+        return await run_in_db(OutboxService.reschedule, message_ids, next_attempt_at, error)
+
+    @staticmethod
+    async def mark_failed(message_ids: list, error: str) -> bool:
+        """Versão assíncrona de OutboxService.mark_failed"""
+        return await run_in_db(OutboxService.mark_failed, message_ids, error)
@@ -0,0 +1,286 @@
+import os
+import re
+import logging
+from datetime import datetime, timedelta
+from dados.database import get_connection, get_read_connection, STARTS_AT_FORMAT
+from dados.async_database import run_in_db, run_read_in_db
+from dados.models import event_row_factory
+from services.shard_config import shard_config
+from services.outbox_service import OutboxService
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+# Antecedências padrão dos lembretes: 24 horas, 1 hora e 10 minutos
+DEFAULT_REMINDER_OFFSETS = "24h,1h,10m"
+
+# Unidades aceitas em REMINDER_OFFSETS, em minutos
+_OFFSET_UNITS = {'d': 1440, 'h': 60, 'm': 1, '': 1}
+_OFFSET_PATTERN = re.compile(r'^(\d+)\s*([dhm]?)$')
+
+def parse_offsets(value: str) -> tuple:
+    """
+    Converte uma lista de antecedências (ex: "24h,1h,10m") em minutos
+
+    Args:
+        value: Antecedências separadas por vírgula; cada uma é um número seguido de d, h ou m (sem unidade = minutos)
+
+    Returns:
+        tuple: Antecedências em minutos, da maior para a menor (vazia = lembretes desativados)
+
+    Raises:
+        ValueError: Se alguma antecedência for inválida
+    """
+    if value.strip().lower() in ('', '0', 'off', 'nao', 'não'):
+        return ()
+
+    offsets = set()
+    for part in value.split(','):
+        match = _OFFSET_PATTERN.match(part.strip().lower())
+        if not match or int(match.group(1)) == 0:
+            raise ValueError(f"Antecedência de lembrete inválida: '{part.strip()}'")
+        offsets.add(int(match.group(1)) * _OFFSET_UNITS[match.group(2)])
+    return tuple(sorted(offsets, reverse=True))
+
+def load_offsets_from_env() -> tuple:
+    """
+    Lê REMINDER_OFFSETS do ambiente
+
+    Returns:
+        tuple: Antecedências em minutos, da maior para a menor
+    """
+    value = os.getenv('REMINDER_OFFSETS', DEFAULT_REMINDER_OFFSETS)
+    try:
+        return parse_offsets(value)
+    except ValueError as e:
+        logger.warning(f"{e}; usando o padrão {DEFAULT_REMINDER_OFFSETS}")
+        return parse_offsets(DEFAULT_REMINDER_OFFSETS)
+
+class ReminderService:
+    """
+    Serviço para os lembretes enviados antes do início dos eventos
+
+    Um lembrete de antecedência N vence N minutos antes de starts_at. Apenas
+    eventos ativos de servidores com canal de lembretes configurado são
+    considerados. Quando várias antecedências vencem juntas (evento criado
+    pouco antes de começar, bot parado por algum tempo), só a menor delas é
+    enviada.
+    """
+
+    # Por quanto tempo o registro de um lembrete enviado é mantido após o início do evento
+    SENT_RETENTION = timedelta(days=2)
+
+    @staticmethod
+    def set_reminder_channel(guild_id: int, channel_id: int = None) -> bool:
+        """
+        Define (ou remove) o canal de lembretes de um servidor
+
+        Args:
+            guild_id: ID do servidor
+            channel_id: ID do canal de texto (None = desativar lembretes)
+
+        Returns:
+            bool: True se gravado com sucesso
+        """
+        try:
+            conn = get_connection()
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT INTO guild_settings (guild_id, reminder_channel_id, updated_at)
+                VALUES (?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT(guild_id) DO UPDATE SET reminder_channel_id = excluded.reminder_channel_id, updated_at = excluded.updated_at
+            ''', (guild_id, channel_id))
+            conn.commit()
+            logger.info("Canal de lembretes definido como %s", channel_id, extra={'guild': guild_id})
+            return True
+
+        except Exception as e:
+            logger.error(f"Erro ao definir canal de lembretes: {e}")
+            return False
+
+    @staticmethod
+    def get_reminder_channel(guild_id: int) -> int:
+        """
+        Busca o canal de lembretes de um servidor
+
+        Args:
+            guild_id: ID do servidor
+
+        Returns:
+            int: ID do canal ou None se os lembretes estiverem desativados
+        """
+        try:
+            conn = get_read_connection()
+            cursor = conn.cursor()
+            cursor.execute('SELECT reminder_channel_id FROM guild_settings WHERE guild_id = ?', (guild_id,))
+            row = cursor.fetchone()
+            return row[0] if row else None
+
+        except Exception as e:
+            logger.error(f"Erro ao buscar canal de lembretes: {e}")
+            return None
+
+    @staticmethod
+    def get_due_reminders(offsets: tuple, now: datetime = None) -> list:
+        """
+        Busca os lembretes vencidos e ainda não enviados
+
+        Args:
+            offsets: Antecedências em minutos, da maior para a menor
+            now: Instante de referência (padrão: agora)
+
+        Returns:
+            list: Lista de tuplas (EventRow, antecedência_em_minutos); o EventRow traz id, guild_id,
+                  name, date, time, link, starts_at, reminder_channel_id e sent_offset
+        """
+        if not offsets:
+            return []
+        now = now or datetime.now()
+
+        try:
+            conn = get_read_connection()
+            cursor = conn.cursor()
+            cursor.row_factory = event_row_factory
+
+            # Eventos que começam dentro da maior antecedência; o índice
+            # (guild_id, status, starts_at) é percorrido apenas para os servidores configurados
+            shard_clause, shard_params = shard_config.sql_filter('e.guild_id')
+            cursor.execute(f'''
+                SELECT e.id, e.guild_id, e.name, e.date, e.time, e.link, e.starts_at, g.reminder_channel_id,
+                       (SELECT MIN(r.offset_minutes) FROM reminders_sent r
+                        WHERE r.event_id = e.id AND r.starts_at = e.starts_at) AS sent_offset
+                FROM guild_settings g
+                JOIN events e ON e.guild_id = g.guild_id
+                WHERE g.reminder_channel_id IS NOT NULL
+                AND e.status = 'ativo'
+                AND e.starts_at > ? AND e.starts_at <= ?{shard_clause}
+                ORDER BY e.starts_at, e.id
+            ''', (now.strftime(STARTS_AT_FORMAT), (now + timedelta(minutes=offsets[0])).strftime(STARTS_AT_FORMAT), *shard_params))
+
+            # Limite de cada antecedência, da menor para a maior
+            limits = [(offset, (now + timedelta(minutes=offset)).strftime(STARTS_AT_FORMAT)) for offset in reversed(offsets)]
+
+            due_reminders = []
+            for event in cursor.fetchall():
+                # Menor antecedência já alcançada: starts_at <= agora + antecedência
+                offset = next(offset for offset, limit in limits if event.starts_at <= limit)
+                if event.sent_offset is None or offset < event.sent_offset:
+                    due_reminders.append((event, offset))
+            return due_reminders
+
+        except Exception as e:
+            logger.error(f"Erro ao buscar lembretes vencidos: {e}")
+            return []
+
+    @staticmethod
+    def get_next_reminder_at(offsets: tuple, now: datetime = None) -> datetime:
+        """
+        Calcula o próximo instante em que algum lembrete vence
+
+        Para cada antecedência, busca o primeiro início posterior a
+        agora + antecedência com uma busca no índice por servidor configurado.
+
+        Args:
+            offsets: Antecedências em minutos
+            now: Instante de referência (padrão: agora)
+
+        Returns:
+            datetime: Próximo vencimento ou None se não houver
+        """
+        if not offsets:
+            return None
+        now = now or datetime.now()
+
+        try:
+            conn = get_read_connection()
+            cursor = conn.cursor()
+
+            shard_clause, shard_params = shard_config.sql_filter('g.guild_id')
+            next_at = None
+            for offset in offsets:
+                cursor.execute(f'''
+                    SELECT MIN((SELECT MIN(e.starts_at) FROM events e
+                                WHERE e.guild_id = g.guild_id AND e.status = 'ativo' AND e.starts_at > ?))
+                    FROM guild_settings g
+                    WHERE g.reminder_channel_id IS NOT NULL{shard_clause}
+                ''', ((now + timedelta(minutes=offset)).strftime(STARTS_AT_FORMAT), *shard_params))
+                starts_at = cursor.fetchone()[0]
+                if starts_at is None:
+                    continue
+                due_at = datetime.strptime(starts_at, STARTS_AT_FORMAT) - timedelta(minutes=offset)
+                if next_at is None or due_at < next_at:
+                    next_at = due_at
+            return next_at
+
+        except Exception as e:
+            logger.error(f"Erro ao calcular o próximo lembrete: {e}")
+            return None
+
+    @staticmethod
+    def mark_reminders_sent(reminders: list, messages: list = ()) -> bool:
+        """
+        Registra lembretes como enviados e descarta registros antigos
+
+        As mensagens dos lembretes entram na outbox na mesma transação: ou o
+        lembrete fica registrado e sua mensagem será enviada, ou nenhum dos dois.
+
+        Args:
+            reminders: Lista de tuplas (EventRow, antecedência_em_minutos) de get_due_reminders
+            messages: Lista de OutboxMessage com os lembretes a enviar
+
+        Returns:
+            bool: True se registrado com sucesso
+        """
+        if not reminders:
+            return True
+
+        conn = get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.executemany('''
+                INSERT OR IGNORE INTO reminders_sent (event_id, starts_at, offset_minutes)
+                VALUES (?, ?, ?)
+            ''', [(event.id, event.starts_at, offset) for event, offset in reminders])
+            cursor.execute('DELETE FROM reminders_sent WHERE starts_at < ?',
+                           ((datetime.now() - ReminderService.SENT_RETENTION).strftime(STARTS_AT_FORMAT),))
+            OutboxService.insert_messages(cursor, messages)
+            conn.commit()
+            return True
+
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Erro ao registrar lembretes enviados: {e}")
+            return False
+
+class AsyncReminderService:
+    """
+    Fachada assíncrona do ReminderService
+
+    Escritas rodam na thread dedicada do banco de dados e leituras no pool
+    somente leitura, sem bloquear o event loop do Discord.
+    """
+
+    @staticmethod
+    async def set_reminder_channel(guild_id: int, channel_id: int = None) -> bool:
+        """Versão assíncrona de ReminderService.set_reminder_channel"""
+        return await run_in_db(ReminderService.set_reminder_channel, guild_id, channel_id)
+
+    @staticmethod
+    async def get_reminder_channel(guild_id: int) -> int:
+        """Versão assíncrona de ReminderService.get_reminder_channel"""
+        return await run_read_in_db(ReminderService.get_reminder_channel, guild_id)
+
+    @staticmethod
+    async def get_due_reminders(offsets: tuple, now: datetime = None) -> list:
+        """Versão assíncrona de ReminderService.get_due_reminders"""
+        return await run_read_in_db(ReminderService.get_due_reminders, offsets, now)
+
+    @staticmethod
+    async def get_next_reminder_at(offsets: tuple, now: datetime = None) -> datetime:
+        """Versão assíncrona de ReminderService.get_next_reminder_at"""
+        return await run_read_in_db(ReminderService.get_next_reminder_at, offsets, now)
+
+    @staticmethod
+    async def mark_reminders_sent(reminders: list, messages: list = ()) -> bool:
+        """Versão assíncrona de ReminderService.mark_reminders_sent"""
+        return await run_in_db(ReminderService.mark_reminders_sent, reminders, messages)
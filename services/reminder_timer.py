@@ -0,0 +1,111 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from services.reminder_service import AsyncReminderService, load_offsets_from_env
+from services.message_dispatcher import message_dispatcher
+from services.metrics import metrics
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+class ReminderTimer:
+    """
+    Agendador dos lembretes de eventos
+
+    Calcula no banco o próximo instante em que algum lembrete vence, dorme
+    até ele e então registra de uma vez todos os lembretes vencidos (centenas de
+    eventos começando na mesma hora viram uma única consulta e uma única
+    transação, que também grava as mensagens na outbox para o despachante).
+    Criações e alterações de eventos acordam o laço para recalcular a espera.
+    """
+
+    # Teto de uma espera contínua; protege contra ajustes no relógio do sistema
+    MAX_SLEEP_SECONDS = 3600
+
+    # Espera antes de tentar novamente após uma falha no registro dos lembretes
+    RETRY_DELAY = timedelta(minutes=1)
+
+    def __init__(self):
+        self.offsets = ()
+        self._render = None
+        self._wakeup = None
+        self._task = None
+
+    def is_running(self) -> bool:
+        """Indica se o agendador de lembretes está em execução"""
+        return self._task is not None and not self._task.done()
+
+    def start(self, render, before_start=None):
+        """
+        Inicia o agendador de lembretes no event loop atual
+
+        As antecedências são lidas de REMINDER_OFFSETS; vazia desativa os lembretes.
+
+        Args:
+            render: Função que recebe a lista de (EventRow, antecedência_em_minutos) vencidos
+                    e devolve as OutboxMessage a enviar
+            before_start: Corrotina opcional aguardada antes da primeira consulta
+                          (por exemplo, bot.wait_until_ready)
+        """
+        if self.is_running():
+            logger.info("Agendador de lembretes já está em execução, pulando inicialização")
+            return
+        self.offsets = load_offsets_from_env()
+        if not self.offsets:
+            logger.info("Lembretes de eventos desativados (REMINDER_OFFSETS vazio)")
+            return
+        self._render = render
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._run(before_start))
+        logger.info("Agendador de lembretes iniciado com antecedências de %s minuto(s)", ', '.join(map(str, self.offsets)))
+
+    def stop(self):
+        """Interrompe o agendador de lembretes"""
+        if self.is_running():
+            self._task.cancel()
+            logger.info("Agendador de lembretes parado")
+        self._task = None
+
+    def wake(self):
+        """Faz o laço recalcular o próximo lembrete (após criação ou alteração de eventos)"""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _run(self, before_start):
+        """Laço principal: entrega os lembretes vencidos e dorme até o próximo"""
+        if before_start is not None:
+            await before_start()
+
+        while True:
+            self._wakeup.clear()
+            now = datetime.now()
+            try:
+                due_reminders = await AsyncReminderService.get_due_reminders(self.offsets, now)
+                if due_reminders:
+                    await self._fire(due_reminders)
+                next_at = await AsyncReminderService.get_next_reminder_at(self.offsets, now)
+            except Exception as e:
+                logger.error(f"Erro no agendador de lembretes: {e}")
+                next_at = now + self.RETRY_DELAY
+
+            metrics.set('stem_reminders_next_due_timestamp_seconds', next_at.timestamp() if next_at is not None else 0)
+            timeout = self.MAX_SLEEP_SECONDS
+            if next_at is not None:
+                timeout = min(max(0.0, (next_at - datetime.now()).total_seconds()), self.MAX_SLEEP_SECONDS)
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _fire(self, due_reminders: list):
+        """Registra os lembretes vencidos e grava suas mensagens na outbox, na mesma transação"""
+        logger.info("%d lembrete(s) vencido(s)", len(due_reminders))
+        messages = self._render(due_reminders)
+        if not await AsyncReminderService.mark_reminders_sent(due_reminders, messages):
+            raise RuntimeError("não foi possível registrar os lembretes enviados")
+        message_dispatcher.wake()
+        metrics.inc('stem_reminders_total', len(due_reminders))
+
+# Instância global do agendador de lembretes
+reminder_timer = ReminderTimer()
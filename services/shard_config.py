@@ -0,0 +1,128 @@
+import os
+import logging
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+class ShardConfig:
+    """
+    Configuração de shards do processo
+
+    Com SHARDED ativo o bot usa AutoShardedBot. SHARD_COUNT fixa o total de
+    shards e SHARD_IDS limita os shards abertos por este processo, permitindo
+    dividir os shards entre vários processos no mesmo host. Nesse caso as
+    varreduras do agendador processam apenas eventos de servidores dos shards
+    próprios (shard = (guild_id >> 22) % SHARD_COUNT, regra do Discord), então
+    nenhum evento é varrido ou notificado por dois processos.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.shard_count = None
+        self.shard_ids = None
+
+    def load_from_env(self):
+        """
+        Lê SHARDED, SHARD_COUNT e SHARD_IDS do ambiente
+
+        Raises:
+            ValueError: Se os valores forem inválidos ou inconsistentes
+        """
+        self.enabled = os.getenv('SHARDED', 'false').strip().lower() in ('1', 'true', 'sim')
+        self.shard_count = None
+        self.shard_ids = None
+        if not self.enabled:
+            return
+
+        shard_count = os.getenv('SHARD_COUNT', '').strip()
+        shard_ids = os.getenv('SHARD_IDS', '').strip()
+
+        if shard_count:
+            self.shard_count = int(shard_count)
+            if self.shard_count < 1:
+                raise ValueError("SHARD_COUNT deve ser maior que zero")
+
+        if shard_ids:
+            if self.shard_count is None:
+                raise ValueError("SHARD_IDS exige SHARD_COUNT definido")
+            self.shard_ids = sorted({int(shard_id) for shard_id in shard_ids.split(',') if shard_id.strip()})
+            invalid = [shard_id for shard_id in self.shard_ids if not 0 <= shard_id < self.shard_count]
+            if invalid:
+                raise ValueError(f"SHARD_IDS fora do intervalo 0..{self.shard_count - 1}: {invalid}")
+
+        logger.info(
+            f"Modo sharded ativo: total={self.shard_count or 'automático'}, "
+            f"shards deste processo={self.shard_ids or 'todos'}"
+        )
+
+    @property
+    def partitioned(self) -> bool:
+        """Indica se este processo abre apenas parte dos shards"""
+        return self.shard_ids is not None and len(self.shard_ids) < self.shard_count
+
+    def bot_kwargs(self) -> dict:
+        """
+        Argumentos de shard para o construtor do AutoShardedBot
+
+        Returns:
+            dict: shard_count e shard_ids, quando configurados
+        """
+        kwargs = {}
+        if self.shard_count is not None:
+            kwargs['shard_count'] = self.shard_count
+        if self.shard_ids is not None:
+            kwargs['shard_ids'] = self.shard_ids
+        return kwargs
+
+    def shard_for_guild(self, guild_id: int) -> int:
+        """
+        Retorna o shard responsável por um servidor
+
+        Args:
+            guild_id: ID do servidor
+
+        Returns:
+            int: Número do shard
+        """
+        return (guild_id >> 22) % self.shard_count
+
+    def owns_guild(self, guild_id: int) -> bool:
+        """
+        Indica se os eventos de um servidor são processados por este processo
+
+        Eventos sem servidor (anteriores ao suporte a vários servidores) ficam
+        com o processo dono do shard 0.
+
+        Args:
+            guild_id: ID do servidor (ou None)
+
+        Returns:
+            bool: True se o servidor pertence a um shard deste processo
+        """
+        if not self.partitioned:
+            return True
+        if guild_id is None:
+            return 0 in self.shard_ids
+        return self.shard_for_guild(guild_id) in self.shard_ids
+
+    def sql_filter(self, column: str = 'guild_id') -> tuple:
+        """
+        Condição SQL que restringe uma consulta aos servidores deste processo
+
+        Args:
+            column: Coluna com o ID do servidor
+
+        Returns:
+            tuple: (trecho SQL iniciado por AND ou string vazia, parâmetros)
+        """
+        if not self.partitioned:
+            return '', []
+
+        placeholders = ', '.join('?' for _ in self.shard_ids)
+        clause = f"(({column} >> 22) % ?) IN ({placeholders})"
+        if 0 in self.shard_ids:
+            clause = f"({clause} OR {column} IS NULL)"
+        return f" AND {clause}", [self.shard_count, *self.shard_ids]
+
+# Configuração global de shards (carregada pelo bot.py após ler o .env)
+shard_config = ShardConfig()
@@ -0,0 +1,123 @@
+import os
+import logging
+import threading
+from datetime import datetime, timedelta
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+class WeekViewCache:
+    """
+    Cache em memória da visão semanal exibida por /eventos, por servidor
+
+    Guarda o embed já renderizado de cada servidor e o descarta quando o TTL
+    expira, quando o primeiro evento listado começa (ele deixa de ser futuro),
+    na virada da semana ou quando uma escrita em eventos chama invalidate(). As
+    escritas acontecem na thread do banco, por isso o acesso é protegido por
+    lock e cada preenchimento informa a geração lida antes da consulta: um
+    valor calculado antes de uma invalidação nunca é armazenado.
+    """
+
+    def __init__(self, ttl_seconds: float = None):
+        if ttl_seconds is None:
+            ttl_seconds = float(os.getenv('WEEK_VIEW_CACHE_TTL', '60'))
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self._lock = threading.Lock()
+        self._entries = {}  # guild_id -> (valor, expira_em)
+        self._generations = {}  # guild_id -> geração do servidor
+        self._epoch = 0  # Incrementado ao invalidar todos os servidores
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def generation(self, guild_id: int) -> tuple:
+        """
+        Geração atual de um servidor; deve ser lida antes de consultar o banco em um miss
+
+        Args:
+            guild_id: ID do servidor
+
+        Returns:
+            tuple: Identificador opaco da geração
+        """
+        with self._lock:
+            return self._epoch, self._generations.get(guild_id, 0)
+
+    def get(self, guild_id: int):
+        """
+        Retorna o valor em cache de um servidor, se ainda válido
+
+        Args:
+            guild_id: ID do servidor
+
+        Returns:
+            Valor armazenado ou None em caso de miss
+        """
+        with self._lock:
+            entry = self._entries.get(guild_id)
+            if entry is not None and datetime.now() < entry[1]:
+                self.hits += 1
+                return entry[0]
+            self._entries.pop(guild_id, None)
+            self.misses += 1
+            return None
+
+    def put(self, guild_id: int, value, generation: tuple, not_after: datetime = None):
+        """
+        Armazena um valor recém-calculado
+
+        Args:
+            guild_id: ID do servidor
+            value: Valor a ser armazenado (embed renderizado)
+            generation: Geração lida antes da consulta que produziu o valor
+            not_after: Instante máximo de validade (além do TTL)
+        """
+        expires_at = datetime.now() + self.ttl
+        if not_after is not None and not_after < expires_at:
+            expires_at = not_after
+
+        with self._lock:
+            if generation != (self._epoch, self._generations.get(guild_id, 0)):
+                logger.debug("Visão semanal do servidor %s descartada: eventos alterados durante a consulta", guild_id)
+                return
+            self._entries[guild_id] = (value, expires_at)
+
+    def invalidate(self, guild_id: int = None):
+        """
+        Descarta a visão em cache após uma escrita em eventos
+
+        Args:
+            guild_id: Servidor afetado (None = todos, usado pelas varreduras do agendador)
+        """
+        with self._lock:
+            if guild_id is None:
+                self._epoch += 1
+                self._entries.clear()
+            else:
+                self._generations[guild_id] = self._generations.get(guild_id, 0) + 1
+                self._entries.pop(guild_id, None)
+            self.invalidations += 1
+
+    def get_stats(self) -> dict:
+        """
+        Retorna os contadores do cache
+
+        Returns:
+            dict: entries, hits, misses, invalidations e hit_rate (0 a 1)
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'invalidations': self.invalidations,
+                'hit_rate': round(self.hits / total, 3) if total else 0.0
+            }
+
+# Instância global do cache da visão semanal
+week_view_cache = WeekViewCache()
+
+def invalidate(guild_id: int = None):
+    """Função para invalidar o cache da visão semanal após uma escrita"""
+    week_view_cache.invalidate(guild_id)